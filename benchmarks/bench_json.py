@@ -0,0 +1,98 @@
+"""Compare JSON codecs on realistic session pages.
+
+Builds pages shaped like ``load('session', include=['behaviors',
+'dataacquisition', 'manipulations', 'epochs'])`` responses (100 sessions per
+page, each with embedded relations) and times decoding and encoding with
+every available codec.
+
+Usage::
+
+    python -m benchmarks.bench_json [--pages 20] [--repeat 5]
+"""
+
+import argparse
+import random
+import time
+import uuid
+
+from brainstem_api_tools.codec import OrjsonCodec, StdlibCodec
+
+
+def _uuid(rng) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128)))
+
+
+def make_session(rng) -> dict:
+    def embedded(kind, n):
+        return [{
+            "id": _uuid(rng),
+            "type": kind,
+            "description": "x" * rng.randint(20, 200),
+            "details": {"channels": rng.randint(16, 512), "rate": 30000.0,
+                        "probe": {"name": "Neuropixels 1.0", "shanks": 4}},
+        } for _ in range(n)]
+
+    return {
+        "id": _uuid(rng),
+        "name": f"session_{rng.randint(0, 10 ** 6)}",
+        "description": "Recording session " * rng.randint(1, 10),
+        "projects": [_uuid(rng) for _ in range(rng.randint(1, 3))],
+        "dataset": _uuid(rng),
+        "date_time_onset": "2024-03-01T10:00:00Z",
+        "tags": ["hippocampus", "ca1", "theta"],
+        "behaviors": embedded("behavior", rng.randint(1, 5)),
+        "dataacquisition": embedded("extracellular", rng.randint(1, 3)),
+        "manipulations": embedded("optogenetics", rng.randint(0, 3)),
+        "epochs": [{"name": f"epoch{i}", "start": i * 600.0, "end": (i + 1) * 600.0}
+                   for i in range(rng.randint(1, 8))],
+        "extra_fields": {"ambient_temperature": 21.5, "notes": None},
+    }
+
+
+def make_pages(n_pages: int, page_size: int = 100, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [{"sessions": [make_session(rng) for _ in range(page_size)],
+             "count": n_pages * page_size} for _ in range(n_pages)]
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    codecs = [StdlibCodec()]
+    try:
+        codecs.append(OrjsonCodec())
+    except ImportError:
+        print("orjson not installed; only the standard library is measured.")
+
+    pages = make_pages(args.pages)
+    bodies = [StdlibCodec().dumps(page) for page in pages]
+    size = sum(len(b) for b in bodies)
+    print(f"{len(pages)} pages, {size / 1e6:.1f} MB of JSON\n")
+    print(f"{'codec':<8} {'decode':>10} {'MB/s':>8} {'encode':>10} {'MB/s':>8}")
+
+    baseline = None
+    for codec in codecs:
+        decode = _best(lambda: [codec.loads(b) for b in bodies], args.repeat)
+        encode = _best(lambda: [codec.dumps(p) for p in pages], args.repeat)
+        print(f"{codec.name:<8} {decode * 1e3:>8.1f}ms {size / decode / 1e6:>8.0f} "
+              f"{encode * 1e3:>8.1f}ms {size / encode / 1e6:>8.0f}")
+        if baseline is None:
+            baseline = (decode, encode)
+        else:
+            print(f"{'':<8} {baseline[0] / decode:>9.1f}x {'':>8} {baseline[1] / encode:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
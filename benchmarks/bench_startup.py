@@ -0,0 +1,75 @@
+"""Measure CLI cold-start cost with ``python -X importtime``.
+
+Runs a fresh interpreter for each sample and reports the cumulative import
+time of ``brainstem_api_tools.cli``, the heaviest modules it pulls in, and
+the wall time of ``brainstem --help`` and ``brainstem logout``.
+
+Usage::
+
+    python -m benchmarks.bench_startup [--runs 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def import_times(module: str) -> dict:
+    """Return ``{name: cumulative_us}`` for *module* and everything it imports.
+
+    ``-X importtime`` prints children before their parent, indented one
+    level deeper; modules loaded earlier by ``site`` are left out.
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, check=True)
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = len(name) - len(name.lstrip())
+        entries.append((name.strip(), int(cumulative), depth))
+
+    times = {}
+    for name, cumulative, depth in reversed(entries):
+        if times and depth == 1:
+            break  # an earlier top-level import, not one of ours
+        times[name] = cumulative
+    return times
+
+
+def wall_time(args: list, env: dict) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "brainstem_api_tools.cli", *args],
+                   capture_output=True, env=env)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    samples = [import_times("brainstem_api_tools.cli") for _ in range(args.runs)]
+    total = statistics.median(s["brainstem_api_tools.cli"] for s in samples)
+    print(f"import brainstem_api_tools.cli: {total / 1000:.1f} ms (median of {args.runs})")
+    heaviest = sorted(samples[-1].items(), key=lambda item: -item[1])[1:6]
+    for name, us in heaviest:
+        print(f"  {name:<40} {us / 1000:>6.1f} ms")
+    client = statistics.median(import_times("brainstem_api_tools.brainstem_api_client")
+                               ["brainstem_api_tools.brainstem_api_client"] for _ in range(3))
+    print(f"import brainstem_api_tools.brainstem_api_client: {client / 1000:.1f} ms (for reference)")
+
+    with tempfile.TemporaryDirectory() as home:
+        env = {**os.environ, "HOME": home}
+        for command in (["--help"], ["logout"]):
+            wall = statistics.median(wall_time(command, env) for _ in range(args.runs))
+            print(f"brainstem {' '.join(command)}: {wall * 1000:.0f} ms wall")
+
+
+if __name__ == "__main__":
+    main()
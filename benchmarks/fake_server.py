@@ -0,0 +1,260 @@
+"""In-process stand-in for the BrainSTEM REST API.
+
+``FakeBrainstem`` serves ``api/<portal>/<app>/<model>/[<id>/]`` from
+synthetic in-memory tables with the query semantics the client relies on:
+``filter{field.op}``, ``sort[]``, ``include[]`` (``<relation>.*``),
+``limit`` (capped at 100) and ``offset``, plus POST / PATCH / DELETE.
+``latency`` seconds (plus up to ``jitter``) are added to every request,
+and ``record_latency`` seconds per record in a list response.
+
+    with FakeBrainstem(sessions=5000, latency=0.02) as server:
+        client = BrainstemClient(token="bench", url=server.url)
+        client.load("session", load_all=True)
+"""
+
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from brainstem_api_tools.models import _MODEL_TO_APP, _model_for_field
+
+MAX_LIMIT = 100
+
+# Field name -> model for relation fields of the synthetic dataset.
+_RELATIONS = {"projects": "project", "subjects": "subject", "sessions": "session",
+              "behaviors": "behavior", "dataacquisition": "dataacquisition",
+              "strain": "strain", "procedures": "procedure"}
+
+
+def make_dataset(sessions: int = 1000, seed: int = 0) -> dict:
+    """Build ``{model: {id: record}}`` shaped like a real private portal."""
+    rng = random.Random(seed)
+
+    def new_id():
+        return str(uuid.UUID(int=rng.getrandbits(128)))
+
+    def table(records):
+        return {r["id"]: r for r in records}
+
+    strains = table({"id": new_id(), "name": f"strain{i}", "species": "mouse"}
+                    for i in range(10))
+    projects = table({"id": new_id(), "name": f"project{i}",
+                      "description": "Hippocampal recordings " * 10}
+                     for i in range(max(1, sessions // 200)))
+    subjects = table({"id": new_id(), "name": f"subject{i}", "sex": rng.choice("MF"),
+                      "strain": rng.choice(list(strains)),
+                      "projects": [rng.choice(list(projects))], "procedures": []}
+                     for i in range(max(1, sessions // 10)))
+    behaviors, dataacquisition, session_records = {}, {}, []
+    for i in range(sessions):
+        sid = new_id()
+        b_ids = []
+        for _ in range(rng.randint(1, 3)):
+            b = {"id": new_id(), "session": sid, "type": rng.choice(["run", "sleep", "maze"]),
+                 "description": "x" * rng.randint(20, 200)}
+            behaviors[b["id"]] = b
+            b_ids.append(b["id"])
+        d = {"id": new_id(), "session": sid, "type": "extracellular",
+             "details": {"channels": 256, "rate": 30000}}
+        dataacquisition[d["id"]] = d
+        session_records.append({
+            "id": sid,
+            "name": f"session{i:06d}",
+            "description": "Recording session " * rng.randint(1, 5),
+            "projects": [rng.choice(list(projects))],
+            "subjects": [rng.choice(list(subjects))],
+            "behaviors": b_ids,
+            "dataacquisition": [d["id"]],
+            "modified": f"2024-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}Z",
+        })
+    return {"strain": strains, "project": projects, "subject": subjects,
+            "session": table(session_records), "behavior": behaviors,
+            "dataacquisition": dataacquisition}
+
+
+def _matches(value, op: str, expected: list) -> bool:
+    if op == "in":
+        values = value if isinstance(value, list) else [value]
+        return any(v in expected for v in values)
+    target = expected[0]
+    if isinstance(value, list):
+        return any(_matches(v, op, expected) for v in value)
+    if value is None:
+        return False
+    if op == "exact":
+        return str(value) == target
+    if op == "iexact":
+        return str(value).lower() == target.lower()
+    if op == "icontains":
+        return target.lower() in str(value).lower()
+    if op == "contains":
+        return target in str(value)
+    if op == "startswith":
+        return str(value).startswith(target)
+    if op == "endswith":
+        return str(value).endswith(target)
+    if op in ("gt", "gte", "lt", "lte"):
+        value, target = str(value), str(target)
+        return {"gt": value > target, "gte": value >= target,
+                "lt": value < target, "lte": value <= target}[op]
+    raise ValueError(f"unsupported filter operator '{op}'")
+
+
+_OPS = {"exact", "iexact", "icontains", "contains", "startswith", "endswith",
+        "gt", "gte", "lt", "lte", "in"}
+
+
+def query(records: list, params: dict) -> list:
+    """Apply ``filter{}`` and ``sort[]`` params (as from ``parse_qs``)."""
+    for key, values in params.items():
+        if not key.startswith("filter{"):
+            continue
+        parts = key[len("filter{"):-1].split(".")
+        op = parts.pop() if len(parts) > 1 and parts[-1] in _OPS else "exact"
+        if parts[-1] == "id" and len(parts) == 2:
+            parts = parts[:1]  # "projects.id" compares the related ids
+        field = parts[0]
+        records = [r for r in records if _matches(r.get(field), op, values)]
+    for key in reversed(params.get("sort[]", [])):
+        field = key.lstrip("-")
+        records = sorted(records, key=lambda r: str(r.get(field, "")),
+                         reverse=key.startswith("-"))
+    return records
+
+
+class FakeBrainstem:
+    """Threaded HTTP server over an in-memory dataset.
+
+    Parameters
+    ----------
+    sessions : Size of the synthetic dataset (sessions; other models scale with it).
+    latency  : Seconds added to every request.
+    jitter   : Extra random delay of up to this many seconds.
+    record_latency : Seconds added per record returned by a list request,
+                     like the serialisation cost of heavy includes.
+    dataset  : A prebuilt ``{model: {id: record}}`` instead of ``make_dataset()``.
+    """
+
+    def __init__(self, sessions: int = 1000, latency: float = 0.0, jitter: float = 0.0,
+                 record_latency: float = 0.0, dataset: dict = None) -> None:
+        self.data = dataset if dataset is not None else make_dataset(sessions)
+        self.latency = latency
+        self.jitter = jitter
+        self.record_latency = record_latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    # ------------------------------------------------------------------
+
+    def _embed(self, record: dict, includes: list) -> dict:
+        record = dict(record)
+        for include in includes:
+            field = include.split(".")[0]
+            model = _RELATIONS.get(field, _model_for_field(field))
+            table = self.data.get(model, {})
+            value = record.get(field)
+            if isinstance(value, list):
+                record[field] = [table.get(v, v) for v in value]
+            elif value in table:
+                record[field] = table[value]
+        return record
+
+    def _list(self, model: str, params: dict):
+        records = query(list(self.data.get(model, {}).values()), params)
+        limit = min(int(params.get("limit", [MAX_LIMIT])[0]), MAX_LIMIT)
+        offset = int(params.get("offset", [0])[0])
+        includes = params.get("include[]", [])
+        page = [self._embed(r, includes) for r in records[offset:offset + limit]]
+        key = model if model.endswith("s") else model + "s"
+        return 200, {key: page, "count": len(records)}
+
+    def _handle(self, method: str, path: str, params: dict, body: bytes):
+        parts = [p for p in path.split("/") if p]
+        if len(parts) < 4 or parts[0] != "api" or parts[3] not in _MODEL_TO_APP:
+            return 404, {"detail": "Not found."}
+        model, id = parts[3], (parts[4] if len(parts) > 4 else None)
+        table = self.data.setdefault(model, {})
+
+        if method == "GET" and id is None:
+            return self._list(model, params)
+        if method == "POST" and id is None:
+            record = {**json.loads(body or b"{}"), "id": str(uuid.uuid4())}
+            table[record["id"]] = record
+            return 201, {model: record}
+        if id not in table:
+            return 404, {"detail": "Not found."}
+        if method == "GET":
+            return 200, {model: self._embed(table[id], params.get("include[]", []))}
+        if method == "PATCH":
+            table[id].update(json.loads(body or b"{}"))
+            return 200, {model: table[id]}
+        if method == "DELETE":
+            del table[id]
+            return 204, None
+        return 405, {"detail": "Method not allowed."}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Headers and body are written separately; without this, Nagle's
+                # algorithm and delayed ACKs add ~40 ms to every response.
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def _serve(self):
+                delay = server.latency + (random.random() * server.jitter if server.jitter else 0)
+                if delay:
+                    time.sleep(delay)
+                url = urlparse(self.path)
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                with server._lock:
+                    server.requests += 1
+                    status, payload = server._handle(
+                        self.command, url.path, parse_qs(url.query), body)
+                if server.record_latency and isinstance(payload, dict) and "count" in payload:
+                    records = next(v for k, v in payload.items() if k != "count")
+                    time.sleep(server.record_latency * len(records))
+                data = b"" if payload is None else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _serve
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,229 @@
+"""Benchmark suite against the in-process fake BrainSTEM server.
+
+Each scenario runs in a fresh interpreter (so peak RSS is its own) with a
+``FakeBrainstem`` serving a synthetic dataset on localhost, and reports
+records/s, per-request p50/p99 latency as seen by the client, and peak RSS.
+
+Usage::
+
+    python -m benchmarks.run                      # all scenarios
+    python -m benchmarks.run --only paginate keyset --sessions 5000 --latency 0.02
+    python -m benchmarks.run --json results.json  # for comparing branches
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+from requests import Session
+
+from benchmarks.fake_server import FakeBrainstem
+from brainstem_api_tools.brainstem_api_client import BrainstemClient
+
+
+# ---------------------------------------------------------------------------
+# Scenarios: fn(client, server, args) -> number of records handled
+# ---------------------------------------------------------------------------
+
+def single(client, server, args):
+    """Serial ``load(model, id=...)`` lookups."""
+    ids = list(server.data["session"])[:args.single]
+    for id in ids:
+        client.load("session", id=id).json()
+    return len(ids)
+
+
+def paginate(client, server, args):
+    """``load_all`` with concurrent offset pages and embedded behaviors."""
+    result = client.load("session", include=["behaviors"], load_all=True)
+    return len(result["sessions"])
+
+
+def paginate_serial(client, server, args):
+    """``load_all`` fetching one page at a time."""
+    result = client.load("session", load_all=True, max_workers=1)
+    return len(result["sessions"])
+
+
+def keyset(client, server, args):
+    """``load_all`` with keyset pagination on ``id``."""
+    result = client.load("session", load_all=True, keyset="id")
+    return len(result["sessions"])
+
+
+def adaptive(client, server, args):
+    """``load_all`` with page sizes steered towards 0.25 s per page."""
+    from brainstem_api_tools.throttle import AdaptivePageSize
+
+    sizer = AdaptivePageSize(target=0.25)
+    result = client.load("session", include=["behaviors"], load_all=True, adaptive=sizer)
+    return len(result["sessions"])
+
+
+def convenience(client, server, args):
+    """``load_session`` with its default includes."""
+    result = client.load_session(load_all=True)
+    return len(result["sessions"])
+
+
+def stream(client, server, args):
+    """``iter_load`` with background page prefetch."""
+    return sum(1 for _ in client.iter_load("session"))
+
+
+def bulk_create(client, server, args):
+    """``save_many`` creating new records."""
+    records = [{"name": f"bench{i}", "description": "x" * 200} for i in range(args.bulk)]
+    result = client.save_many("behavior", records)
+    return len(result.succeeded)
+
+
+def bulk_delete(client, server, args):
+    """``delete_many`` of existing records."""
+    ids = list(server.data["behavior"])[:args.bulk]
+    result = client.delete_many("behavior", ids)
+    return len(result.succeeded)
+
+
+def cli_ndjson(client, server, args):
+    """``brainstem load session --format ndjson`` to a discarded stdout."""
+    from brainstem_api_tools import cli
+
+    argv = ["brainstem", "load", "session", "--token", "bench", "--url", server.url,
+            "--format", "ndjson"]
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        sys.argv = argv
+        cli.main()
+    return out.getvalue().count("\n")
+
+
+SCENARIOS = {fn.__name__: fn for fn in (
+    single, paginate, paginate_serial, keyset, adaptive, convenience, stream,
+    bulk_create, bulk_delete, cli_ndjson,
+)}
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def _record_latencies() -> list:
+    """Time every HTTP request the process sends, including the CLI's."""
+    latencies, lock = [], threading.Lock()
+    send = Session.send
+
+    def timed_send(self, request, **kwargs):
+        # Session.send also reads the body (unless streaming), so this is
+        # the full request as the caller experiences it.
+        start = time.perf_counter()
+        try:
+            return send(self, request, **kwargs)
+        finally:
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    Session.send = timed_send
+    return latencies
+
+
+def run_scenario(name: str, args) -> dict:
+    with FakeBrainstem(sessions=args.sessions, latency=args.latency,
+                       jitter=args.jitter, record_latency=args.record_latency) as server:
+        client = BrainstemClient(token="bench", url=server.url, max_workers=args.max_workers)
+        baseline = _peak_rss_mb()
+        latencies = _record_latencies()
+        start = time.perf_counter()
+        records = SCENARIOS[name](client, server, args)
+        elapsed = time.perf_counter() - start
+    return {
+        "scenario": name,
+        "records": records,
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "records_per_s": records / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "peak_rss_mb": _peak_rss_mb(),
+        "rss_growth_mb": _peak_rss_mb() - baseline,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=sorted(SCENARIOS), metavar="SCENARIO",
+                        help=f"Scenarios to run (default: all): {', '.join(SCENARIOS)}.")
+    parser.add_argument("--sessions", type=int, default=2000, help="Dataset size.")
+    parser.add_argument("--latency", type=float, default=0.005,
+                        help="Seconds added to every request (default: 0.005).")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="Extra random per-request delay, in seconds.")
+    parser.add_argument("--record-latency", type=float, default=0.0,
+                        help="Seconds added per record of a list response.")
+    parser.add_argument("--max-workers", type=int, default=4)
+    parser.add_argument("--single", type=int, default=200, help="Lookups in 'single'.")
+    parser.add_argument("--bulk", type=int, default=500, help="Records in bulk scenarios.")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON.")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_scenario(args.child, args)))
+        return
+
+    passthrough = list(sys.argv[1:])
+    if "--only" in passthrough:
+        # Strip "--only A B ..." from the child command line.
+        i = passthrough.index("--only")
+        j = i + 1
+        while j < len(passthrough) and not passthrough[j].startswith("--"):
+            j += 1
+        del passthrough[i:j]
+
+    print(f"{args.sessions} sessions, {args.latency * 1000:.1f} ms latency, "
+          f"max_workers={args.max_workers}\n")
+    header = (f"{'scenario':<16} {'records':>8} {'requests':>8} {'records/s':>10} "
+              f"{'p50 ms':>8} {'p99 ms':>8} {'peak RSS':>9} {'+RSS':>7}")
+    print(header)
+    print("-" * len(header))
+    results = []
+    for name in args.only or SCENARIOS:
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.run", "--child", name, *passthrough],
+            capture_output=True, text=True, env={**os.environ, "PYTHONHASHSEED": "0"},
+        )
+        if proc.returncode != 0:
+            print(f"{name:<16} failed:\n{proc.stderr}")
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        results.append(r)
+        print(f"{name:<16} {r['records']:>8} {r['requests']:>8} {r['records_per_s']:>10.0f} "
+              f"{r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['peak_rss_mb']:>7.0f}MB "
+              f"{r['rss_growth_mb']:>5.0f}MB")
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,41 @@
-from .brainstem_api_client import BrainstemClient, ModelType, PortalType, AuthenticationError
+"""BrainSTEM API tools.
+
+Public names are imported on first access, so ``import brainstem_api_tools``
+(and the ``brainstem`` CLI) does not load ``requests`` or ``httpx`` up front.
+"""
 
 __version__ = "2.0.0"
+
+_EXPORTS = {
+    "BrainstemClient": ".brainstem_api_client",
+    "AuthenticationError": ".brainstem_api_client",
+    "BulkResult": ".brainstem_api_client",
+    "LoadManyResult": ".brainstem_api_client",
+    "ModelType": ".models",
+    "PortalType": ".models",
+    "AsyncBrainstemClient": ".async_client",
+    "DiskCache": ".cache",
+    "RecordCache": ".cache",
+    "PortalMirror": ".mirror",
+    "EntityStore": ".store",
+    "Cassette": ".cassette",
+    "AdaptivePageSize": ".throttle",
+    "RequestEvent": ".metrics",
+    "RequestStats": ".metrics",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
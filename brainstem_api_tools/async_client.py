@@ -0,0 +1,288 @@
+"""Asyncio-native BrainSTEM API client.
+
+``AsyncBrainstemClient`` mirrors ``BrainstemClient`` (``load``, ``save``,
+``delete``, auto-pagination and every ``load_*`` convenience loader) but
+every network call is a coroutine backed by a pooled ``httpx.AsyncClient``.
+
+Requires the optional ``httpx`` dependency::
+
+    pip install "brainstem_python_api_tools[async]"
+"""
+
+import asyncio
+from typing import AsyncIterator, Union
+
+from urllib3.util.retry import Retry
+
+from .brainstem_api_client import (
+    AuthenticationError,
+    BrainstemClient,
+    _MODEL_TO_APP,
+    _records_key,
+    _resolve_model,
+    _resolve_portal,
+)
+from .throttle import retry_after_seconds
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - exercised only without the extra
+    httpx = None
+
+
+# Throttled requests are always re-sent; transient server errors only for
+# the methods the blocking client's urllib3 Retry re-sends (not POST or
+# PATCH), since the server may already have acted on the request.
+_THROTTLE_STATUS = 429
+_RETRY_STATUSES = {502, 503, 504}
+_IDEMPOTENT_METHODS = Retry.DEFAULT_ALLOWED_METHODS
+
+
+class AsyncBrainstemClient:
+
+    BASE_URL = BrainstemClient.BASE_URL
+    DEFAULT_TIMEOUT: int = BrainstemClient.DEFAULT_TIMEOUT
+    DEFAULT_MAX_WORKERS: int = BrainstemClient.DEFAULT_MAX_WORKERS
+    DEFAULT_MAX_CONNECTIONS: int = 100
+    MAX_RETRIES: int = 3
+
+    def __init__(
+        self,
+        token: str = None,
+        headless: bool = False,
+        url: str = None,
+        max_workers: int = None,
+        max_connections: int = None,
+        transport=None,
+    ) -> None:
+        if httpx is None:
+            raise ImportError(
+                "AsyncBrainstemClient requires httpx. Install it with "
+                "`pip install \"brainstem_python_api_tools[async]\"`."
+            )
+        base = (url.rstrip("/") + "/") if url else self.BASE_URL
+        self._address = base + "api/"
+        self._max_workers = max_workers or self.DEFAULT_MAX_WORKERS
+
+        if token:
+            self._token = token
+        else:
+            self._token = self._load_cached_token()
+            if not self._token:
+                # The device flow is interactive, so it runs synchronously.
+                self._token = self._device_auth_flow(headless=headless)
+                self._save_token(self._token)
+
+        self._client = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {self._token}"},
+            timeout=self.DEFAULT_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=max_connections or self.DEFAULT_MAX_CONNECTIONS
+            ),
+            transport=transport,
+        )
+
+    # Token management and URL building are shared with the blocking client.
+    _load_cached_token = BrainstemClient._load_cached_token
+    _save_token = BrainstemClient._save_token
+    _device_auth_flow = BrainstemClient._device_auth_flow
+    _build_url = BrainstemClient._build_url
+    _query_params = staticmethod(BrainstemClient._query_params)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    async def _send(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        """Send a request, retrying throttling and transient server errors.
+
+        ``429`` is retried for every method; ``502``/``503``/``504`` only for
+        idempotent ones. The delay honours ``Retry-After`` and otherwise
+        backs off exponentially.
+        """
+        retry = {_THROTTLE_STATUS}
+        if method.upper() in _IDEMPOTENT_METHODS:
+            retry |= _RETRY_STATUSES
+        for attempt in range(self.MAX_RETRIES + 1):
+            resp = await self._client.request(method, url, **kwargs)
+            if resp.status_code not in retry or attempt == self.MAX_RETRIES:
+                return resp
+            delay = retry_after_seconds(resp.headers.get("Retry-After"))
+            await asyncio.sleep(delay if delay is not None else 0.5 * (2 ** attempt))
+
+    async def _fetch_page(self, url: str, params: dict) -> dict:
+        """GET one page of a list endpoint and return the decoded body."""
+        resp = await self._send("GET", url, params=params)
+        if resp.status_code == 401:
+            raise AuthenticationError(
+                "API token is invalid or expired. Run `brainstem login` to re-authenticate."
+            )
+        resp.raise_for_status()
+        return resp.json()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def load(self,
+                   model,
+                   portal="private",
+                   id: str = None,
+                   options: str = None,
+                   filters: dict = None,
+                   sort: list = None,
+                   include: list = None,
+                   limit: int = None,
+                   offset: int = None,
+                   load_all: bool = False,
+                   max_workers: int = None) -> Union["httpx.Response", dict]:
+        """Load one or more records of *model*.
+
+        Takes the same arguments as ``BrainstemClient.load()``. With
+        ``load_all=True`` the pages after the first are requested
+        concurrently, at most *max_workers* at a time.
+        """
+        model = _resolve_model(model)
+        portal = _resolve_portal(portal)
+        app = _MODEL_TO_APP[model]
+        url = self._build_url(portal, app, model, id, options)
+
+        params = {}
+        if not id:
+            params = self._query_params(filters, sort, include, limit, offset)
+
+        if not load_all:
+            return await self._send("GET", url, params=params)
+
+        if id is not None:
+            raise ValueError("load_all=True cannot be used together with id.")
+
+        params["limit"] = limit or 100
+        params.setdefault("offset", 0)
+
+        data = await self._fetch_page(url, params)
+        records_key = _records_key(data)
+        combined = {k: v for k, v in data.items() if k != records_key}
+        combined[records_key] = list(data[records_key])
+
+        total = data.get("count", len(combined[records_key]))
+        step = len(data[records_key])
+        if step == 0:
+            return combined
+
+        semaphore = asyncio.Semaphore(max_workers or self._max_workers)
+
+        async def _bounded_fetch(page_offset):
+            async with semaphore:
+                return await self._fetch_page(url, {**params, "offset": page_offset})
+
+        pages = await asyncio.gather(*(
+            _bounded_fetch(page_offset)
+            for page_offset in range(params["offset"] + step, total, step)
+        ))
+        for page in pages:
+            combined[records_key].extend(page.get(records_key, []))
+
+        return combined
+
+    async def iter_pages(self,
+                         model,
+                         portal="private",
+                         filters: dict = None,
+                         sort: list = None,
+                         include: list = None,
+                         limit: int = None,
+                         offset: int = None,
+                         prefetch: bool = True) -> AsyncIterator[dict]:
+        """Asynchronously yield the decoded pages of a list query.
+
+        Takes the same arguments as ``BrainstemClient.iter_pages()``.
+        """
+        model = _resolve_model(model)
+        portal = _resolve_portal(portal)
+        url = self._build_url(portal, _MODEL_TO_APP[model], model)
+        params = self._query_params(filters, sort, include, limit or 100, offset or 0)
+
+        task = None
+        try:
+            while params is not None:
+                data = await (task if task is not None else self._fetch_page(url, params))
+                task = None
+                records = data[_records_key(data)]
+                next_offset = params["offset"] + len(records)
+                if records and next_offset < data.get("count", next_offset):
+                    params = {**params, "offset": next_offset}
+                    if prefetch:
+                        task = asyncio.ensure_future(self._fetch_page(url, params))
+                else:
+                    params = None
+                yield data
+        finally:
+            if task is not None:
+                task.cancel()
+
+    async def iter_load(self, model, portal="private", **kwargs) -> AsyncIterator[dict]:
+        """Asynchronously yield individual records of *model*.
+
+        Accepts the same keyword arguments as ``iter_pages()``.
+        """
+        async for page in self.iter_pages(model, portal=portal, **kwargs):
+            for record in page[_records_key(page)]:
+                yield record
+
+    async def save(self,
+                   model,
+                   portal="private",
+                   id: str = None,
+                   data: dict = None,
+                   options: str = None) -> "httpx.Response":
+        """Create (POST) or update (PATCH) a record. See ``BrainstemClient.save()``."""
+        model = _resolve_model(model)
+        portal = _resolve_portal(portal)
+        app = _MODEL_TO_APP[model]
+        if data is None:
+            data = {}
+
+        if id is not None:
+            url = self._build_url(portal, app, model, id, options)
+            return await self._send("PATCH", url, json=data)
+        else:
+            url = self._build_url(portal, app, model, options=options)
+            return await self._send("POST", url, json=data)
+
+    async def delete(self,
+                     model,
+                     portal="private",
+                     id: str = None) -> "httpx.Response":
+        """Delete a record by ID. See ``BrainstemClient.delete()``."""
+        if id is None:
+            raise ValueError("'id' is required to delete a record.")
+        model = _resolve_model(model)
+        portal = _resolve_portal(portal)
+        app = _MODEL_TO_APP[model]
+        url = self._build_url(portal, app, model, id)
+        return await self._send("DELETE", url)
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    # ------------------------------------------------------------------
+    # Convenience loaders
+    # ------------------------------------------------------------------
+
+    # The loaders only assemble arguments and delegate to ``self.load``,
+    # so they can be shared as-is: here they return ``load``'s coroutine.
+    _convenience_load = BrainstemClient._convenience_load
+
+
+for _name, _loader in vars(BrainstemClient).items():
+    if _name.startswith("load_") and _name[len("load_"):] in _MODEL_TO_APP:
+        setattr(AsyncBrainstemClient, _name, _loader)
+del _name, _loader
@@ -1,110 +1,66 @@
+import gzip
+import json
 import os
 import stat
+import threading
 import time
-import webbrowser
-from enum import Enum
+import warnings
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Union
+from typing import Iterator, Union
+from urllib.parse import urlencode
 
 import requests
 from requests.adapters import HTTPAdapter
 from requests.models import Response
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.response import HTTPResponse
+from urllib3.util.request import make_headers
 from urllib3.util.retry import Retry
 
-
-# ---------------------------------------------------------------------------
-# Model → app routing table (single source of truth)
-# ---------------------------------------------------------------------------
-
-_MODEL_TO_APP: dict = {
-    # stem
-    "project": "stem",
-    "subject": "stem",
-    "session": "stem",
-    "collection": "stem",
-    "cohort": "stem",
-    "breeding": "stem",
-    "project_membership_invitation": "stem",
-    "project_group_membership_invitation": "stem",
-    # modules
-    "procedure": "modules",
-    "behavior": "modules",
-    "dataacquisition": "modules",
-    "manipulation": "modules",
-    "equipment": "modules",
-    "consumablestock": "modules",
-    "procedurelog": "modules",
-    "subjectlog": "modules",
-    # personal_attributes
-    "behavioralassay": "personal_attributes",
-    "datastorage": "personal_attributes",
-    "inventory": "personal_attributes",
-    "license": "personal_attributes",
-    "protocol": "personal_attributes",
-    "setup": "personal_attributes",
-    # resources
-    "consumable": "resources",
-    "hardwaredevice": "resources",
-    "supplier": "resources",
-    # taxonomies
-    "behavioralcategory": "taxonomies",
-    "behavioralparadigm": "taxonomies",
-    "brainregion": "taxonomies",
-    "regulatoryauthority": "taxonomies",
-    "setuptype": "taxonomies",
-    "species": "taxonomies",
-    "strain": "taxonomies",
-    "strainapproval": "taxonomies",
-    # dissemination
-    "journal": "dissemination",
-    "journalapproval": "dissemination",
-    "publication": "dissemination",
-    # users
-    "group": "users",
-    "group_membership_invitation": "users",
-    "group_membership_request": "users",
-    "laboratory": "users",
-    "user": "users",
-}
-
-_TOKEN_FILE = Path.home() / ".config" / "brainstem" / "token"
-
-# Derived from _MODEL_TO_APP so there is exactly one source of truth.
-ModelType = Enum("ModelType", {k: k for k in _MODEL_TO_APP})  # type: ignore[misc]
-
-_VALID_PORTALS = {"private", "public", "super"}
-
-
-def _resolve_model(model) -> str:
-    """Accept a plain string or a ModelType member and return the string value."""
-    if isinstance(model, ModelType):
-        return model.value
-    model = str(model)
-    if model not in _MODEL_TO_APP:
+from .codec import get_codec
+from .metrics import (
+    PHASES, RequestEvent, RequestStats, instrument_adapter, reset_connection_timings, response_timings,
+)
+from .models import (  # noqa: F401 - re-exported for existing imports
+    _MODEL_TO_APP,
+    _TOKEN_FILE,
+    _VALID_PORTALS,
+    ModelType,
+    PortalType,
+    _resolve_model,
+    _resolve_portal,
+)
+from .throttle import AdaptiveConcurrency, AdaptivePageSize, RateLimiter, retry_after_seconds
+
+
+def _records_key(data: dict) -> str:
+    """Return the list-valued key of a paginated response (e.g. ``'sessions'``)."""
+    records_key = next((k for k, v in data.items() if isinstance(v, list)), None)
+    if records_key is None:
         raise ValueError(
-            f"Unknown model '{model}'. Valid models are: "
-            + ", ".join(sorted(_MODEL_TO_APP))
+            "load_all=True requires a paginated list response, but the API "
+            "returned no list-valued key. Use load_all=False for single-object endpoints."
         )
-    return model
+    return records_key
 
 
-def _resolve_portal(portal) -> str:
-    """Accept a plain string or a PortalType member and return the string value."""
-    if isinstance(portal, Enum):
-        portal = portal.value
-    portal = str(portal)
-    if portal not in _VALID_PORTALS:
-        raise ValueError(
-            f"Unknown portal '{portal}'. Valid portals are: "
-            + ", ".join(sorted(_VALID_PORTALS))
-        )
-    return portal
+def _read_json(path: Path, default):
+    """Return the JSON content of *path*, or *default* if it does not exist."""
+    if not path.exists():
+        return default
+    with path.open() as fh:
+        return json.load(fh)
 
 
-class PortalType(Enum):
-    public = "public"
-    private = "private"
-    super = "super"
+def _write_json(path: Path, data) -> None:
+    """Atomically replace *path* with *data* encoded as JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w") as fh:
+        json.dump(data, fh)
+    os.replace(tmp, path)
 
 
 # ---------------------------------------------------------------------------
@@ -115,6 +71,98 @@ class AuthenticationError(Exception):
     pass
 
 
+# ---------------------------------------------------------------------------
+# Bulk operation results
+# ---------------------------------------------------------------------------
+
+# Responses worth retrying in bulk operations. 429 is not among them:
+# ``_request`` already waits out and re-sends throttled requests.
+_TRANSIENT_STATUSES = {502, 503, 504}
+
+# The subset that is safe for requests that are not idempotent (creates):
+# a 502 or 504 may come from a gateway after the server already acted on
+# the request, while a 503 means it was turned away.
+_UNPROCESSED_STATUSES = {503}
+
+
+def _connect_failed(exc: requests.ConnectionError) -> bool:
+    """Whether *exc* happened before the request was sent.
+
+    Other connection errors (e.g. "Connection aborted") can happen after
+    the server received the body.
+    """
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    # NewConnectionError (including DNS failures) subclasses ConnectTimeoutError.
+    return isinstance(reason, ConnectTimeoutError)
+
+
+class BulkResult:
+    """Outcome of a bulk operation such as ``save_many()`` or ``delete_many()``.
+
+    Every item is reported as a dict with ``index`` (position in the input),
+    ``id``, ``status_code``, ``response``, ``error`` and ``retries``.
+
+    Attributes
+    ----------
+    succeeded : Items that received a 2xx response.
+    not_found : Items that received a 404 response.
+    failed    : Items that received any other error response or raised.
+    elapsed   : Wall-clock seconds taken by the whole batch.
+    """
+
+    def __init__(self, succeeded: list, failed: list, elapsed: float,
+                 not_found: list = None) -> None:
+        self.succeeded = succeeded
+        self.not_found = not_found or []
+        self.failed = failed
+        self.elapsed = elapsed
+
+    @property
+    def items(self) -> list:
+        """All items, in input order."""
+        return sorted(self.succeeded + self.not_found + self.failed,
+                      key=lambda item: item["index"])
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed and not self.not_found
+
+    @property
+    def retries(self) -> int:
+        """Total number of retried requests across all items."""
+        return sum(item["retries"] for item in self.items)
+
+    @property
+    def throughput(self) -> float:
+        """Items processed per second."""
+        count = len(self.items)
+        return count / self.elapsed if self.elapsed else float(count)
+
+    def __repr__(self) -> str:
+        return (
+            f"BulkResult(succeeded={len(self.succeeded)}, not_found={len(self.not_found)}, "
+            f"failed={len(self.failed)}, retries={self.retries}, elapsed={self.elapsed:.2f}s)"
+        )
+
+
+TransferInfo = namedtuple("TransferInfo", ["responses", "compressed_bytes", "uncompressed_bytes"])
+
+
+class LoadManyResult(dict):
+    """Records returned by ``load_many()``, keyed by id.
+
+    Attributes
+    ----------
+    missing : Requested ids the API returned no record for, in request order.
+    """
+
+    def __init__(self, records: dict, missing: list) -> None:
+        super().__init__(records)
+        self.missing = missing
+
+
 # ---------------------------------------------------------------------------
 # Client
 # ---------------------------------------------------------------------------
@@ -123,24 +171,118 @@ class BrainstemClient:
 
     BASE_URL = "https://www.brainstem.org/"
     DEFAULT_TIMEOUT: int = 30  # seconds; applied to all HTTP calls
+    DEFAULT_MAX_WORKERS: int = 4  # concurrent page requests for load_all
+    BULK_BACKOFF: float = 0.5  # seconds; first retry delay in bulk operations
+    MAX_URL_LENGTH: int = 6000  # characters; keeps load_many URLs under common 8 KiB limits
+    MAX_PAGE_SIZE: int = 100  # API maximum for 'limit'
+    MAX_THROTTLE_RETRIES: int = 5  # re-sends of a request answered with 429
 
     def __init__(
         self,
         token: str = None,
         headless: bool = False,
         url: str = None,
+        max_workers: int = None,
+        http_cache=False,
+        record_cache=False,
+        rate_limit: float = None,
+        json_codec=None,
+        compress_threshold: int = None,
+        cassette=None,
+        hooks=None,
     ) -> None:
+        """Create a client.
+
+        Parameters
+        ----------
+        token       : API token. Defaults to the cached token, falling back to
+                      the browser-based device authorization flow.
+        headless    : Print the verification URL instead of opening a browser.
+        url         : Base URL of the BrainSTEM server.
+        max_workers : Concurrent page requests used by ``load_all`` (default: 4).
+                      Also sizes the connection pool (at least 10), which
+                      caps the ``max_workers`` of individual calls.
+        http_cache  : ``True`` to keep GET responses in an on-disk cache under
+                      ``~/.config/brainstem/cache`` and revalidate them with
+                      ``If-None-Match`` / ``If-Modified-Since``; or a
+                      ``DiskCache`` instance for a custom location or size.
+        record_cache : ``True`` to memoise ``load(model, id=...)`` responses in
+                       memory (taxonomies for hours, other models for a
+                       minute); or a ``RecordCache`` with custom TTLs and size.
+        rate_limit   : Maximum requests per second across all threads using
+                       this client (default: unlimited). Independently of this,
+                       a ``429`` response pauses every request for its
+                       ``Retry-After`` interval before it is re-sent.
+        json_codec   : Codec used to decode pages and encode ``save`` payloads:
+                       ``'json'``, ``'orjson'`` or an object with ``loads`` /
+                       ``dumps``. Defaults to orjson when it is installed.
+        compress_threshold : Send ``save`` payloads of at least this many bytes
+                             gzip-compressed (default: never); only for servers
+                             known to decode them. If the server answers ``415``,
+                             or ``400`` before any compressed request succeeded,
+                             the payload is re-sent uncompressed; unless the
+                             plain request fails with ``400`` as well, compression
+                             is then turned off for this client.
+        cassette     : Path of a cassette file to record every request and
+                       response to, or to replay them from without touching
+                       the network (see ``brainstem_api_tools.cassette``); or
+                       a ``Cassette`` instance to choose the mode explicitly.
+                       Defaults to ``$BRAINSTEM_CASSETTE`` when set. When
+                       replaying, no token is needed.
+        hooks        : Callables invoked with a ``RequestEvent`` after every
+                       request (see ``add_hook``).
+        """
         base = (url.rstrip("/") + "/") if url else self.BASE_URL
         self._address = base + "api/"
         self._session = requests.Session()
-
-        # Automatically retry transient server errors
+        self._max_workers = max_workers or self.DEFAULT_MAX_WORKERS
+
+        if http_cache is True:
+            from .cache import DiskCache
+            http_cache = DiskCache()
+        self._http_cache = http_cache or None
+
+        if record_cache is True:
+            from .cache import RecordCache
+            record_cache = RecordCache()
+        self._record_cache = record_cache or None
+        self._rate_limiter = RateLimiter(rate_limit)
+        self._json = get_codec(json_codec)
+        self._compress_threshold = compress_threshold
+        self._compress_accepted = False  # a compressed request has succeeded
+        self._transfer = [0, 0, 0]  # responses, compressed bytes, uncompressed bytes
+        self._transfer_lock = threading.Lock()
+        self._hooks = list(hooks or [])
+        self._stats = RequestStats()
+        self._local = threading.local()  # last RequestEvent of each thread
+
+        # Automatically retry transient server errors; 429 is handled in
+        # _request so that throttling reaches the shared rate limiter.  The
+        # connection pool is sized so concurrent requests never wait on a
+        # free socket.
         _retry = Retry(total=3, backoff_factor=0.5, status_forcelist={502, 503, 504})
-        self._session.mount("https://", HTTPAdapter(max_retries=_retry))
-        self._session.mount("http://", HTTPAdapter(max_retries=_retry))
+        self._pool_size = max(10, self._max_workers)
+        _pool = self._pool_size
+        cassette = cassette or os.environ.get("BRAINSTEM_CASSETTE") or None
+        if cassette is not None:
+            from .cassette import Cassette, CassetteAdapter
+            if not isinstance(cassette, Cassette):
+                cassette = Cassette(cassette)
+            adapter = CassetteAdapter(cassette, max_retries=_retry, pool_maxsize=_pool)
+        else:
+            adapter = HTTPAdapter(max_retries=_retry, pool_maxsize=_pool)
+        instrument_adapter(adapter)
+        self._cassette = cassette
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        # gzip and deflate always; br and zstd when urllib3 can decode them
+        # (the "compression" extra).
+        self._session.headers["Accept-Encoding"] = make_headers(accept_encoding=True)["accept-encoding"]
 
         if token:
             self._token = token
+        elif cassette is not None and cassette.replaying:
+            self._token = "replay"  # requests never leave the process
         else:
             self._token = self._load_cached_token()
             if not self._token:
@@ -193,6 +335,7 @@ class BrainstemClient:
         if headless:
             print(f"Open {data['verification_uri']} and enter: {data['user_code']}")
         else:
+            import webbrowser
             webbrowser.open(data["verification_uri_complete"])
             print("Waiting for browser approval...")
 
@@ -234,6 +377,359 @@ class BrainstemClient:
             url += options
         return url
 
+    @staticmethod
+    def _query_params(filters: dict = None, sort: list = None, include: list = None,
+                      limit: int = None, offset: int = None) -> dict:
+        """Translate load() arguments into the API's query-string parameters."""
+        params = {}
+        for key, val in (filters or {}).items():
+            params[f"filter{{{key}}}"] = val
+        for field in (sort or []):
+            params.setdefault("sort[]", []).append(field)
+        for rel in (include or []):
+            params.setdefault("include[]", []).append(f"{rel}.*")
+        if limit is not None:
+            params["limit"] = limit
+        if offset is not None:
+            params["offset"] = offset
+        return params
+
+    def _request(self, method: str, url: str, decode: bool = False, **kwargs) -> Response:
+        """Send a request through the shared rate limiter.
+
+        A ``429`` response pauses all requests for its ``Retry-After``
+        interval (exponential backoff if absent) and is then re-sent, up to
+        ``MAX_THROTTLE_RETRIES`` times.
+
+        With *decode*, a ``200`` body is parsed here (so that the time it
+        takes is part of the request's event) and kept as ``resp._decoded``.
+        Every request ends with a ``RequestEvent`` sent to the hooks.
+        """
+        send = getattr(self._session, method)
+        kwargs.setdefault("timeout", self.DEFAULT_TIMEOUT)
+        stream = kwargs.get("stream", False)
+        started = time.perf_counter()
+        queued = 0.0
+        for attempt in range(self.MAX_THROTTLE_RETRIES + 1):
+            waiting = time.perf_counter()
+            self._rate_limiter.acquire()
+            sent = time.perf_counter()
+            queued += sent - waiting
+            reset_connection_timings()
+            resp = send(url, **kwargs)
+            if resp.status_code != 429 or attempt == self.MAX_THROTTLE_RETRIES:
+                break
+            delay = retry_after_seconds(resp.headers.get("Retry-After"))
+            # Release the connection: an unread streamed body would keep it
+            # out of the pool.
+            resp.close()
+            self._rate_limiter.throttle(delay if delay is not None else 2 ** attempt)
+
+        timings = {"queue": queued, **response_timings(resp, time.perf_counter() - sent)}
+        received = 0 if stream else self._record_transfer(resp)
+        timings["decode"] = 0.0
+        if decode:
+            resp._decoded = None
+            if resp.status_code == 200:
+                start = time.perf_counter()
+                resp._decoded = self._json.loads(resp.content)
+                timings["decode"] = time.perf_counter() - start
+        timings["total"] = time.perf_counter() - started
+
+        retries = attempt
+        if isinstance(resp.raw, HTTPResponse) and resp.raw.retries is not None:
+            retries += len(resp.raw.retries.history)
+        data = kwargs.get("data")
+        self._emit(url, method, resp.status_code, timings,
+                   bytes_sent=len(data) if isinstance(data, (bytes, str)) else 0,
+                   bytes_received=received, retries=retries,
+                   cache_hit=resp.status_code == 304)
+        return resp
+
+    def _record_transfer(self, resp: Response) -> int:
+        """Set ``compressed_bytes`` / ``uncompressed_bytes`` on *resp*, add
+        them to the client's totals and return the compressed size.
+
+        ``raw.tell()`` counts the body bytes read off the wire, before any
+        ``Content-Encoding`` is decoded.
+        """
+        if not isinstance(resp.raw, HTTPResponse):
+            content = resp.content
+            return len(content) if isinstance(content, bytes) else 0
+        resp.uncompressed_bytes = len(resp.content)
+        resp.compressed_bytes = resp.raw.tell()
+        with self._transfer_lock:
+            self._transfer[0] += 1
+            self._transfer[1] += resp.compressed_bytes
+            self._transfer[2] += resp.uncompressed_bytes
+        return resp.compressed_bytes
+
+    def _emit(self, url: str, method: str, status: int, timings: dict, bytes_sent: int = 0,
+              bytes_received: int = 0, retries: int = 0, cache_hit: bool = False) -> None:
+        """Record a ``RequestEvent`` in the client's stats and pass it to the hooks.
+
+        A hook that raises is reported with a warning; it never fails the request.
+        """
+        parts = url[len(self._address):].split("/") if url.startswith(self._address) else []
+        event = RequestEvent(
+            model=parts[2] if len(parts) > 2 else None,
+            portal=parts[0] if parts else None,
+            endpoint="detail" if len(parts) > 3 and parts[3] else "list",
+            method=method.upper(), url=url, status=status, timings=timings,
+            bytes_sent=bytes_sent, bytes_received=bytes_received,
+            retries=retries, cache_hit=cache_hit,
+        )
+        self._stats.record(event)
+        self._local.event = event
+        for hook in self._hooks:
+            try:
+                hook(event)
+            except Exception as exc:
+                warnings.warn(f"Request hook {hook!r} failed: {exc!r}")
+
+    def _send_json(self, method: str, url: str, data) -> Response:
+        """Send *data* as a JSON body, gzip-compressed when large enough."""
+        body = self._json.dumps(data)
+        headers = {"Content-Type": "application/json"}
+        if self._compress_threshold is None or len(body) < self._compress_threshold:
+            return self._request(method, url, data=body, headers=headers)
+
+        resp = self._request(method, url, data=gzip.compress(body, compresslevel=6),
+                             headers={**headers, "Content-Encoding": "gzip"})
+        # Servers that do not decode request bodies answer 415, or (Django
+        # REST framework) 400 for a body they cannot parse. Until a compressed
+        # request has succeeded, a 400 may mean either, so it is re-sent.
+        if resp.status_code == 415 or (resp.status_code == 400 and not self._compress_accepted):
+            plain = self._request(method, url, data=body, headers=headers)
+            if resp.status_code == 415 or plain.status_code != 400:
+                # The server does not accept compressed bodies; stop trying.
+                self._compress_threshold = None
+            return plain
+        if resp.ok:
+            self._compress_accepted = True
+        return resp
+
+    def _invalidate_record(self, portal: str, model: str, id) -> None:
+        """Drop a written record from the record cache.
+
+        Called once the write has completed (or failed): invalidating before
+        sending would let a concurrent load cache the old version meanwhile.
+        """
+        if self._record_cache is not None:
+            self._record_cache.invalidate(portal, model, id)
+
+    def _get(self, url: str, params: dict, stream: bool = False,
+             decode: bool = False) -> Response:
+        """Issue a GET, revalidating against the HTTP cache when enabled.
+
+        Streamed responses bypass the cache, since storing them would read
+        the whole body.
+        """
+        if stream:
+            return self._request("get", url, params=params, stream=True)
+        if self._http_cache is None:
+            return self._request("get", url, decode=decode, params=params)
+
+        # The entry is read once: another thread or process may evict it
+        # while the request is in flight.
+        key = self._http_cache.key(url, params, self._token)
+        entry = self._http_cache.get(key)
+        resp = self._request("get", url, decode=decode, params=params,
+                             headers=self._http_cache.validators(key, entry))
+        if resp.status_code == 304:
+            if entry is not None:
+                return self._http_cache.response(key, resp, entry)
+            # Nothing to revalidate against: ask for the body outright.
+            resp = self._request("get", url, decode=decode, params=params,
+                                 headers={"Cache-Control": "no-cache"})
+        self._http_cache.store(key, resp)
+        return resp
+
+    def _fetch_page(self, url: str, params: dict) -> dict:
+        """GET one page of a list endpoint and return the decoded body."""
+        resp = self._get(url, params, decode=True)
+        if resp.status_code == 401:
+            raise AuthenticationError(
+                "API token is invalid or expired. Run `brainstem login` to re-authenticate."
+            )
+        resp.raise_for_status()
+        if getattr(resp, "_decoded", None) is not None:
+            return resp._decoded
+        return self._json.loads(resp.content)  # revalidated from the HTTP cache
+
+    def _worker_limit(self, max_workers: int = None) -> int:
+        """Workers for one call: *max_workers* (default: the client's),
+        capped at the connection pool size. Threads beyond it would find no
+        pooled connection and reconnect for every request."""
+        return min(max_workers or self._max_workers, self._pool_size)
+
+    def _map_concurrent(self, fn, items, max_workers: int = None,
+                        gate: AdaptiveConcurrency = None) -> list:
+        """Apply *fn* to every item using a bounded thread pool.
+
+        Results are returned in the order of *items*; the first exception
+        raised by *fn* propagates to the caller. A *gate* shared between
+        calls bounds their tasks together.
+        """
+        items = list(items)
+        workers = min(self._worker_limit(max_workers), len(items))
+        if workers <= 1 and gate is None:
+            return [fn(item) for item in items]
+
+        # The pool holds *workers* threads, but how many may run at once
+        # shrinks and grows with throttling signals from the server.
+        if gate is None:
+            gate = AdaptiveConcurrency(workers, throttled=self._rate_limiter.throttled)
+
+        def _gated(item):
+            gate.acquire()
+            try:
+                return fn(item)
+            finally:
+                gate.release(self._rate_limiter.throttled)
+
+        if workers <= 1:
+            return [_gated(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_gated, items))
+
+    def _iter_keyset_pages(self, url: str, params: dict, keyset: str,
+                           sizer: AdaptivePageSize = None) -> Iterator[dict]:
+        """Yield pages sorted by *keyset*, resuming after the last value seen.
+
+        Every request filters on ``<field>.gt`` (``.lt`` for a descending
+        ``'-field'``) instead of growing an offset, so each page costs the
+        server the same and concurrent inserts cannot shift rows between
+        pages. With a *sizer*, each page is requested at its current size.
+        """
+        field = keyset.lstrip("-")
+        cursor = f"filter{{{field}.{'lt' if keyset.startswith('-') else 'gt'}}}"
+        params = {k: v for k, v in params.items() if k != "offset"}
+        params["sort[]"] = [keyset]
+        while True:
+            if sizer is not None:
+                params = {**params, "limit": sizer.size}
+            data = self._fetch_page(url, params)
+            records = data[_records_key(data)]
+            if sizer is not None:
+                self._observe_page(sizer, params, len(records))
+            yield data
+            # 'count' covers only the records still ahead of the cursor.
+            remaining = data.get("count")
+            if remaining is None:
+                last_page = len(records) < params["limit"]
+            else:
+                last_page = len(records) >= remaining
+            if not records or last_page:
+                return
+            params = {**params, cursor: records[-1][field]}
+
+    def _observe_page(self, sizer: AdaptivePageSize, params: dict, records: int) -> None:
+        """Report the page just fetched on this thread to *sizer*.
+
+        Time spent waiting in the rate limiter is not the page's own cost.
+        """
+        event = self._local.event
+        sizer.observe(params.get("offset"), params["limit"], records,
+                      event.timings["total"] - event.timings["queue"], event.bytes_received)
+
+    def _fetch_adaptive(self, fetch, params: dict, start: int, total: int,
+                        sizer: AdaptivePageSize, max_workers: int = None) -> list:
+        """Fetch the records from offset *start* to *total* in pages sized by *sizer*.
+
+        Offsets are handed out as workers become free, each page at the size
+        chosen after the pages completed so far. ``fetch(params)`` returns
+        ``(page, records)``. A page the server cuts short (a lower page size
+        limit than ours) is followed by a request for the rest. Returns the
+        pages in offset order.
+        """
+        workers = max(1, self._worker_limit(max_workers))
+        gate = AdaptiveConcurrency(workers, throttled=self._rate_limiter.throttled)
+
+        def _gated(page_params):
+            gate.acquire()
+            try:
+                return fetch(page_params)
+            finally:
+                gate.release(self._rate_limiter.throttled)
+
+        pages, refills, next_offset, pending = {}, [], start, {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                while len(pending) < workers and (refills or next_offset < total):
+                    if refills:
+                        offset, size = refills.pop()
+                    else:
+                        offset, size = next_offset, sizer.size
+                        next_offset += size
+                    page_params = {**params, "offset": offset, "limit": size}
+                    pending[pool.submit(_gated, page_params)] = (offset, size)
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    offset, size = pending.pop(future)
+                    pages[offset], records = future.result()
+                    if 0 < records < size and offset + records < total:
+                        sizer.cap(records)
+                        refills.append((offset + records, size - records))
+        return [pages[offset] for offset in sorted(pages)]
+
+    @staticmethod
+    def _check_keyset(keyset: str, sort: list, offset: int) -> None:
+        if sort and list(sort) != [keyset]:
+            raise ValueError(
+                f"keyset pagination sorts by '{keyset}'; it cannot be combined with sort={sort!r}."
+            )
+        if offset:
+            raise ValueError("keyset pagination cannot be combined with offset.")
+
+    def _run_bulk(self, send, items, max_workers: int = None, retries: int = 2,
+                  idempotent=None) -> BulkResult:
+        """Call ``send(item) -> (id, Response)`` for every item concurrently.
+
+        Connection errors and 502/503/504 responses are retried up to
+        *retries* times with exponential backoff. Items for which
+        ``idempotent(item)`` is false are only retried when the request
+        cannot have reached the server: on 503 and on errors while
+        connecting. A failing item never stops the rest of the batch.
+        """
+        started = time.monotonic()
+
+        def _attempt(indexed):
+            index, item = indexed
+            outcome = {"index": index, "id": None, "status_code": None,
+                       "response": None, "error": None, "retries": 0}
+            safe = idempotent is None or idempotent(item)
+            statuses = _TRANSIENT_STATUSES if safe else _UNPROCESSED_STATUSES
+            while True:
+                outcome["response"] = outcome["status_code"] = None
+                try:
+                    outcome["id"], resp = send(item)
+                    outcome["response"] = resp
+                    outcome["status_code"] = resp.status_code
+                    outcome["error"] = None if resp.ok else resp.text
+                    transient = resp.status_code in statuses
+                except requests.ConnectionError as exc:
+                    outcome["error"] = exc
+                    transient = safe or _connect_failed(exc)
+                except requests.RequestException as exc:
+                    outcome["error"] = exc
+                    transient = False
+                if not transient or outcome["retries"] >= retries:
+                    return outcome
+                time.sleep(self.BULK_BACKOFF * 2 ** outcome["retries"])
+                outcome["retries"] += 1
+
+        outcomes = self._map_concurrent(_attempt, enumerate(items), max_workers)
+        return BulkResult(
+            succeeded=[o for o in outcomes if o["error"] is None],
+            not_found=[o for o in outcomes if o["status_code"] == 404],
+            failed=[o for o in outcomes
+                    if o["error"] is not None and o["status_code"] != 404],
+            elapsed=time.monotonic() - started,
+        )
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -248,7 +744,12 @@ class BrainstemClient:
              include: list = None,
              limit: int = None,
              offset: int = None,
-             load_all: bool = False) -> Union[Response, dict]:
+             load_all: bool = False,
+             max_workers: int = None,
+             keyset: str = None,
+             stream: bool = False,
+             normalize=False,
+             adaptive=False) -> Union[Response, dict]:
         """Load one or more records of *model*.
 
         Parameters
@@ -266,6 +767,26 @@ class BrainstemClient:
         load_all : When ``True``, automatically follow pagination and return a
                    combined ``dict`` with all records merged under the model key.
                    When ``False`` (default), returns the raw ``Response``.
+        max_workers : Number of pages fetched concurrently when ``load_all=True``.
+                      Defaults to the client's ``max_workers``; ``1`` fetches serially.
+                      Capped at the client's connection pool size, so going
+                      beyond 10 needs a client created with that ``max_workers``.
+        keyset   : With ``load_all=True``, page by this unique field (e.g. ``'id'``,
+                   or ``'-id'`` for descending) using ``.gt``/``.lt`` filters
+                   instead of offsets. Pages are then fetched one after another.
+        stream   : Return the ``Response`` without reading its body, so it can be
+                   consumed with ``iter_content()``. Bypasses the caches and
+                   cannot be combined with ``load_all``.
+        normalize : With ``load_all=True``, ``True`` to keep one shared dict per
+                    ``(model, id)`` for records and embedded objects, so repeated
+                    includes are held once; or an ``EntityStore`` to add them to
+                    (e.g. one shared across several loads).
+        adaptive : With ``load_all=True``, ``True`` to size each page from the
+                   time and bytes per record observed so far, aiming at about
+                   two seconds per page within the API maximum (*limit*, if
+                   given, is the first page's size); or an ``AdaptivePageSize``
+                   with a custom target, whose ``history`` then reports the
+                   sizes chosen.
         """
         model = _resolve_model(model)
         portal = _resolve_portal(portal)
@@ -274,62 +795,324 @@ class BrainstemClient:
 
         params = {}
         if not id:
-            for key, val in (filters or {}).items():
-                params[f"filter{{{key}}}"] = val
-            for field in (sort or []):
-                params.setdefault("sort[]", []).append(field)
-            for rel in (include or []):
-                params.setdefault("include[]", []).append(f"{rel}.*")
-            if limit is not None:
-                params["limit"] = limit
-            if offset is not None:
-                params["offset"] = offset
+            params = self._query_params(filters, sort, include, limit, offset)
 
         if not load_all:
-            return self._session.get(url, params=params, timeout=self.DEFAULT_TIMEOUT)
+            if stream:
+                return self._get(url, params, stream=True)
+            if id and not options and self._record_cache is not None:
+                resp = self._record_cache.get(portal, model, id)
+                if resp is not None:
+                    self._emit(url, "get", resp.status_code, dict.fromkeys(PHASES, 0.0),
+                               cache_hit=True)
+                else:
+                    resp = self._get(url, params)
+                    if resp.ok:
+                        self._record_cache.set(portal, model, id, resp)
+                return resp
+            return self._get(url, params)
 
         if id is not None:
             raise ValueError("load_all=True cannot be used together with id.")
+        if stream:
+            raise ValueError("load_all=True cannot be used together with stream.")
 
         # --- auto-paginate and merge all pages ---
-        page_size = limit or 100
-        params["limit"] = page_size
-        params.setdefault("offset", offset or 0)
+        params["limit"] = limit or 100
+        params.setdefault("offset", 0)
+
+        sizer = None
+        if adaptive is not False and adaptive is not None:
+            sizer = AdaptivePageSize() if adaptive is True else adaptive
+            sizer.start(self.MAX_PAGE_SIZE, limit)
+            params["limit"] = sizer.size
+
+        if normalize is True:
+            from .store import EntityStore
+            normalize = EntityStore()
+        store = None if normalize is False or normalize is None else normalize
+
+        def fetch(page_params):
+            # Normalising each page as it arrives lets the duplicate copies
+            # of embedded objects be freed straight away.
+            data = self._fetch_page(url, page_params)
+            if sizer is not None:
+                self._observe_page(sizer, page_params, len(data[_records_key(data)]))
+            return data if store is None else store.add_page(data, model)
+
+        if keyset:
+            self._check_keyset(keyset, sort, offset)
+            combined, records_key = {}, None
+            for data in self._iter_keyset_pages(url, params, keyset, sizer):
+                if store is not None:
+                    data = store.add_page(data, model)
+                if records_key is None:
+                    records_key = _records_key(data)
+                    combined = {k: v for k, v in data.items() if k != records_key}
+                    combined[records_key] = []
+                combined[records_key].extend(data[records_key])
+            return combined
+
+        # The first page tells us the total count and the page size the
+        # server actually honours; the remaining offsets are then fetched
+        # concurrently and merged back in offset order.
+        data = fetch(params)
+        records_key = _records_key(data)
+        combined = {k: v for k, v in data.items() if k != records_key}
+        combined[records_key] = list(data[records_key])
+
+        total = data.get("count", len(combined[records_key]))
+        step = len(data[records_key])
+        if step == 0:
+            return combined
+
+        if sizer is not None:
+            if step < params["limit"]:
+                sizer.cap(step)
+
+            def fetch_counted(page_params):
+                page = fetch(page_params)
+                return page, len(page[records_key])
+
+            pages = self._fetch_adaptive(fetch_counted, params, params["offset"] + step,
+                                         total, sizer, max_workers)
+            for page in pages:
+                combined[records_key].extend(page.get(records_key, []))
+            return combined
+
+        offsets = range(params["offset"] + step, total, step)
+        pages = self._map_concurrent(
+            lambda page_offset: fetch({**params, "offset": page_offset}),
+            offsets,
+            max_workers,
+        )
+        for page in pages:
+            combined[records_key].extend(page.get(records_key, []))
 
-        combined: dict = {}
-        records_key: str = None
+        return combined
 
-        while True:
-            resp = self._session.get(url, params=params, timeout=self.DEFAULT_TIMEOUT)
-            if resp.status_code == 401:
-                raise AuthenticationError(
-                    "API token is invalid or expired. Run `brainstem login` to re-authenticate."
-                )
-            resp.raise_for_status()
-            data = resp.json()
+    def iter_pages(self,
+                   model,
+                   portal="private",
+                   filters: dict = None,
+                   sort: list = None,
+                   include: list = None,
+                   limit: int = None,
+                   offset: int = None,
+                   prefetch: bool = True,
+                   keyset: str = None) -> Iterator[dict]:
+        """Yield the decoded pages of a list query one at a time.
+
+        Unlike ``load(load_all=True)`` only the page being consumed (plus
+        the one being prefetched) is held in memory, so the footprint does
+        not grow with the size of the portal.
 
-            if records_key is None:
-                # Detect the list key (e.g. 'sessions', 'projects')
-                records_key = next(
-                    (k for k, v in data.items() if isinstance(v, list)), None
-                )
-                if records_key is None:
-                    raise ValueError(
-                        "load_all=True requires a paginated list response, but the API "
-                        "returned no list-valued key. Use load_all=False for single-object endpoints."
-                    )
-                combined = {k: v for k, v in data.items() if k != records_key}
-                combined[records_key] = []
+        Parameters
+        ----------
+        model    : Model name string or ``ModelType`` member, e.g. ``'session'``.
+        portal   : ``'private'`` (default) or ``'public'``, or ``PortalType`` member.
+        filters, sort, include : As for ``load()``.
+        limit    : Records per page (API maximum: 100; default: 100).
+        offset   : Number of records to skip before the first page.
+        prefetch : When ``True`` (default), request the next page in a
+                   background thread while the current one is consumed.
+        keyset   : Page by this unique field (e.g. ``'id'``) instead of by
+                   offset; see ``load()``. *prefetch* is ignored in this mode
+                   because each request depends on the previous page.
+        """
+        model = _resolve_model(model)
+        portal = _resolve_portal(portal)
+        url = self._build_url(portal, _MODEL_TO_APP[model], model)
+        params = self._query_params(filters, sort, include, limit or 100, offset or 0)
+
+        if keyset:
+            self._check_keyset(keyset, sort, offset)
+            yield from self._iter_keyset_pages(url, params, keyset)
+            return
+
+        def _next_params(data):
+            records = data[_records_key(data)]
+            next_offset = params["offset"] + len(records)
+            if not records or next_offset >= data.get("count", next_offset):
+                return None
+            return {**params, "offset": next_offset}
+
+        if not prefetch:
+            while params is not None:
+                data = self._fetch_page(url, params)
+                params = _next_params(data)
+                yield data
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(self._fetch_page, url, params)
+            while pending is not None:
+                data = pending.result()
+                params = _next_params(data)
+                pending = pool.submit(self._fetch_page, url, params) if params else None
+                yield data
+
+    def iter_load(self, model, portal="private", **kwargs) -> Iterator[dict]:
+        """Yield individual records of *model*, following pagination lazily.
+
+        Accepts the same keyword arguments as ``iter_pages()``.
+        """
+        for page in self.iter_pages(model, portal=portal, **kwargs):
+            yield from page[_records_key(page)]
+
+    def load_many(self,
+                  model,
+                  ids,
+                  portal="private",
+                  include: list = None,
+                  max_workers: int = None,
+                  gate: AdaptiveConcurrency = None) -> LoadManyResult:
+        """Load many records by ID with batched ``id.in`` filter queries.
+
+        The ids are split into chunks that keep each request URL under
+        ``MAX_URL_LENGTH`` characters (and at most one page long); the
+        chunks are then fetched concurrently.
 
-            combined[records_key].extend(data.get(records_key, []))
-            total = data.get("count", len(combined[records_key]))
+        Parameters
+        ----------
+        model       : Model name string or ``ModelType`` member, e.g. ``'subject'``.
+        ids         : Iterable of UUIDs. Duplicates are requested once.
+        portal      : ``'private'`` (default) or ``'public'``, or ``PortalType`` member.
+        include     : Related models to embed, e.g. ``['procedures']``.
+        max_workers : Chunks fetched at once (default: the client's ``max_workers``).
+        gate        : ``AdaptiveConcurrency`` shared with other concurrent calls,
+                      bounding their requests together (``crawl`` passes one
+                      per level). Default: a gate of this call's own.
+
+        Returns a ``LoadManyResult``: a dict mapping each found id to its
+        record, with the ids that were not found in ``.missing``.
+        """
+        model = _resolve_model(model)
+        portal = _resolve_portal(portal)
+        url = self._build_url(portal, _MODEL_TO_APP[model], model)
+        ids = list(dict.fromkeys(str(i) for i in ids))
+        base_params = self._query_params(include=include, limit=self.MAX_PAGE_SIZE)
+
+        # Each id adds one "&filter%7Bid.in%7D=<id>" pair to the query string.
+        budget = self.MAX_URL_LENGTH - len(url) - len(urlencode(base_params, doseq=True)) - 1
+        chunks, chunk, used = [], [], 0
+        for id in ids:
+            cost = len(urlencode({"filter{id.in}": id})) + 1
+            if chunk and (used + cost > budget or len(chunk) == self.MAX_PAGE_SIZE):
+                chunks.append(chunk)
+                chunk, used = [], 0
+            chunk.append(id)
+            used += cost
+        if chunk:
+            chunks.append(chunk)
+
+        def _fetch_chunk(chunk):
+            params = {**base_params, "limit": len(chunk), "filter{id.in}": chunk}
+            data = self._fetch_page(url, params)
+            return data[_records_key(data)]
+
+        records = {}
+        for page in self._map_concurrent(_fetch_chunk, chunks, max_workers, gate):
+            for record in page:
+                records[str(record.get("id"))] = record
+        return LoadManyResult(
+            {id: records[id] for id in ids if id in records},
+            missing=[id for id in ids if id not in records],
+        )
 
-            if len(combined[records_key]) >= total:
-                break
+    def sync(self,
+             model,
+             state_path,
+             portal="private",
+             store_path=None,
+             modified_field: str = "modified",
+             filters: dict = None,
+             include: list = None) -> dict:
+        """Incrementally mirror *model* into a local JSON store.
 
-            params["offset"] = params.get("offset", 0) + page_size
+        Only records whose *modified_field* is at or after the high-water mark
+        saved by the previous run are requested, ordered by that field and
+        ``id``, and merged into the store by id. Timestamps are not unique, so
+        the ids already stored at the mark are saved with it and skipped on
+        the next run, while records written later within the same timestamp
+        are still picked up. The new mark is saved once the store is written.
 
-        return combined
+        Parameters
+        ----------
+        model          : Model name string or ``ModelType`` member, e.g. ``'session'``.
+        state_path     : JSON file holding one high-water mark per portal and model.
+        portal         : ``'private'`` (default) or ``'public'``, or ``PortalType`` member.
+        store_path     : JSON file holding the records keyed by id (default:
+                         ``<state_path stem>.<portal>.<model>.json`` next to it).
+        modified_field : Timestamp field updated by the server on every change.
+        filters        : Extra filters, as for ``load()``. Changing them between
+                         runs does not re-fetch older records.
+        include        : Related models to embed, as for ``load()``.
+
+        Returns a dict with ``records`` (the whole store), ``changed`` (ids
+        fetched in this run) and ``high_water`` (the new mark).
+        """
+        model = _resolve_model(model)
+        portal = _resolve_portal(portal)
+        state_path = Path(state_path)
+        store_path = Path(store_path) if store_path else state_path.with_name(
+            f"{state_path.stem}.{portal}.{model}.json"
+        )
+        state = _read_json(state_path, {})
+        store = _read_json(store_path, {})
+        state_key = f"{portal}/{model}"
+        mark = state.get(state_key)
+        if not isinstance(mark, dict):  # plain timestamp saved by older versions
+            mark = {"mark": mark, "ids": []}
+        high_water, at_mark = mark["mark"], set(mark["ids"])
+
+        url = self._build_url(portal, _MODEL_TO_APP[model], model)
+        changed = []
+        for record in self._iter_since(url, dict(filters or {}), include,
+                                       modified_field, high_water):
+            id, modified = str(record["id"]), record.get(modified_field, high_water)
+            if modified == mark["mark"] and id in mark["ids"]:
+                continue  # stored by the previous run
+            store[id] = record
+            changed.append(id)
+            if modified != high_water:
+                high_water, at_mark = modified, set()
+            at_mark.add(id)
+
+        if changed:
+            _write_json(store_path, store)
+            state[state_key] = {"mark": high_water, "ids": sorted(at_mark)}
+            _write_json(state_path, state)
+        return {"records": store, "changed": changed, "high_water": high_water}
+
+    def _iter_since(self, url: str, filters: dict, include: list, field: str,
+                    mark=None) -> Iterator[dict]:
+        """Yield records with *field* at or after *mark* in ``(field, id)`` order.
+
+        Each page resumes after the last value of *field* seen. A page can end
+        part-way through a run of records sharing that value, so the rest of
+        the run is fetched by ``id`` first; a plain ``.gt`` cursor on a
+        non-unique field would skip it.
+        """
+        op = "gte"
+        while True:
+            query = dict(filters)
+            if mark is not None:
+                query[f"{field}.{op}"] = mark
+            params = self._query_params(query, [field, "id"], include, self.MAX_PAGE_SIZE, 0)
+            data = self._fetch_page(url, params)
+            records = data[_records_key(data)]
+            yield from records
+            remaining = data.get("count")
+            if not records or (len(records) >= remaining if remaining is not None
+                               else len(records) < self.MAX_PAGE_SIZE):
+                return
+
+            mark, op = records[-1][field], "gt"
+            tie = self._query_params({**filters, field: mark, "id.gt": records[-1]["id"]},
+                                     None, include, self.MAX_PAGE_SIZE, 0)
+            for page in self._iter_keyset_pages(url, tie, "id"):
+                yield from page[_records_key(page)]
 
     def save(self,
              model,
@@ -357,10 +1140,47 @@ class BrainstemClient:
 
         if id is not None:
             url = self._build_url(portal, app, model, id, options)
-            return self._session.patch(url, json=data, timeout=self.DEFAULT_TIMEOUT)
+            try:
+                return self._send_json("patch", url, data)
+            finally:
+                self._invalidate_record(portal, model, id)
         else:
             url = self._build_url(portal, app, model, options=options)
-            return self._session.post(url, json=data, timeout=self.DEFAULT_TIMEOUT)
+            return self._send_json("post", url, data)
+
+    def save_many(self,
+                  model,
+                  records,
+                  portal="private",
+                  max_workers: int = None,
+                  retries: int = 2) -> BulkResult:
+        """Create or update many records concurrently.
+
+        Records carrying an ``'id'`` key are updated (PATCH); the others are
+        created (POST). Failures are collected instead of stopping the batch.
+
+        Parameters
+        ----------
+        model       : Model name string or ``ModelType`` member, e.g. ``'procedurelog'``.
+        records     : Iterable of dicts of fields to submit.
+        portal      : ``'private'`` (default) or ``'public'``, or ``PortalType`` member.
+        max_workers : Requests in flight at once (default: the client's ``max_workers``).
+        retries     : Retries per record on connection errors and 502/503/504.
+                      Creates are only retried on 503 and on failures to
+                      connect, so a record is never created twice.
+
+        Returns a ``BulkResult`` whose items follow the order of *records*.
+        """
+        model = _resolve_model(model)
+        portal = _resolve_portal(portal)
+
+        def _send(record):
+            data = dict(record)
+            id = data.pop("id", None)
+            return id, self.save(model, portal=portal, id=id, data=data)
+
+        return self._run_bulk(_send, records, max_workers, retries,
+                              idempotent=lambda record: record.get("id") is not None)
 
     def delete(self,
                model,
@@ -380,13 +1200,87 @@ class BrainstemClient:
         portal = _resolve_portal(portal)
         app = _MODEL_TO_APP[model]
         url = self._build_url(portal, app, model, id)
-        return self._session.delete(url, timeout=self.DEFAULT_TIMEOUT)
+        try:
+            return self._request("delete", url)
+        finally:
+            self._invalidate_record(portal, model, id)
+
+    def delete_many(self,
+                    model,
+                    ids,
+                    portal="private",
+                    max_workers: int = None,
+                    retries: int = 2) -> BulkResult:
+        """Delete many records by ID concurrently.
+
+        Parameters
+        ----------
+        model       : Model name string or ``ModelType`` member, e.g. ``'session'``.
+        ids         : Iterable of UUIDs to delete.
+        portal      : ``'private'`` (default) or ``'public'``, or ``PortalType`` member.
+        max_workers : Requests in flight at once (default: the client's ``max_workers``).
+        retries     : Retries per record on connection errors and 502/503/504.
+
+        Returns a ``BulkResult``; records that no longer exist are listed in
+        ``not_found`` rather than ``failed``.
+        """
+        model = _resolve_model(model)
+        portal = _resolve_portal(portal)
+        return self._run_bulk(
+            lambda id: (id, self.delete(model, portal=portal, id=id)),
+            ids, max_workers, retries,
+        )
+
+    def cache_info(self):
+        """Return ``CacheInfo(hits, misses, maxsize, currsize)`` for the record
+        cache, or ``None`` when the client was created without one."""
+        if self._record_cache is None:
+            return None
+        return self._record_cache.info()
+
+    def transfer_info(self) -> TransferInfo:
+        """Return ``TransferInfo(responses, compressed_bytes, uncompressed_bytes)``
+        totalled over every response this client has read.
+
+        Each response also carries its own ``compressed_bytes`` and
+        ``uncompressed_bytes`` attributes. Streamed responses are not counted.
+        """
+        with self._transfer_lock:
+            return TransferInfo(*self._transfer)
+
+    def add_hook(self, hook):
+        """Call *hook* with a ``RequestEvent`` after every request; returns
+        *hook*, so this can be used as a decorator.
+
+        Hooks run on the thread that sent the request (``load_all`` and the
+        bulk methods use several) and should return quickly.
+        """
+        self._hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook) -> None:
+        """Stop calling a hook added with ``add_hook`` or ``hooks=``."""
+        self._hooks.remove(hook)
+
+    def stats(self, reset: bool = False) -> RequestStats:
+        """Return a snapshot of request counts and latency histograms per
+        model, endpoint and method; ``reset=True`` starts a new period.
+
+        ``stats().to_prometheus()`` renders them for a Prometheus (or
+        OpenTelemetry collector) scrape endpoint.
+        """
+        snapshot = self._stats.copy()
+        if reset:
+            self._stats.reset()
+        return snapshot
 
     def __enter__(self):
         return self
 
     def __exit__(self, *args):
         self._session.close()
+        if self._cassette is not None:
+            self._cassette.close()
 
     # ------------------------------------------------------------------
     # Convenience loaders  (mirror the MATLAB load_* helpers)
@@ -0,0 +1,247 @@
+"""Response caching for BrainstemClient.
+
+``DiskCache`` keeps GET response bodies together with their validators
+(``ETag`` / ``Last-Modified``) under ``~/.config/brainstem/cache/`` so that
+repeated identical queries are sent as conditional requests and answered
+from disk when the server replies ``304 Not Modified``.
+
+``RecordCache`` memoises single-record lookups (``load(model, id=...)``)
+in memory for a per-model time-to-live.
+"""
+
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+from urllib.parse import urlencode
+
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from .models import _MODEL_TO_APP, _TOKEN_FILE
+
+
+_CACHE_DIR = _TOKEN_FILE.parent / "cache"
+
+# Response headers worth replaying from a cached entry.
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class DiskCache:
+    """Size-bounded, least-recently-used store of GET responses.
+
+    Each entry is one file: a JSON header line (validators and headers)
+    followed by the raw response body. An entry's modification time is
+    its last use, so eviction simply removes the oldest files first.
+
+    Parameters
+    ----------
+    directory : Where entries are written (default: ``~/.config/brainstem/cache``).
+    max_bytes : Upper bound on the total size of all entries (default: 256 MiB).
+    """
+
+    DEFAULT_MAX_BYTES: int = 256 * 1024 * 1024
+
+    def __init__(self, directory=None, max_bytes: int = None) -> None:
+        self.directory = Path(directory) if directory else _CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else self.DEFAULT_MAX_BYTES
+
+    @staticmethod
+    def key(url: str, params: dict = None, token: str = None) -> str:
+        """Return the cache key for a GET of *url* with *params*.
+
+        The token is part of the key so that users sharing a machine never
+        see each other's private records.
+        """
+        query = urlencode(sorted((params or {}).items()), doseq=True)
+        raw = "\n".join([url, query, token or ""])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key
+
+    def get(self, key: str):
+        """Return ``(headers, body)`` for *key*, or ``None`` on a miss."""
+        path = self._path(key)
+        try:
+            with path.open("rb") as fh:
+                headers = json.loads(fh.readline())
+                body = fh.read()
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # mark as most recently used
+        except OSError:
+            pass
+        return headers, body
+
+    def validators(self, key: str, entry=None) -> dict:
+        """Return conditional-request headers for *key* (empty on a miss).
+
+        *entry* is the ``(headers, body)`` pair already read with ``get()``.
+        """
+        if entry is None:
+            entry = self.get(key)
+        if entry is None:
+            return {}
+        headers, _ = entry
+        conditional = {}
+        if headers.get("ETag"):
+            conditional["If-None-Match"] = headers["ETag"]
+        if headers.get("Last-Modified"):
+            conditional["If-Modified-Since"] = headers["Last-Modified"]
+        return conditional
+
+    def store(self, key: str, resp: Response) -> None:
+        """Persist a ``200`` response if it carries a validator."""
+        if resp.status_code != 200:
+            return
+        headers = {h: resp.headers[h] for h in _STORED_HEADERS if h in resp.headers}
+        if "ETag" not in headers and "Last-Modified" not in headers:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.directory.chmod(stat.S_IRWXU)  # 0o700
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(json.dumps(headers).encode("utf-8") + b"\n")
+                fh.write(resp.content)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def response(self, key: str, not_modified: Response, entry=None) -> Response:
+        """Build a ``200`` response from the entry for *key*.
+
+        *not_modified* is the ``304`` reply, whose URL and request are kept.
+        Pass the *entry* whose validators were sent: the file may have been
+        evicted since.
+        """
+        if entry is None:
+            entry = self.get(key)
+        if entry is None:
+            return not_modified
+        headers, body = entry
+        resp = Response()
+        resp.status_code = 200
+        resp.reason = "OK"
+        resp._content = body
+        resp.headers = CaseInsensitiveDict(headers)
+        resp.encoding = not_modified.encoding or "utf-8"
+        resp.url = not_modified.url
+        resp.request = not_modified.request
+        resp.elapsed = not_modified.elapsed
+        resp.from_cache = True
+        return resp
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        if not self.directory.exists():
+            return
+        for path in self.directory.iterdir():
+            if path.is_file():
+                path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Delete least-recently-used entries until under ``max_bytes``."""
+        entries = []
+        total = 0
+        for path in self.directory.iterdir():
+            if path.name.startswith(".tmp-"):
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class RecordCache:
+    """Thread-safe in-memory TTL/LRU cache of single-record responses.
+
+    Entries are keyed by ``(portal, model, id)``. Taxonomy models
+    (``species``, ``strain``, ``brainregion``, ...) rarely change and are
+    kept for six hours; everything else expires after *ttl* seconds.
+
+    Parameters
+    ----------
+    maxsize    : Maximum number of entries; the least recently used is
+                 dropped first (default: 1024).
+    ttl        : Default time-to-live in seconds (default: 60).
+    model_ttls : Per-model overrides, e.g. ``{'subject': 600}``.
+    """
+
+    DEFAULT_MAXSIZE: int = 1024
+    DEFAULT_TTL: float = 60
+    TAXONOMY_TTL: float = 6 * 60 * 60
+
+    def __init__(self, maxsize: int = None, ttl: float = None, model_ttls: dict = None) -> None:
+        self.maxsize = maxsize if maxsize is not None else self.DEFAULT_MAXSIZE
+        self.ttl = ttl if ttl is not None else self.DEFAULT_TTL
+        self.model_ttls = {
+            model: self.TAXONOMY_TTL
+            for model, app in _MODEL_TO_APP.items() if app == "taxonomies"
+        }
+        self.model_ttls.update(model_ttls or {})
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, portal: str, model: str, id: str):
+        """Return the cached value, or ``None`` if absent or expired."""
+        key = (portal, model, id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return None
+
+    def set(self, portal: str, model: str, id: str, value) -> None:
+        """Store *value* for this record, evicting the LRU entry if full."""
+        expires = time.monotonic() + self.model_ttls.get(model, self.ttl)
+        key = (portal, model, id)
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, portal: str, model: str, id: str) -> None:
+        """Drop the entry for one record, if present."""
+        with self._lock:
+            self._entries.pop((portal, model, id), None)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = 0
+
+    def info(self) -> CacheInfo:
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._entries))
@@ -0,0 +1,183 @@
+"""Record and replay of HTTP traffic for offline, deterministic runs.
+
+A ``Cassette`` is a file of JSON lines, one per request: method, URL,
+status, a few response headers and the body. It is gzip-compressed when
+its name ends in ``.gz``. In record mode every request the client sends
+goes to the server and is appended to the file. In replay mode nothing
+leaves the process: requests are answered from an in-memory index keyed
+on method, URL and query parameters.
+
+    with BrainstemClient(cassette="tutorial.jsonl.gz") as client:
+        client.load("session", load_all=True)   # recorded on the first run,
+                                                # replayed afterwards
+"""
+
+import base64
+import gzip
+import io
+import json
+import threading
+from collections import deque
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests import RequestException
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+
+# Response headers kept in a cassette. Bodies are stored decoded, so
+# transfer headers such as Content-Encoding are deliberately left out.
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After", "Location")
+
+_MODES = ("record", "replay")
+
+
+class CassetteMiss(RequestException):
+    """A replayed request has no recorded interaction."""
+
+
+def _match_key(method: str, url: str) -> tuple:
+    """Return the key a request is matched on.
+
+    Query parameters are ordered by name so ``params`` dicts built in a
+    different order still match; repeated parameters such as ``sort[]``
+    keep their relative order, which is significant.
+    """
+    parts = urlsplit(url)
+    pairs = sorted(parse_qsl(parts.query, keep_blank_values=True), key=lambda kv: kv[0])
+    query = urlencode(pairs)
+    return method.upper(), urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+
+
+class Cassette:
+    """A recorded set of request/response interactions.
+
+    Parameters
+    ----------
+    path : File to record to or replay from. Names ending in ``.gz`` are
+           gzip-compressed.
+    mode : ``'record'`` (send requests and write them, replacing the file),
+           ``'replay'`` (answer from the file, never touch the network) or
+           ``None`` (default): replay if *path* exists, otherwise record.
+
+    A request made more than once is answered with its recorded responses
+    in order; once they are used up the last one is repeated.
+    """
+
+    def __init__(self, path, mode: str = None) -> None:
+        self.path = Path(path)
+        if mode is None:
+            mode = "replay" if self.path.exists() else "record"
+        if mode not in _MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}'. Valid: {', '.join(_MODES)}.")
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._fh = None
+        self._index = {}
+        if mode == "replay":
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _open(self, mode: str):
+        if self.path.suffix == ".gz":
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        return self.path.open(mode, encoding="utf-8")
+
+    def _load(self) -> None:
+        with self._open("r") as fh:
+            try:
+                for line in fh:
+                    if line.strip():
+                        entry = json.loads(line)
+                        key = _match_key(entry["method"], entry["url"])
+                        self._index.setdefault(key, deque()).append(entry)
+            except EOFError:
+                pass  # recording was not closed; keep what was flushed
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._index.values())
+
+    # ------------------------------------------------------------------
+
+    def record(self, request, resp: Response) -> None:
+        """Append one interaction; reads the response body."""
+        body = resp.content
+        entry = {
+            "method": request.method,
+            "url": request.url,
+            "status": resp.status_code,
+            "headers": {h: resp.headers[h] for h in _STORED_HEADERS if h in resp.headers},
+        }
+        try:
+            entry["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(body).decode("ascii")
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._fh is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fh = self._open("w")
+            self._fh.write(line)
+            self._fh.flush()
+        self._index.setdefault(_match_key(request.method, request.url), deque()).append(entry)
+
+    def play(self, request) -> Response:
+        """Return the recorded response to *request*.
+
+        Raises ``CassetteMiss`` if the cassette has no matching interaction.
+        """
+        key = _match_key(request.method, request.url)
+        with self._lock:
+            entries = self._index.get(key)
+            if not entries:
+                raise CassetteMiss(
+                    f"No recorded response for {key[0]} {key[1]} in {self.path}. "
+                    "Re-record the cassette to include it.", request=request)
+            entry = entries.popleft() if len(entries) > 1 else entries[0]
+
+        if "body_b64" in entry:
+            body = base64.b64decode(entry["body_b64"])
+        else:
+            body = entry["body"].encode("utf-8")
+        resp = Response()
+        resp.status_code = entry["status"]
+        resp.reason = ""
+        resp.headers = CaseInsensitiveDict(entry["headers"])
+        resp.encoding = "utf-8"
+        resp.url = request.url
+        resp.request = request
+        resp.raw = io.BytesIO(body)
+        resp._content = body
+        resp._content_consumed = True
+        return resp
+
+    def close(self) -> None:
+        """Finish writing a recording."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+
+class CassetteAdapter(HTTPAdapter):
+    """Transport adapter that records to, or replays from, a ``Cassette``.
+
+    Extra keyword arguments are passed to ``HTTPAdapter`` and apply to the
+    real requests sent while recording.
+    """
+
+    def __init__(self, cassette: Cassette, **kwargs) -> None:
+        self.cassette = cassette
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if self.cassette.replaying:
+            return self.cassette.play(request)
+        resp = super().send(request, **kwargs)
+        self.cassette.record(request, resp)
+        return resp
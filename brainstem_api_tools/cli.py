@@ -10,110 +10,403 @@ Usage examples
   brainstem load session --portal public --filters name.icontains=rat --sort -name
   brainstem load session --id <uuid>
   brainstem load session --limit 20 --offset 40
+  brainstem load session --format ndjson > sessions.ndjson
+  brainstem load session --format csv --fields id name strain.name > sessions.csv
+  brainstem load session --format raw --limit 100 | jq .
+  brainstem --profile load session --filters name.icontains=rat > /dev/null
+  brainstem load session --profile-out load.pstats
   brainstem save session --data '{"name":"New","projects":["<uuid>"]}'
   brainstem save session --id <uuid> --data '{"description":"updated"}'
+  brainstem export session sessions.parquet --filters name.icontains=rat
   brainstem delete session --id <uuid>
+  brainstem delete session --ids-from failed_import.txt
+  cat ids.txt | brainstem delete session --ids-from -
 """
 
 import argparse
-import json
+import functools
 import os
 import sys
 
-from .brainstem_api_client import BrainstemClient, _MODEL_TO_APP, _TOKEN_FILE
+from .models import _MODEL_TO_APP, _TOKEN_FILE
 
+_MODELS = sorted(_MODEL_TO_APP)
+
+
+def __getattr__(name):
+    # BrainstemClient pulls in requests and urllib3, so it is only imported
+    # once a command actually talks to the server.
+    if name == "BrainstemClient":
+        from .brainstem_api_client import BrainstemClient
+        globals()[name] = BrainstemClient
+        return BrainstemClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _client_class():
+    return globals().get("BrainstemClient") or __getattr__("BrainstemClient")
+
+
+@functools.lru_cache(maxsize=None)
+def _codec():
+    """The JSON codec for output, imported on first use (orjson is not free)."""
+    from .codec import get_codec
+    return get_codec()
+
+
+# Subcommands and their one-line help, in the order `brainstem --help` lists them.
+_COMMANDS = {
+    "login": "Authenticate and cache your API token.",
+    "logout": "Remove the cached API token.",
+    "load": "Load records from BrainSTEM.",
+    "export": "Stream records into a Parquet file.",
+    "save": "Create or update a record.",
+    "delete": "Delete records by ID.",
+}
+
+
+def _add_load_arguments(p) -> None:
+    p.add_argument("model", choices=_MODELS, help="Model name.")
+    p.add_argument("--portal", default="private", help="'private' or 'public'.")
+    p.add_argument("--id", help="UUID of a specific record.")
+    p.add_argument(
+        "--filters",
+        nargs="+",
+        metavar="FIELD=VALUE",
+        help="Filter expressions, e.g. name.icontains=rat",
+    )
+    p.add_argument(
+        "--sort",
+        nargs="+",
+        metavar="FIELD",
+        help="Sort fields. Prefix with '-' for descending.",
+    )
+    p.add_argument(
+        "--include",
+        nargs="+",
+        metavar="RELATION",
+        help="Related models to embed.",
+    )
+    p.add_argument(
+        "--limit",
+        type=int,
+        help="Max records. 'json' and 'raw' print a single page, so at most 100 "
+             "(the API maximum); 'ndjson' and 'csv' page through up to this many.",
+    )
+    p.add_argument("--offset", type=int, help="Records to skip (pagination).")
+    p.add_argument(
+        "--format",
+        choices=("json", "ndjson", "csv", "raw"),
+        default="json",
+        help="Output format. 'ndjson' and 'csv' follow pagination (up to --limit "
+             "records) and print records as pages arrive; 'raw' copies the response body to stdout unparsed "
+             "(default: json).",
+    )
+    p.add_argument(
+        "--fields",
+        nargs="+",
+        metavar="FIELD",
+        help="Columns for --format csv; dotted paths reach embedded objects, "
+             "e.g. strain.name (default: fields of the first record).",
+    )
+    p.add_argument(
+        "--stream",
+        action="store_const",
+        const="ndjson",
+        dest="format",
+        help="Same as --format ndjson.",
+    )
+
+
+def _add_export_arguments(p) -> None:
+    p.add_argument("model", choices=_MODELS, help="Model name.")
+    p.add_argument("path", help="Destination .parquet file.")
+    p.add_argument("--portal", default="private", help="'private' or 'public'.")
+    p.add_argument(
+        "--filters",
+        nargs="+",
+        metavar="FIELD=VALUE",
+        help="Filter expressions, e.g. name.icontains=rat",
+    )
+    p.add_argument("--sort", nargs="+", metavar="FIELD", help="Sort fields.")
+    p.add_argument(
+        "--include", nargs="+", metavar="RELATION", help="Related models to embed."
+    )
+    p.add_argument(
+        "--flatten",
+        action="store_true",
+        help="Flatten embedded objects into 'parent.child' columns.",
+    )
+
+
+def _add_save_arguments(p) -> None:
+    p.add_argument("model", choices=_MODELS, help="Model name.")
+    p.add_argument("--portal", default="private")
+    p.add_argument("--id", help="UUID of the record to update (omit to create).")
+    p.add_argument(
+        "--data",
+        required=True,
+        help="JSON string of fields to submit, e.g. '{\"name\":\"x\"}'.",
+    )
+
+
+def _add_delete_arguments(p) -> None:
+    p.add_argument("model", choices=_MODELS, help="Model name.")
+    p.add_argument("--portal", default="private")
+    target = p.add_mutually_exclusive_group(required=True)
+    target.add_argument("--id", help="UUID of the record to delete.")
+    target.add_argument(
+        "--ids-from",
+        metavar="FILE",
+        help="Delete every UUID listed in FILE, one per line ('-' reads stdin).",
+    )
+    p.add_argument(
+        "--max-workers",
+        type=int,
+        help="Concurrent requests for --ids-from (default: 4).",
+    )
+
+
+_ARGUMENTS = {
+    "load": _add_load_arguments,
+    "export": _add_export_arguments,
+    "save": _add_save_arguments,
+    "delete": _add_delete_arguments,
+}
+
+
+def _common_parser(suppress: bool = False) -> argparse.ArgumentParser:
+    """Shared flags, accepted before or after the subcommand.
+
+    With *suppress* (the subcommands' copy) a flag that is not given leaves
+    no value behind, so it cannot overwrite one given before the subcommand.
+    """
+    def default(value):
+        return argparse.SUPPRESS if suppress else value
 
-def _build_parser() -> argparse.ArgumentParser:
-    # Shared flags available on every subcommand
     common = argparse.ArgumentParser(add_help=False)
     common.add_argument(
         "--token",
-        default=os.environ.get("BRAINSTEM_API_TOKEN"),
+        default=default(os.environ.get("BRAINSTEM_API_TOKEN")),
         help="API token. Defaults to $BRAINSTEM_API_TOKEN or the cached token.",
     )
     common.add_argument(
         "--headless",
         action="store_true",
+        default=default(False),
         help="Print verification URL + code instead of opening a browser.",
     )
     common.add_argument(
         "--url",
-        default=None,
+        default=default(None),
         help="Base URL of the BrainSTEM server (default: https://www.brainstem.org/).",
     )
+    common.add_argument(
+        "--profile",
+        action="store_true",
+        default=default(False),
+        help="Print a timing breakdown (imports, token, each request, decoding, "
+             "output) to stderr.",
+    )
+    common.add_argument(
+        "--profile-out",
+        metavar="PATH",
+        default=default(None),
+        help="Also profile the run with cProfile and write the stats to PATH "
+             "(implies --profile).",
+    )
+    return common
+
 
+def _build_parser(command: str = None) -> argparse.ArgumentParser:
+    """Build the argument parser.
+
+    Every subcommand is registered so usage and errors list them all, but
+    only *command* gets its arguments: there is no point building the others
+    for a single invocation. ``None`` builds all of them.
+    """
     parser = argparse.ArgumentParser(
         prog="brainstem",
         description="BrainSTEM command-line API client.",
-        parents=[common],
+        parents=[_common_parser()],
     )
 
     sub = parser.add_subparsers(dest="command", required=True)
+    for name, help in _COMMANDS.items():
+        if command is not None and name != command:
+            sub.add_parser(name, help=help)
+            continue
+        p = sub.add_parser(name, parents=[_common_parser(suppress=True)], help=help)
+        if name in _ARGUMENTS:
+            _ARGUMENTS[name](p)
 
-    # ---- login ------------------------------------------------------
-    sub.add_parser(
-        "login",
-        parents=[common],
-        help="Authenticate and cache your API token.",
-    )
+    return parser
 
-    # ---- logout -----------------------------------------------------
-    sub.add_parser(
-        "logout",
-        parents=[common],
-        help="Remove the cached API token.",
-    )
 
-    # ---- load -------------------------------------------------------
-    p_load = sub.add_parser("load", parents=[common], help="Load records from BrainSTEM.")
-    p_load.add_argument("model", choices=sorted(_MODEL_TO_APP), help="Model name.")
-    p_load.add_argument("--portal", default="private", help="'private' or 'public'.")
-    p_load.add_argument("--id", help="UUID of a specific record.")
-    p_load.add_argument(
-        "--filters",
-        nargs="+",
-        metavar="FIELD=VALUE",
-        help="Filter expressions, e.g. name.icontains=rat",
+def _command_in(argv: list):
+    """Return the subcommand named in *argv*, or ``None`` (e.g. for ``--help``)."""
+    takes_value = False
+    for arg in argv:
+        if takes_value:
+            takes_value = False
+        elif arg in ("--token", "--url", "--profile-out"):
+            takes_value = True
+        elif not arg.startswith("-"):
+            return arg if arg in _COMMANDS else None
+    return None
+
+
+def _parse_filters(parser, exprs) -> dict:
+    """Turn ['FIELD=VALUE', ...] into a filters dict, or exit with usage."""
+    filters = {}
+    for expr in (exprs or []):
+        if "=" not in expr:
+            parser.error(f"Invalid filter '{expr}': expected FIELD=VALUE")
+        k, v = expr.split("=", 1)
+        filters[k] = v
+    return filters
+
+
+def _read_ids(source: str) -> list:
+    """Read one UUID per line from *source* (a path, or '-' for stdin)."""
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source) as fh:
+            lines = fh.read().splitlines()
+    return [line.strip() for line in lines
+            if line.strip() and not line.lstrip().startswith("#")]
+
+
+def _field_value(record: dict, path: str):
+    """Look up a dotted *path*; embedded objects and lists are JSON-encoded."""
+    value = record
+    for part in path.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    if isinstance(value, (dict, list)):
+        return _codec().dumps(value).decode("utf-8")
+    return value
+
+
+def _iter_records(client, args, filters: dict):
+    """Yield the records a ``load`` command selects, page by page."""
+    if args.id:
+        resp = client.load(args.model, portal=args.portal, id=args.id, include=args.include)
+        if not resp.ok:
+            print(resp.text, file=sys.stderr)
+            sys.exit(1)
+        yield from (v for v in _codec().loads(resp.content).values() if isinstance(v, dict))
+        return
+    # --limit caps the records written; pages stay as large as the API allows.
+    # A cap that fits in one page needs no prefetch of the next.
+    page_size = client.MAX_PAGE_SIZE
+    if args.limit is not None:
+        page_size = min(args.limit, page_size)
+    records = client.iter_load(
+        args.model,
+        portal=args.portal,
+        filters=filters or None,
+        sort=args.sort,
+        include=args.include,
+        limit=page_size,
+        offset=args.offset,
+        prefetch=args.limit is None or args.limit > page_size,
     )
-    p_load.add_argument(
-        "--sort",
-        nargs="+",
-        metavar="FIELD",
-        help="Sort fields. Prefix with '-' for descending.",
+    if args.limit is not None:
+        import itertools
+
+        records = itertools.islice(records, args.limit)
+    yield from records
+
+
+def _write_records(records, fmt: str, fields: list = None) -> None:
+    """Print *records* as NDJSON or CSV as they are produced."""
+    if fmt == "ndjson":
+        for record in records:
+            print(_codec().dumps(record).decode("utf-8"))
+        return
+
+    import csv
+
+    records = iter(records)
+    first = next(records, None)
+    if first is None and not fields:
+        return
+    fields = fields or list(first)
+    writer = csv.writer(sys.stdout)
+    writer.writerow(fields)
+    if first is not None:
+        writer.writerow([_field_value(first, f) for f in fields])
+    for record in records:
+        writer.writerow([_field_value(record, f) for f in fields])
+
+
+def _write_raw(resp) -> None:
+    """Copy a streamed response body to stdout without parsing it."""
+    out = sys.stdout.buffer
+    for chunk in resp.iter_content(chunk_size=64 * 1024):
+        out.write(chunk)
+    out.flush()
+    if not resp.ok:
+        sys.exit(1)
+
+
+def _delete_many(client, args) -> None:
+    """Run a bulk delete and print a summary; exit 1 if any delete failed."""
+    ids = _read_ids(args.ids_from)
+    result = client.delete_many(
+        args.model, ids, portal=args.portal, max_workers=args.max_workers
     )
-    p_load.add_argument(
-        "--include",
-        nargs="+",
-        metavar="RELATION",
-        help="Related models to embed.",
+    print(
+        f"Deleted {len(result.succeeded)} of {len(ids)} records "
+        f"in {result.elapsed:.1f}s ({result.throughput:.1f}/s)."
     )
-    p_load.add_argument("--limit", type=int, help="Max records (API max: 100).")
-    p_load.add_argument("--offset", type=int, help="Records to skip (pagination).")
+    if result.not_found:
+        print(f"Not found ({len(result.not_found)}):")
+        for item in result.not_found:
+            print(f"  {item['id']}")
+    if result.failed:
+        print(f"Failed ({len(result.failed)}):", file=sys.stderr)
+        for item in result.failed:
+            reason = f"HTTP {item['status_code']}" if item["status_code"] else item["error"]
+            print(f"  {item['id']}: {reason}", file=sys.stderr)
+        sys.exit(1)
 
-    # ---- save -------------------------------------------------------
-    p_save = sub.add_parser("save", parents=[common], help="Create or update a record.")
-    p_save.add_argument("model", choices=sorted(_MODEL_TO_APP), help="Model name.")
-    p_save.add_argument("--portal", default="private")
-    p_save.add_argument("--id", help="UUID of the record to update (omit to create).")
-    p_save.add_argument(
-        "--data",
-        required=True,
-        help="JSON string of fields to submit, e.g. '{\"name\":\"x\"}'.",
-    )
 
-    # ---- delete -----------------------------------------------------
-    p_delete = sub.add_parser("delete", parents=[common], help="Delete a record by ID.")
-    p_delete.add_argument("model", choices=sorted(_MODEL_TO_APP), help="Model name.")
-    p_delete.add_argument("--portal", default="private")
-    p_delete.add_argument("--id", required=True, help="UUID of the record to delete.")
+class _NoProfile:
+    """Stand-in for ``profiling.Profiler`` when --profile is not given."""
 
-    return parser
+    def phase(self, name: str):
+        return self
+
+    def attach(self, client) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
 
 
 def main():
-    parser = _build_parser()
+    parser = _build_parser(_command_in(sys.argv[1:]))
     args = parser.parse_args()
 
+    if not (args.profile or args.profile_out):
+        _run(parser, args, _NoProfile())
+        return
+
+    from .profiling import Profiler
+
+    profiler = Profiler(args.profile_out)
+    try:
+        _run(parser, args, profiler)
+    finally:
+        profiler.report()
+
+
+def _run(parser, args, profile) -> None:
     if args.command == "logout":
         if _TOKEN_FILE.exists():
             _TOKEN_FILE.unlink()
@@ -122,55 +415,100 @@ def main():
             print("No cached token found.")
         return
 
-    client = BrainstemClient(
-        token=args.token,
-        headless=getattr(args, "headless", False),
-        url=getattr(args, "url", None),
-    )
+    with profile.phase("imports"):
+        client_class = _client_class()
+    with profile.phase("client and token"):
+        client = client_class(
+            token=args.token,
+            headless=getattr(args, "headless", False),
+            url=getattr(args, "url", None),
+        )
+    profile.attach(client)
 
     if args.command == "login":
         print(f"Token: {client._token}")
         print(f"Cached at: {_TOKEN_FILE}")
         return
 
+    if args.command == "export":
+        from .export import export_parquet
+
+        with profile.phase("export"):
+            result = export_parquet(
+                client,
+                args.model,
+                args.path,
+                portal=args.portal,
+                filters=_parse_filters(parser, args.filters) or None,
+                sort=args.sort,
+                include=args.include,
+                flatten=args.flatten,
+            )
+        print(f"Wrote {result['rows']} records in {result['row_groups']} "
+              f"row groups to {result['path']}")
+        return
+
     if args.command == "load":
-        filters = {}
-        for expr in (args.filters or []):
-            if "=" not in expr:
-                parser.error(f"Invalid filter '{expr}': expected FIELD=VALUE")
-            k, v = expr.split("=", 1)
-            filters[k] = v
-
-        resp = client.load(
-            args.model,
-            portal=args.portal,
-            id=args.id,
-            filters=filters or None,
-            sort=args.sort,
-            include=args.include,
-            limit=args.limit,
-            offset=args.offset,
-        )
+        filters = _parse_filters(parser, args.filters)
+
+        if args.fields and args.format != "csv":
+            parser.error("--fields requires --format csv")
+        if args.format in ("ndjson", "csv"):
+            # Pages are fetched while earlier records are written, so the
+            # requests listed separately overlap this phase.
+            with profile.phase(f"load and write {args.format}"):
+                _write_records(_iter_records(client, args, filters), args.format, args.fields)
+            return
+
+        with profile.phase("load"):
+            resp = client.load(
+                args.model,
+                portal=args.portal,
+                id=args.id,
+                filters=filters or None,
+                sort=args.sort,
+                include=args.include,
+                limit=args.limit,
+                offset=args.offset,
+                stream=args.format == "raw",
+            )
+        if args.format == "raw":
+            with profile.phase("copy raw body"):
+                _write_raw(resp)
+            return
 
     elif args.command == "save":
+        import json
+
         try:
             data = json.loads(args.data)
         except json.JSONDecodeError as exc:
             parser.error(f"Invalid JSON for --data: {exc}")
 
-        resp = client.save(args.model, portal=args.portal, id=args.id, data=data)
+        with profile.phase("save"):
+            resp = client.save(args.model, portal=args.portal, id=args.id, data=data)
 
     elif args.command == "delete":
-        resp = client.delete(args.model, portal=args.portal, id=args.id)
+        if args.ids_from:
+            with profile.phase("delete"):
+                _delete_many(client, args)
+            return
+        with profile.phase("delete"):
+            resp = client.delete(args.model, portal=args.portal, id=args.id)
 
     # Output
     if resp.status_code == 204:
         print("Deleted successfully.")
     else:
         try:
-            print(json.dumps(resp.json(), indent=2))
+            with profile.phase("decode"):
+                data = _codec().loads(resp.content)
+            with profile.phase("format"):
+                text = _codec().dumps(data, indent=True).decode("utf-8")
         except Exception:
-            print(resp.text)
+            text = resp.text
+        with profile.phase("write"):
+            print(text)
 
     if not resp.ok:
         sys.exit(1)
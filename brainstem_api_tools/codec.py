@@ -0,0 +1,80 @@
+"""JSON encoding and decoding for BrainstemClient.
+
+Pages with heavy includes spend much of their time in ``json.loads``.
+``get_codec()`` returns an orjson-backed codec when orjson is installed and
+the standard library otherwise; any object with the same ``loads`` /
+``dumps`` methods (e.g. wrapping ujson) can be passed to the client instead.
+
+Install the fast backend with::
+
+    pip install "brainstem_python_api_tools[fast]"
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the extra
+    orjson = None
+
+
+class StdlibCodec:
+    """Codec using the standard-library ``json`` module."""
+
+    name = "json"
+
+    def loads(self, data):
+        """Decode a ``bytes`` or ``str`` JSON document."""
+        return json.loads(data)
+
+    def dumps(self, obj, indent: bool = False) -> bytes:
+        """Encode *obj* as UTF-8 JSON, pretty-printed with two spaces if *indent*."""
+        return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+
+class OrjsonCodec:
+    """Codec using orjson.
+
+    Values orjson refuses (non-string dict keys, integers beyond 64 bits)
+    are encoded with the standard library instead.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError(
+                "The orjson codec requires orjson. Install it with "
+                "`pip install \"brainstem_python_api_tools[fast]\"`."
+            )
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+    def dumps(self, obj, indent: bool = False) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            return StdlibCodec().dumps(obj, indent)
+
+
+_CODECS = {"json": StdlibCodec, "orjson": OrjsonCodec}
+
+
+def get_codec(codec=None):
+    """Resolve *codec* to a codec object.
+
+    ``None`` picks orjson when installed, else the standard library; a
+    string selects ``'json'`` or ``'orjson'`` by name; any other object is
+    returned unchanged and must provide ``loads(bytes)`` and
+    ``dumps(obj, indent=False) -> bytes``.
+    """
+    if codec is None:
+        return OrjsonCodec() if orjson is not None else StdlibCodec()
+    if isinstance(codec, str):
+        if codec not in _CODECS:
+            raise ValueError(
+                f"Unknown JSON codec '{codec}'. Valid options: {', '.join(sorted(_CODECS))}"
+            )
+        return _CODECS[codec]()
+    return codec
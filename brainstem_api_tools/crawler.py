@@ -0,0 +1,141 @@
+"""Breadth-first loading of a record and everything it references.
+
+``crawl`` starts from root ids and follows relation fields level by level
+(project → sessions and subjects → data acquisitions, behaviors,
+procedures, ...). Every model reached at a level is fetched at the same
+time with batched ``load_many`` lookups, instead of one request per
+record.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .models import _model_for_field, _related_ids, _resolve_model
+from .throttle import AdaptiveConcurrency
+
+
+# Relations followed by default: model -> {field: related model}. Mirrors the
+# default includes of the load_project / load_session / load_subject helpers.
+DEFAULT_SPEC = {
+    "project": {"sessions": "session", "subjects": "subject",
+                "collections": "collection", "cohorts": "cohort"},
+    "collection": {"sessions": "session"},
+    "cohort": {"subjects": "subject"},
+    "session": {"dataacquisition": "dataacquisition", "behaviors": "behavior",
+                "manipulations": "manipulation"},
+    "subject": {"procedures": "procedure", "subjectlogs": "subjectlog"},
+}
+
+
+class CrawlResult:
+    """Records reached by ``crawl()``.
+
+    Attributes
+    ----------
+    records : ``{model: {id: record}}`` for every record fetched.
+    missing : ``{model: [ids]}`` referenced but not returned (deleted or not visible).
+    levels  : One dict per level: ``level``, ``fetched`` (``{model: count}``)
+              and ``elapsed`` seconds.
+    """
+
+    def __init__(self) -> None:
+        self.records = {}
+        self.missing = {}
+        self.levels = []
+
+    @property
+    def elapsed(self) -> float:
+        return sum(level["elapsed"] for level in self.levels)
+
+    def get(self, model: str, id: str):
+        """Return one fetched record, or ``None``."""
+        return self.records.get(model, {}).get(str(id))
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self.records.values())
+
+    def __repr__(self) -> str:
+        counts = ", ".join(f"{m}={len(r)}" for m, r in self.records.items())
+        return f"<CrawlResult {counts} levels={len(self.levels)} elapsed={self.elapsed:.2f}s>"
+
+
+def crawl(client,
+          model,
+          ids,
+          spec: dict = None,
+          portal="private",
+          max_depth: int = None,
+          max_workers: int = None) -> CrawlResult:
+    """Fetch *ids* of *model* and, breadth-first, every record they reference.
+
+    Parameters
+    ----------
+    client      : A ``BrainstemClient``.
+    model       : Model of the root records, e.g. ``'project'``.
+    ids         : Root UUIDs.
+    spec        : Relations to follow, ``{model: {field: related_model}}``
+                  (default: ``DEFAULT_SPEC``). A list of field names may be
+                  given instead of a dict when each field is named after its
+                  model (``'sessions'`` → ``'session'``).
+    portal      : ``'private'`` (default) or ``'public'``, or ``PortalType`` member.
+    max_depth   : Stop after this many levels below the roots (default: no limit).
+    max_workers : Requests in flight at once across all models of a level
+                  (default: the client's ``max_workers``).
+
+    Returns a ``CrawlResult``. Each record is fetched once, however many
+    records reference it.
+    """
+    spec = _normalise_spec(DEFAULT_SPEC if spec is None else spec)
+    max_workers = client._worker_limit(max_workers)
+    result = CrawlResult()
+    frontier = {_resolve_model(model): list(dict.fromkeys(str(i) for i in ids))}
+    requested = {m: set(frontier_ids) for m, frontier_ids in frontier.items()}
+    level = 0
+
+    while frontier and (max_depth is None or level <= max_depth):
+        start = time.perf_counter()
+        models = list(frontier)
+        # The models of a level are fetched side by side; one gate bounds
+        # their requests together, so none sits idle while another has work.
+        gate = AdaptiveConcurrency(max_workers, throttled=client._rate_limiter.throttled)
+
+        def _load(m):
+            return client.load_many(m, frontier[m], portal=portal,
+                                    max_workers=max_workers, gate=gate)
+
+        with ThreadPoolExecutor(max_workers=len(models)) as pool:
+            loaded = dict(zip(models, pool.map(_load, models)))
+
+        next_frontier = {}
+        for m, found in loaded.items():
+            result.records.setdefault(m, {}).update(found)
+            if found.missing:
+                result.missing.setdefault(m, []).extend(found.missing)
+            for record in found.values():
+                for field, related in spec.get(m, {}).items():
+                    seen = requested.setdefault(related, set())
+                    for id in _related_ids(record.get(field)):
+                        if id not in seen:
+                            seen.add(id)
+                            next_frontier.setdefault(related, {})[id] = None
+
+        result.levels.append({
+            "level": level,
+            "fetched": {m: len(found) for m, found in loaded.items()},
+            "elapsed": time.perf_counter() - start,
+        })
+        frontier = {m: list(found) for m, found in next_frontier.items()}
+        level += 1
+
+    return result
+
+
+def _normalise_spec(spec: dict) -> dict:
+    normalised = {}
+    for model, relations in spec.items():
+        if not isinstance(relations, dict):
+            relations = {field: _model_for_field(field) for field in relations}
+        normalised[_resolve_model(model)] = {
+            field: _resolve_model(related) for field, related in relations.items()
+        }
+    return normalised
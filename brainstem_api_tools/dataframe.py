@@ -0,0 +1,170 @@
+"""pandas conversion of load results.
+
+``load_dataframe`` streams a model with ``iter_pages`` and appends every
+record straight into per-column lists, so no intermediate list of
+flattened dicts is built. ``to_dataframe`` does the same for results that
+are already loaded (``load_all`` dicts, responses or iterables of pages).
+
+Embedded objects become ``parent.child`` columns. Embedded lists (e.g.
+``behaviors`` or ``epochs`` on sessions) either stay as list cells or,
+with ``split=True``, become separate DataFrames linked to their parent by
+an ``<model>_id`` column. UUID columns with repeated values are stored as
+categoricals.
+
+Requires the optional ``pandas`` dependency::
+
+    pip install "brainstem_python_api_tools[pandas]"
+"""
+
+from .brainstem_api_client import _records_key, _resolve_model
+from .models import _is_uuid, _model_for_field
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover - exercised only without the extra
+    pd = None
+
+
+def _require_pandas() -> None:
+    if pd is None:
+        raise ImportError(
+            "DataFrame conversion requires pandas. Install it with "
+            "`pip install \"brainstem_python_api_tools[pandas]\"`."
+        )
+
+
+class _ColumnBuilder:
+    """Accumulates rows directly into per-column lists."""
+
+    def __init__(self) -> None:
+        self.columns = {}
+        self.rows = 0
+
+    def add(self, row: dict) -> None:
+        for key, value in row.items():
+            column = self.columns.get(key)
+            if column is None:
+                column = self.columns[key] = [None] * self.rows
+            column.append(value)
+        self.rows += 1
+        for column in self.columns.values():
+            if len(column) < self.rows:
+                column.append(None)
+
+    def frame(self, categorical: bool):
+        df = pd.DataFrame(self.columns)
+        if categorical:
+            for name in df.columns:
+                if _is_repeated_uuid(self.columns[name]):
+                    df[name] = df[name].astype("category")
+        return df
+
+
+def _is_repeated_uuid(values: list) -> bool:
+    present = [v for v in values if v is not None]
+    if not present or not _is_uuid(present[0]):
+        return False
+    return all(isinstance(v, str) for v in present) and len(set(present)) < len(present)
+
+
+def _flatten(record: dict, prefix: str, row: dict, children: dict) -> None:
+    """Flatten *record* into *row*; collect embedded lists into *children*."""
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            _flatten(value, f"{name}.", row, children)
+        elif (children is not None and isinstance(value, list)
+              and value and all(isinstance(v, dict) for v in value)):
+            children.setdefault(name, []).extend(value)
+        else:
+            row[name] = value
+
+
+class _FrameBuilder:
+    def __init__(self, split: bool) -> None:
+        self.split = split
+        self.records_key = None
+        self.parent = _ColumnBuilder()
+        self.children = {}
+
+    def add_page(self, page: dict) -> None:
+        if self.records_key is None:
+            self.records_key = _records_key(page)
+        for record in page.get(self.records_key, []):
+            self.add_record(record)
+
+    def add_record(self, record: dict) -> None:
+        row = {}
+        embedded = {} if self.split else None
+        _flatten(record, "", row, embedded)
+        self.parent.add(row)
+        if embedded:
+            link = f"{_model_for_field(self.records_key or '')}_id"
+            for field, items in embedded.items():
+                builder = self.children.setdefault(field, _ColumnBuilder())
+                for item in items:
+                    child = {link: record.get("id")}
+                    _flatten(item, "", child, None)
+                    builder.add(child)
+
+    def result(self, categorical: bool):
+        parent = self.parent.frame(categorical)
+        if not self.split:
+            return parent
+        # Rows with an empty list left a stray column behind.
+        parent = parent.drop(columns=[c for c in self.children if c in parent.columns])
+        frames = {self.records_key or "records": parent}
+        for field, builder in self.children.items():
+            frames[field] = builder.frame(categorical)
+        return frames
+
+
+def to_dataframe(result, split: bool = False, categorical: bool = True):
+    """Convert loaded records into a DataFrame.
+
+    Parameters
+    ----------
+    result      : A ``load_all=True`` dict, a ``Response`` from ``load()``, or an
+                  iterable of pages such as ``client.iter_pages(...)``.
+    split       : Move embedded lists of objects into their own DataFrames,
+                  each with an ``<model>_id`` column linking back to the parent.
+    categorical : Store UUID columns with repeated values as ``category``.
+
+    Returns a ``DataFrame``, or with ``split=True`` a dict of DataFrames keyed
+    by the records key (e.g. ``'sessions'``) and each embedded field name.
+    """
+    _require_pandas()
+    if hasattr(result, "json"):
+        pages = [result.json()]
+    elif isinstance(result, dict):
+        pages = [result]
+    else:
+        pages = result
+    builder = _FrameBuilder(split)
+    for page in pages:
+        builder.add_page(page)
+    return builder.result(categorical)
+
+
+def load_dataframe(client,
+                   model,
+                   portal="private",
+                   filters: dict = None,
+                   sort: list = None,
+                   include: list = None,
+                   limit: int = None,
+                   split: bool = False,
+                   categorical: bool = True):
+    """Stream every record of *model* into a DataFrame.
+
+    Pages are converted as they arrive; see ``to_dataframe()`` for *split*
+    and *categorical*. The remaining arguments are as for
+    ``BrainstemClient.load()``.
+    """
+    _require_pandas()
+    model = _resolve_model(model)
+    builder = _FrameBuilder(split)
+    for page in client.iter_pages(model, portal=portal, filters=filters, sort=sort,
+                                  include=include, limit=limit):
+        builder.add_page(page)
+    return builder.result(categorical)
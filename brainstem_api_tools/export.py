@@ -0,0 +1,227 @@
+"""Streaming Parquet export.
+
+``export_parquet`` pages through a model with ``iter_pages`` and writes each
+page as a Parquet row group as soon as it arrives, so only one page of
+records is ever held in memory.
+
+Requires the optional ``pyarrow`` dependency::
+
+    pip install "brainstem_python_api_tools[parquet]"
+"""
+
+import json
+import os
+from pathlib import Path
+
+from .brainstem_api_client import _records_key
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without the extra
+    pa = pq = None
+
+
+def flatten_record(record: dict, sep: str = ".") -> dict:
+    """Flatten nested objects into ``parent.child`` keys.
+
+    Lists (e.g. embedded ``behaviors``) are kept as list values.
+    """
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict) and value:
+            for sub_key, sub_value in flatten_record(value, sep).items():
+                flat[f"{key}{sep}{sub_key}"] = sub_value
+        else:
+            flat[key] = value
+    return flat
+
+
+def _arrow_errors() -> tuple:
+    return (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError)
+
+
+def _undetermined(type_) -> bool:
+    """Whether a page reveals no type for a column: all nulls or empty lists."""
+    return pa.types.is_null(type_) or (
+        pa.types.is_list(type_) and pa.types.is_null(type_.value_type))
+
+
+def _json_array(values: list):
+    return pa.array([None if v is None else json.dumps(v) for v in values], pa.string())
+
+
+def _unify(field, type_):
+    """The type both *field* and *type_* convert to without loss, or ``None``."""
+    try:
+        schemas = [pa.schema([field]), pa.schema([pa.field(field.name, type_)])]
+        return pa.unify_schemas(schemas, promote_options="permissive").field(0)
+    except _arrow_errors():
+        return None
+
+
+def _page_arrays(records: list, names: list, json_columns: set, first: bool) -> dict:
+    """One array per column of a page, typed from the page's own values.
+
+    Columns whose values cannot share one type, and (on the first page)
+    columns whose type cannot be told yet, are added to *json_columns* and
+    encoded as JSON strings.
+    """
+    arrays = {}
+    for name in names:
+        values = [r.get(name) for r in records]
+        array = None
+        if name not in json_columns:
+            try:
+                array = pa.array(values)
+            except _arrow_errors():
+                array = None
+            if array is not None and first and _undetermined(array.type):
+                array = None
+        if array is None:
+            json_columns.add(name)
+            array = _json_array(values)
+        arrays[name] = array
+    return arrays
+
+
+def _rewrite(segments: list, part: Path, schema, compression: str, json_columns: set) -> None:
+    """Copy the row groups of every segment into *part* with the final *schema*.
+
+    *segments* holds ``(path, encoded)`` pairs, *encoded* being the columns
+    already JSON-encoded in that file. Columns a segment lacks are filled
+    with nulls and columns that switched to JSON after it was written are
+    encoded. Only one row group is held in memory at a time.
+    """
+    with pq.ParquetWriter(str(part), schema, compression=compression) as writer:
+        for segment, encoded in segments:
+            source = pq.ParquetFile(str(segment))
+            for i in range(source.num_row_groups):
+                group = source.read_row_group(i)
+                columns = [
+                    pa.nulls(group.num_rows, f.type) if f.name not in group.column_names
+                    else _json_array(group.column(f.name).to_pylist())
+                    if f.name in json_columns - encoded
+                    else group.column(f.name).cast(f.type)
+                    for f in schema
+                ]
+                writer.write_table(pa.table(columns, schema=schema))
+
+
+def export_parquet(client,
+                   model,
+                   path,
+                   portal="private",
+                   filters: dict = None,
+                   sort: list = None,
+                   include: list = None,
+                   limit: int = None,
+                   flatten: bool = False,
+                   compression: str = "snappy") -> dict:
+    """Stream every record of *model* into a Parquet file.
+
+    Column types are inferred page by page. Embedded relations become
+    struct and list columns, or ``parent.child`` columns with
+    ``flatten=True``. When a later page needs a wider type (an integer
+    column holding ``2.5``, an empty list column holding objects, a new
+    field of an embedded object) the column is promoted. Pages after a
+    type change are written to a separate file; the files are merged into
+    one with the final types when the export ends. Columns whose values share no type, and
+    columns that are entirely null or empty lists on the first page, are
+    written as JSON-encoded strings. Fields first seen on a later page
+    become new columns, null in the earlier rows. No value is ever
+    converted lossily or dropped. The file only appears at *path* once the export has finished.
+
+    Parameters
+    ----------
+    client      : A ``BrainstemClient``.
+    model       : Model name string or ``ModelType`` member, e.g. ``'session'``.
+    path        : Destination ``.parquet`` file.
+    portal, filters, sort, include : As for ``BrainstemClient.load()``.
+    limit       : Records per page, i.e. per row group (API maximum: 100).
+    flatten     : Flatten nested objects into dotted columns.
+    compression : Parquet compression codec (default: ``'snappy'``).
+
+    Returns a dict with the ``path``, number of ``rows`` and ``row_groups``.
+    """
+    if pa is None:
+        raise ImportError(
+            "Parquet export requires pyarrow. Install it with "
+            "`pip install \"brainstem_python_api_tools[parquet]\"`."
+        )
+    path = Path(path)
+    part = path.with_name(path.name + ".part")
+    writer = schema = None
+    json_columns = set()
+    segments = []
+    rows = row_groups = 0
+
+    def _segment():
+        segment = part.with_name(f"{part.name}.{len(segments)}")
+        segments.append((segment, set(json_columns)))
+        return pq.ParquetWriter(str(segment), schema, compression=compression)
+
+    try:
+        for page in client.iter_pages(model, portal=portal, filters=filters, sort=sort,
+                                      include=include, limit=limit):
+            records = page[_records_key(page)]
+            if not records:
+                continue
+            if flatten:
+                records = [flatten_record(r) for r in records]
+
+            if schema is None:
+                names = list(dict.fromkeys(k for r in records for k in r))
+                arrays = _page_arrays(records, names, json_columns, first=True)
+                schema = pa.schema([pa.field(n, a.type) for n, a in arrays.items()])
+                writer = _segment()
+            else:
+                was_json = set(json_columns)
+                arrays = _page_arrays(records, schema.names, json_columns, first=False)
+                fields = []
+                for field in schema:
+                    unified = None if field.name in json_columns else _unify(
+                        field, arrays[field.name].type)
+                    if unified is None and field.name not in json_columns:
+                        json_columns.add(field.name)
+                        arrays[field.name] = _json_array([r.get(field.name) for r in records])
+                    fields.append(unified or field.with_type(pa.string()))
+                # Fields first seen on this page are typed like a first page
+                # and added as columns, null in the row groups already written.
+                new_names = [n for n in dict.fromkeys(k for r in records for k in r)
+                             if n not in arrays]
+                if new_names:
+                    arrays.update(_page_arrays(records, new_names, json_columns, first=True))
+                    fields += [pa.field(n, arrays[n].type) for n in new_names]
+                promoted = pa.schema(fields)
+                if not promoted.equals(schema) or json_columns != was_json:
+                    # Later pages go to a new segment; all segments are
+                    # merged once at the end, so each row is rewritten at
+                    # most once however often the schema changes.
+                    writer.close()
+                    schema = promoted
+                    writer = _segment()
+
+            table = pa.table([arrays[f.name].cast(f.type) for f in schema], schema=schema)
+            writer.write_table(table)
+            rows += table.num_rows
+            row_groups += 1
+        if writer is not None:
+            writer.close()
+            writer = None
+            if len(segments) > 1:
+                _rewrite(segments, part, schema, compression, json_columns)
+                os.replace(part, path)
+            else:
+                os.replace(segments[0][0], path)
+    finally:
+        if writer is not None:
+            writer.close()
+        for segment, _ in segments:
+            segment.unlink(missing_ok=True)
+        part.unlink(missing_ok=True)
+
+    if schema is None:
+        # No records: still produce a valid (empty) file.
+        pq.write_table(pa.table({}), str(path))
+    return {"path": str(path), "rows": rows, "row_groups": row_groups}
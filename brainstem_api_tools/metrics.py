@@ -0,0 +1,272 @@
+"""Per-request events and aggregated latency statistics.
+
+Every request a ``BrainstemClient`` sends produces a ``RequestEvent``: the
+model, portal and endpoint it addressed, its status, bytes, retries, cache
+outcome and a breakdown of where the time went. Events are passed to the
+client's hooks and aggregated into a ``RequestStats``, whose latency
+histograms can be exported in the Prometheus text format.
+
+Timing phases (seconds; ``0.0`` when a phase did not happen):
+
+``queue``    waiting in the client's rate limiter (including ``429`` pauses)
+``connect``  DNS lookup and TCP connect of a new connection
+``tls``      TLS handshake of a new connection
+``server``   from sending the request to the response headers, less
+             connection setup: server processing plus one round trip
+``download`` reading the response body
+``decode``   parsing the JSON body (list pages fetched by the client)
+``total``    wall time of the whole request, including the phases above
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections import namedtuple
+from datetime import timedelta
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+PHASES = ("queue", "connect", "tls", "server", "download", "decode", "total")
+
+# Upper bounds (seconds) of the latency histogram buckets.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+RequestEvent = namedtuple("RequestEvent", [
+    "model", "portal", "endpoint", "method", "url", "status", "timings",
+    "bytes_sent", "bytes_received", "retries", "cache_hit",
+])
+RequestEvent.__doc__ = """One request sent by a client (or answered from its record cache).
+
+``endpoint`` is ``'list'`` or ``'detail'``; ``timings`` maps each of
+``PHASES`` to seconds; ``bytes_received`` counts body bytes as sent over
+the wire (before decompression); ``retries`` counts re-sends after
+``429`` and transient ``5xx`` responses or connection errors.
+"""
+
+
+# ---------------------------------------------------------------------------
+# Connection setup timing
+# ---------------------------------------------------------------------------
+
+# Connections are opened on the thread that sends the request, so the
+# adapter's connection classes leave their timings here for _request.
+_connection_timings = threading.local()
+
+
+def reset_connection_timings() -> None:
+    _connection_timings.connect = 0.0
+    _connection_timings.tls = 0.0
+
+
+def connection_timings() -> tuple:
+    """Return ``(connect, tls)`` seconds since the last reset on this thread."""
+    return getattr(_connection_timings, "connect", 0.0), getattr(_connection_timings, "tls", 0.0)
+
+
+class _TimedConnect:
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _connection_timings.connect = (getattr(_connection_timings, "connect", 0.0)
+                                           + time.perf_counter() - start)
+
+
+class _TimedHTTPConnection(_TimedConnect, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnect, HTTPSConnection):
+    def connect(self):
+        before = getattr(_connection_timings, "connect", 0.0)
+        start = time.perf_counter()
+        super().connect()
+        setup = time.perf_counter() - start
+        tcp = getattr(_connection_timings, "connect", 0.0) - before
+        _connection_timings.tls = getattr(_connection_timings, "tls", 0.0) + max(0.0, setup - tcp)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+def instrument_adapter(adapter) -> None:
+    """Make *adapter*'s connections record their connect and TLS time."""
+    adapter.poolmanager.pool_classes_by_scheme = {
+        "http": _TimedHTTPConnectionPool,
+        "https": _TimedHTTPSConnectionPool,
+    }
+
+
+def response_timings(resp, fetched: float) -> dict:
+    """Split *fetched* seconds spent in ``Session.send`` into phases.
+
+    ``resp.elapsed`` is the time to the response headers; the rest of
+    *fetched* was spent reading the body.
+    """
+    connect, tls = connection_timings()
+    elapsed = getattr(resp, "elapsed", None)
+    headers = elapsed.total_seconds() if isinstance(elapsed, timedelta) else fetched
+    return {
+        "connect": connect,
+        "tls": tls,
+        "server": max(0.0, headers - connect - tls),
+        "download": max(0.0, fetched - headers),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------------------------
+
+class RequestStats:
+    """Request counts and latency histograms per ``(model, endpoint, method)``.
+
+    Parameters
+    ----------
+    buckets : Histogram upper bounds in seconds (default: ``DEFAULT_BUCKETS``);
+              an implicit ``+Inf`` bucket follows the last.
+    """
+
+    def __init__(self, buckets=None) -> None:
+        self.buckets = tuple(sorted(buckets or DEFAULT_BUCKETS))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def record(self, event: RequestEvent) -> None:
+        """Add one event."""
+        key = (event.model or "", event.endpoint or "", event.method)
+        total = event.timings.get("total", 0.0)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {
+                    "count": 0, "sum": 0.0, "buckets": [0] * (len(self.buckets) + 1),
+                    "phases": dict.fromkeys(PHASES, 0.0), "statuses": {},
+                    "bytes_sent": 0, "bytes_received": 0, "retries": 0, "cache_hits": 0,
+                }
+            series["count"] += 1
+            series["sum"] += total
+            series["buckets"][bisect_left(self.buckets, total)] += 1
+            for phase, seconds in event.timings.items():
+                series["phases"][phase] = series["phases"].get(phase, 0.0) + seconds
+            series["statuses"][event.status] = series["statuses"].get(event.status, 0) + 1
+            series["bytes_sent"] += event.bytes_sent
+            series["bytes_received"] += event.bytes_received
+            series["retries"] += event.retries
+            series["cache_hits"] += bool(event.cache_hit)
+
+    def copy(self) -> "RequestStats":
+        """Return an independent snapshot."""
+        snapshot = RequestStats(self.buckets)
+        with self._lock:
+            for key, series in self._series.items():
+                snapshot._series[key] = {
+                    **series, "buckets": list(series["buckets"]),
+                    "phases": dict(series["phases"]), "statuses": dict(series["statuses"]),
+                }
+        return snapshot
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def quantile(self, q: float, model: str = None, endpoint: str = None,
+                 method: str = None) -> float:
+        """Estimate the *q* quantile of request latency from the histogram.
+
+        Returns the upper bound of the bucket holding the quantile (the last
+        finite bound for the ``+Inf`` bucket), over the series matching the
+        given labels; ``0.0`` when nothing matches.
+        """
+        counts = [0] * (len(self.buckets) + 1)
+        with self._lock:
+            for (m, e, meth), series in self._series.items():
+                if (model in (None, m) and endpoint in (None, e) and method in (None, meth)):
+                    counts = [a + b for a, b in zip(counts, series["buckets"])]
+        total = sum(counts)
+        if not total:
+            return 0.0
+        rank, seen = q * total, 0
+        for i, count in enumerate(counts):
+            seen += count
+            if seen >= rank and count:
+                return self.buckets[min(i, len(self.buckets) - 1)]
+        return self.buckets[-1]
+
+    def as_dict(self) -> list:
+        """Return one dict per series: labels, counts, bytes and mean phase times."""
+        rows = []
+        with self._lock:
+            items = sorted(self._series.items())
+        for (model, endpoint, method), series in items:
+            count = series["count"]
+            rows.append({
+                "model": model, "endpoint": endpoint, "method": method,
+                "count": count,
+                "statuses": dict(series["statuses"]),
+                "mean": {p: s / count for p, s in series["phases"].items()},
+                "p50": self.quantile(0.5, model, endpoint, method),
+                "p99": self.quantile(0.99, model, endpoint, method),
+                "bytes_sent": series["bytes_sent"],
+                "bytes_received": series["bytes_received"],
+                "retries": series["retries"],
+                "cache_hits": series["cache_hits"],
+            })
+        return rows
+
+    def to_prometheus(self, prefix: str = "brainstem_client") -> str:
+        """Render every series in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted(self._series.items())
+
+        def labels(model, endpoint, method, **extra):
+            pairs = {"model": model, "endpoint": endpoint, "method": method, **extra}
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs.items()) + "}"
+
+        duration = f"{prefix}_request_duration_seconds"
+        lines = [f"# HELP {duration} Wall time of BrainSTEM API requests.",
+                 f"# TYPE {duration} histogram"]
+        for (model, endpoint, method), series in items:
+            cumulative = 0
+            bounds = [repr(float(b)) for b in self.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, series["buckets"]):
+                cumulative += count
+                lines.append(f"{duration}_bucket{labels(model, endpoint, method, le=bound)} "
+                             f"{cumulative}")
+            lines.append(f"{duration}_sum{labels(model, endpoint, method)} {series['sum']}")
+            lines.append(f"{duration}_count{labels(model, endpoint, method)} {series['count']}")
+
+        counters = [
+            ("requests_total", "Requests by response status.", "statuses"),
+            ("phase_seconds_total", "Time spent per request phase.", "phases"),
+            ("bytes_sent_total", "Request body bytes sent.", "bytes_sent"),
+            ("bytes_received_total", "Response body bytes received on the wire.",
+             "bytes_received"),
+            ("retries_total", "Requests re-sent after throttling or transient errors.",
+             "retries"),
+            ("cache_hits_total", "Requests answered from a client cache.", "cache_hits"),
+        ]
+        for name, help_text, field in counters:
+            metric = f"{prefix}_{name}"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            for (model, endpoint, method), series in items:
+                value = series[field]
+                if field == "statuses":
+                    for status, count in sorted(value.items()):
+                        lines.append(f"{metric}{labels(model, endpoint, method, status=status)} "
+                                     f"{count}")
+                elif field == "phases":
+                    for phase in PHASES[:-1]:  # "total" is the duration histogram
+                        lines.append(f"{metric}{labels(model, endpoint, method, phase=phase)} "
+                                     f"{value.get(phase, 0.0)}")
+                else:
+                    lines.append(f"{metric}{labels(model, endpoint, method)} {value}")
+        return "\n".join(lines) + "\n"
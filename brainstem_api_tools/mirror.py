@@ -0,0 +1,208 @@
+"""Local SQLite mirror of a BrainSTEM portal.
+
+``PortalMirror`` downloads every record of the chosen models into a single
+SQLite file and answers ``load``-style queries (the same ``filters`` and
+``sort`` syntax) from disk, without contacting the API.
+
+Each record is stored as JSON together with indexed columns for its id
+and name, and one row per foreign key in a ``relations`` table so that
+filters such as ``projects.id`` are index lookups.
+"""
+
+import json
+import sqlite3
+import warnings
+from pathlib import Path
+
+import requests
+
+from .brainstem_api_client import _MODEL_TO_APP, _records_key, _resolve_model, _resolve_portal
+from .models import _related_ids
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    model TEXT NOT NULL,
+    id    TEXT NOT NULL,
+    name  TEXT,
+    data  TEXT NOT NULL,
+    PRIMARY KEY (model, id)
+);
+CREATE INDEX IF NOT EXISTS records_name ON records (model, name);
+CREATE TABLE IF NOT EXISTS relations (
+    model      TEXT NOT NULL,
+    id         TEXT NOT NULL,
+    field      TEXT NOT NULL,
+    related_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS relations_lookup ON relations (model, field, related_id);
+CREATE INDEX IF NOT EXISTS relations_owner ON relations (model, id);
+"""
+
+# Filter suffixes understood by query(), as accepted by the API.
+_OPERATORS = {"icontains", "contains", "startswith", "endswith", "iexact",
+              "gt", "gte", "lt", "lte", "in"}
+
+
+def _in_values(value) -> list:
+    """Values of an ``in`` filter: a list, or a comma-separated string as
+    the API accepts in a query string."""
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",") if v.strip()]
+    return list(value)
+
+
+class PortalMirror:
+    """SQLite copy of a portal, queryable with ``load()``'s filter syntax.
+
+    Parameters
+    ----------
+    path   : SQLite database file (created if missing).
+    portal : Portal the mirror holds, ``'private'`` (default) or ``'public'``.
+    """
+
+    def __init__(self, path, portal="private") -> None:
+        self.path = Path(path)
+        self.portal = _resolve_portal(portal)
+        self._db = sqlite3.connect(str(self.path))
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def build(self, client, models=None, include: dict = None) -> dict:
+        """Download *models* (default: all) from the API into the mirror.
+
+        Each model's previous rows are replaced in a single transaction.
+        Models the API refuses (e.g. 403 for models the user cannot list)
+        are skipped with a warning.
+
+        Parameters
+        ----------
+        client  : A ``BrainstemClient``.
+        models  : Model names or ``ModelType`` members to mirror.
+        include : Optional ``{model: [relations]}`` to embed while mirroring.
+
+        Returns a dict mapping each mirrored model to its record count.
+        """
+        counts = {}
+        for model in (models or sorted(_MODEL_TO_APP)):
+            model = _resolve_model(model)
+            try:
+                pages = client.iter_pages(
+                    model, portal=self.portal, include=(include or {}).get(model)
+                )
+                counts[model] = self._replace(model, pages)
+            except requests.HTTPError as exc:
+                warnings.warn(f"Skipping '{model}': {exc}")
+        return counts
+
+    def _replace(self, model: str, pages) -> int:
+        count = 0
+        with self._db:
+            self._db.execute("DELETE FROM records WHERE model = ?", (model,))
+            self._db.execute("DELETE FROM relations WHERE model = ?", (model,))
+            for page in pages:
+                records = page[_records_key(page)]
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO records (model, id, name, data) VALUES (?, ?, ?, ?)",
+                    [(model, str(r["id"]), r.get("name"), json.dumps(r)) for r in records],
+                )
+                self._db.executemany(
+                    "INSERT INTO relations (model, id, field, related_id) VALUES (?, ?, ?, ?)",
+                    [(model, str(r["id"]), field, related)
+                     for r in records
+                     for field, value in r.items() if field != "id"
+                     for related in _related_ids(value)],
+                )
+                count += len(records)
+        return count
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def query(self,
+              model,
+              id: str = None,
+              filters: dict = None,
+              sort: list = None,
+              limit: int = None,
+              offset: int = None) -> list:
+        """Return mirrored records of *model* as a list of dicts.
+
+        Parameters mirror ``BrainstemClient.load()``: *filters* such as
+        ``{'name.icontains': 'rat', 'projects.id': '<uuid>'}`` and *sort*
+        such as ``['-name']``. Supported suffixes are ``.icontains``,
+        ``.contains``, ``.iexact``, ``.startswith``, ``.endswith``, ``.gt``,
+        ``.gte``, ``.lt``, ``.lte`` and ``.in``.
+        """
+        model = _resolve_model(model)
+        where, args = ["model = ?"], [model]
+        if id is not None:
+            where.append("id = ?")
+            args.append(str(id))
+        for key, value in (filters or {}).items():
+            clause, clause_args = self._filter_clause(key, value)
+            where.append(clause)
+            args.extend(clause_args)
+
+        sql = "SELECT data FROM records WHERE " + " AND ".join(where)
+        if sort:
+            sql += " ORDER BY " + ", ".join(
+                f"{self._column(field.lstrip('-'))} {'DESC' if field.startswith('-') else 'ASC'}"
+                for field in sort
+            )
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            args.extend([-1 if limit is None else limit, offset or 0])
+        return [json.loads(row[0]) for row in self._db.execute(sql, args)]
+
+    @staticmethod
+    def _column(path: str) -> str:
+        """SQL expression for a (possibly dotted) record field."""
+        if path in ("id", "name"):
+            return path
+        return "json_extract(data, '$." + path.replace("'", "''") + "')"
+
+    def _filter_clause(self, key: str, value):
+        parts = key.split(".")
+        op = parts.pop() if len(parts) > 1 and parts[-1] in _OPERATORS else "exact"
+
+        # "<relation>.id" matches against the relations table.
+        if len(parts) == 2 and parts[1] == "id":
+            values = _in_values(value) if op == "in" else [value]
+            marks = ", ".join("?" for _ in values)
+            return (
+                "EXISTS (SELECT 1 FROM relations r WHERE r.model = records.model "
+                f"AND r.id = records.id AND r.field = ? AND r.related_id IN ({marks}))",
+                [parts[0]] + [str(v) for v in values],
+            )
+
+        column = self._column(".".join(parts))
+        if op == "in":
+            values = _in_values(value)
+            return f"{column} IN ({', '.join('?' for _ in values)})", values
+        if op == "icontains":
+            escaped = str(value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            return f"{column} LIKE ? ESCAPE '\\'", [f"%{escaped}%"]
+        if op == "contains":
+            return f"instr({column}, ?) > 0", [value]
+        if op == "iexact":
+            return f"lower({column}) = lower(?)", [value]
+        if op == "startswith":
+            return f"substr({column}, 1, length(?)) = ?", [value, value]
+        if op == "endswith":
+            return f"substr({column}, -length(?)) = ?", [value, value]
+        comparisons = {"exact": "=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+        return f"{column} {comparisons[op]} ?", [value]
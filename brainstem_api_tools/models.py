@@ -0,0 +1,142 @@
+"""Model and portal tables shared by the client and the CLI.
+
+Kept free of third-party imports so ``brainstem`` can parse its arguments,
+print help or log out without loading ``requests``.
+"""
+
+import uuid
+from enum import Enum
+from pathlib import Path
+
+
+# ---------------------------------------------------------------------------
+# Model → app routing table (single source of truth)
+# ---------------------------------------------------------------------------
+
+_MODEL_TO_APP: dict = {
+    # stem
+    "project": "stem",
+    "subject": "stem",
+    "session": "stem",
+    "collection": "stem",
+    "cohort": "stem",
+    "breeding": "stem",
+    "project_membership_invitation": "stem",
+    "project_group_membership_invitation": "stem",
+    # modules
+    "procedure": "modules",
+    "behavior": "modules",
+    "dataacquisition": "modules",
+    "manipulation": "modules",
+    "equipment": "modules",
+    "consumablestock": "modules",
+    "procedurelog": "modules",
+    "subjectlog": "modules",
+    # personal_attributes
+    "behavioralassay": "personal_attributes",
+    "datastorage": "personal_attributes",
+    "inventory": "personal_attributes",
+    "license": "personal_attributes",
+    "protocol": "personal_attributes",
+    "setup": "personal_attributes",
+    # resources
+    "consumable": "resources",
+    "hardwaredevice": "resources",
+    "supplier": "resources",
+    # taxonomies
+    "behavioralcategory": "taxonomies",
+    "behavioralparadigm": "taxonomies",
+    "brainregion": "taxonomies",
+    "regulatoryauthority": "taxonomies",
+    "setuptype": "taxonomies",
+    "species": "taxonomies",
+    "strain": "taxonomies",
+    "strainapproval": "taxonomies",
+    # dissemination
+    "journal": "dissemination",
+    "journalapproval": "dissemination",
+    "publication": "dissemination",
+    # users
+    "group": "users",
+    "group_membership_invitation": "users",
+    "group_membership_request": "users",
+    "laboratory": "users",
+    "user": "users",
+}
+
+_TOKEN_FILE = Path.home() / ".config" / "brainstem" / "token"
+
+# Derived from _MODEL_TO_APP so there is exactly one source of truth.
+ModelType = Enum("ModelType", {k: k for k in _MODEL_TO_APP})  # type: ignore[misc]
+
+_VALID_PORTALS = {"private", "public", "super"}
+
+
+def _resolve_model(model) -> str:
+    """Accept a plain string or a ModelType member and return the string value."""
+    if isinstance(model, ModelType):
+        return model.value
+    model = str(model)
+    if model not in _MODEL_TO_APP:
+        raise ValueError(
+            f"Unknown model '{model}'. Valid models are: "
+            + ", ".join(sorted(_MODEL_TO_APP))
+        )
+    return model
+
+
+def _resolve_portal(portal) -> str:
+    """Accept a plain string or a PortalType member and return the string value."""
+    if isinstance(portal, Enum):
+        portal = portal.value
+    portal = str(portal)
+    if portal not in _VALID_PORTALS:
+        raise ValueError(
+            f"Unknown portal '{portal}'. Valid portals are: "
+            + ", ".join(sorted(_VALID_PORTALS))
+        )
+    return portal
+
+
+def _model_for_field(field: str) -> str:
+    """Model a field or list key refers to (``'projects'`` → ``'project'``).
+
+    Falls back to the name itself; ids are UUIDs, so entities of an
+    unrecognised field never collide with those of a real model.
+    """
+    for candidate in (field, field[:-1], field[:-2]):
+        if candidate in _MODEL_TO_APP:
+            return candidate
+    return field
+
+
+def _is_uuid(value) -> bool:
+    if not isinstance(value, str):
+        return False
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _related_ids(value) -> list:
+    """Return the ids referenced by a field value, or ``[]`` if none.
+
+    Relations appear as a UUID, an embedded object with an ``id``, or a
+    list of either.
+    """
+    items = value if isinstance(value, list) else [value]
+    ids = []
+    for item in items:
+        if isinstance(item, dict) and _is_uuid(item.get("id")):
+            ids.append(item["id"])
+        elif _is_uuid(item):
+            ids.append(item)
+    return ids
+
+
+class PortalType(Enum):
+    public = "public"
+    private = "private"
+    super = "super"
@@ -0,0 +1,96 @@
+"""Phase timing for ``brainstem --profile``.
+
+``Profiler`` times the phases of one CLI invocation (imports, client and
+token setup, the command itself, decoding and output) and, through a
+request hook, every HTTP request the client sends. ``report()`` prints the
+breakdown to stderr; with a *path*, the whole run is also profiled with
+``cProfile`` and the stats are written there for ``python -m pstats``.
+"""
+
+import sys
+import threading
+import time
+
+
+class Profiler:
+    """Collect phase and request timings for one CLI run.
+
+    Parameters
+    ----------
+    path : Write ``cProfile`` stats to this file (default: no cProfile).
+    """
+
+    def __init__(self, path: str = None) -> None:
+        # CPU time is all that can be measured of the interpreter's own
+        # startup and the CLI's imports, which happen before this point.
+        self.startup = time.process_time()
+        self.started = time.perf_counter()
+        self.phases = []
+        self.requests = []
+        self._lock = threading.Lock()
+        self._path = path
+        self._cprofile = None
+        if path:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def phase(self, name: str) -> "_Phase":
+        """Context manager timing the phase *name*."""
+        return _Phase(self, name)
+
+    def attach(self, client) -> None:
+        """Time every request *client* sends."""
+        client.add_hook(self._on_request)
+
+    def _on_request(self, event) -> None:
+        with self._lock:
+            self.requests.append(event)
+
+    def report(self, file=None) -> None:
+        """Stop profiling and print the breakdown (to stderr by default)."""
+        total = time.perf_counter() - self.started
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self._path)
+        out = file or sys.stderr
+
+        def line(label, seconds, note=""):
+            print(f"  {label:<22}{seconds * 1000:>10.1f} ms{note}", file=out)
+
+        print("profile:", file=out)
+        line("startup", self.startup, "  (CPU time before the command ran)")
+        for name, seconds in self.phases:
+            line(name, seconds)
+
+        if self.requests:
+            print(f"  requests ({len(self.requests)}):", file=out)
+            for e in self.requests:
+                t = e.timings
+                ttfb = t["queue"] + t["connect"] + t["tls"] + t["server"]
+                print(f"    {e.method:<6} {e.model or '?'} {e.endpoint:<6} {e.status}"
+                      f"  ttfb {ttfb * 1000:7.1f} ms"
+                      f"  transfer {t['download'] * 1000:7.1f} ms"
+                      f"  decode {t['decode'] * 1000:6.1f} ms"
+                      f"  {e.bytes_received / 1024:8.1f} KiB"
+                      + ("  (cached)" if e.cache_hit else ""), file=out)
+            line("requests total", sum(e.timings["total"] for e in self.requests),
+                 "  (sum; concurrent requests overlap)")
+        line("total", total, "  (wall time of the command)")
+        if self._cprofile is not None:
+            print(f"cProfile stats written to {self._path} "
+                  f"(view with: python -m pstats {self._path})", file=out)
+
+
+class _Phase:
+    def __init__(self, profiler: Profiler, name: str) -> None:
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._profiler.phases.append((self._name, time.perf_counter() - self._start))
+        return False
@@ -0,0 +1,85 @@
+"""Identity-mapped store of records and their embedded relations.
+
+With includes such as ``include=['projects']`` the same project is embedded
+in every record that references it. ``EntityStore`` keeps exactly one dict
+per ``(model, id)``; embedded objects are replaced by that shared dict, so
+a large pull holds each entity once and an update to it is visible from
+every record that references it.
+"""
+
+import threading
+
+from .brainstem_api_client import _records_key
+from .models import _model_for_field
+
+
+class EntityStore:
+    """One shared dict per ``(model, id)``.
+
+    Adding a record whose entity is already stored updates the stored dict
+    in place, so existing references see the new fields. Safe to use from
+    several threads (``load_all`` normalises pages as they arrive).
+    """
+
+    def __init__(self) -> None:
+        self._entities = {}
+        self._lock = threading.Lock()
+
+    def add(self, model: str, record: dict) -> dict:
+        """Store *record* and its embedded objects; return the shared dict."""
+        with self._lock:
+            return self._add(model, record)
+
+    def add_page(self, page: dict, model: str = None) -> dict:
+        """Normalise every record of a list response in place and return it.
+
+        *model* defaults to the one named by the page's list key.
+        """
+        key = _records_key(page)
+        model = model or _model_for_field(key)
+        with self._lock:
+            page[key] = [self._add(model, record) for record in page[key]]
+        return page
+
+    def _add(self, model: str, record: dict) -> dict:
+        normalised = {}
+        for field, value in record.items():
+            if isinstance(value, dict) and "id" in value:
+                value = self._add(_model_for_field(field), value)
+            elif isinstance(value, list) and any(isinstance(v, dict) and "id" in v for v in value):
+                related = _model_for_field(field)
+                value = [self._add(related, v) if isinstance(v, dict) and "id" in v else v
+                         for v in value]
+            normalised[field] = value
+
+        if "id" not in record:
+            return normalised
+        key = (model, str(record["id"]))
+        entity = self._entities.get(key)
+        if entity is None:
+            self._entities[key] = normalised
+            return normalised
+        entity.update(normalised)
+        return entity
+
+    def get(self, model: str, id: str):
+        """Return the stored entity, or ``None``."""
+        return self._entities.get((model, str(id)))
+
+    def all(self, model: str) -> list:
+        """Return every stored entity of *model*."""
+        return [entity for (m, _), entity in self._entities.items() if m == model]
+
+    def counts(self) -> dict:
+        """Return ``{model: number of stored entities}``."""
+        counts = {}
+        for model, _ in self._entities:
+            counts[model] = counts.get(model, 0) + 1
+        return counts
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __contains__(self, key) -> bool:
+        model, id = key
+        return (model, str(id)) in self._entities
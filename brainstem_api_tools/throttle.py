@@ -0,0 +1,210 @@
+"""Client-side flow control for BrainstemClient.
+
+``RateLimiter`` is a token bucket shared by every request a client makes;
+when the server answers ``429 Too Many Requests`` it also pauses all
+callers for the ``Retry-After`` interval. ``AdaptiveConcurrency`` bounds
+the number of in-flight tasks in parallel and bulk operations, halving
+the bound on throttling and growing it back additively (AIMD).
+``AdaptivePageSize`` steers the page size of ``load_all`` towards a target
+duration per page.
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+def retry_after_seconds(value: str):
+    """Parse a ``Retry-After`` header (delta-seconds or HTTP-date).
+
+    Returns the delay in seconds, or ``None`` if the header is missing or
+    malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Thread-safe token bucket with a server-driven pause.
+
+    Parameters
+    ----------
+    rate  : Sustained requests per second, or ``None`` for no limit (the
+            limiter then only enforces ``Retry-After`` pauses).
+    burst : Requests that may be sent back-to-back (default: ``rate``, at least 1).
+    """
+
+    def __init__(self, rate: float = None, burst: int = None) -> None:
+        self.rate = rate
+        self.burst = burst or max(1, int(rate or 1))
+        self.throttled = 0  # number of throttling signals seen so far
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self.rate is None:
+                        return
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def throttle(self, delay: float) -> None:
+        """Record a throttling signal and hold every caller for *delay* seconds."""
+        with self._lock:
+            self.throttled += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self._tokens = 0.0
+
+
+class AdaptiveConcurrency:
+    """AIMD bound on the number of tasks running at once.
+
+    The bound starts at *max_limit*. Each task that completes without a new
+    throttling signal raises it by ``1 / limit`` (about one slot per round of
+    tasks); the first task to observe a new signal halves it.
+
+    Parameters
+    ----------
+    max_limit : Upper bound, normally the caller's ``max_workers``.
+    min_limit : Lower bound (default: 1).
+    throttled : The limiter's signal count when the operation starts, so
+                earlier signals are not held against it.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, throttled: int = 0) -> None:
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(max_limit)
+        self._active = 0
+        self._seen = throttled
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until the number of running tasks is below the bound."""
+        with self._cond:
+            while self._active >= int(self.limit):
+                self._cond.wait()
+            self._active += 1
+
+    def release(self, throttled: int) -> None:
+        """Finish a task; *throttled* is the limiter's current signal count."""
+        with self._cond:
+            self._active -= 1
+            if throttled > self._seen:
+                self._seen = throttled
+                self.limit = max(self.min_limit, self.limit / 2)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class AdaptivePageSize:
+    """Page size steered towards a target duration per page.
+
+    After each page the time and wire bytes per record are folded into
+    moving averages, and the next size is the number of records expected
+    to take *target* seconds, capped so a page stays under *max_bytes*.
+    Sizes shrink at once but at most double per page, so one fast page
+    cannot jump straight to the maximum.
+
+    Parameters
+    ----------
+    target    : Seconds a page should take (default: 2).
+    min_size  : Smallest page requested (default: 10).
+    max_size  : Largest page requested (default: the client's ``MAX_PAGE_SIZE``).
+    max_bytes : Largest payload a page should carry (default: 4 MiB).
+    initial   : Size of the first page (default: *max_size*).
+
+    Attributes
+    ----------
+    size    : Size of the next page.
+    history : One dict per page fetched: ``offset``, ``size`` (records
+              requested), ``records`` (returned), ``seconds`` and ``bytes``.
+    """
+
+    DEFAULT_TARGET: float = 2.0
+    DEFAULT_MIN_SIZE: int = 10
+    DEFAULT_MAX_BYTES: int = 4 * 1024 * 1024
+    SMOOTHING: float = 0.5  # weight of the newest page in the averages
+
+    def __init__(self, target: float = None, min_size: int = None, max_size: int = None,
+                 max_bytes: int = None, initial: int = None) -> None:
+        self.target = target if target is not None else self.DEFAULT_TARGET
+        self.min_size = min_size if min_size is not None else self.DEFAULT_MIN_SIZE
+        self.max_size = max_size
+        self.max_bytes = max_bytes if max_bytes is not None else self.DEFAULT_MAX_BYTES
+        self.size = initial
+        self.history = []
+        self._seconds_per_record = None
+        self._bytes_per_record = None
+        self._lock = threading.Lock()
+
+    def start(self, max_size: int, initial: int = None) -> None:
+        """Fill in the bounds a ``load_all`` call knows about."""
+        with self._lock:
+            if self.max_size is None:
+                self.max_size = max_size
+            self.min_size = min(self.min_size, self.max_size)
+            if self.size is None:
+                self.size = initial or self.max_size
+            self.size = max(self.min_size, min(self.size, self.max_size))
+
+    def cap(self, size: int) -> None:
+        """Lower the maximum to a page size the server actually honours."""
+        with self._lock:
+            self.max_size = max(1, min(self.max_size, size))
+            self.min_size = min(self.min_size, self.max_size)
+            self.size = min(self.size, self.max_size)
+
+    def observe(self, offset, size: int, records: int, seconds: float, nbytes: int) -> None:
+        """Record a fetched page and choose the size of the next one."""
+        with self._lock:
+            self.history.append({"offset": offset, "size": size, "records": records,
+                                 "seconds": seconds, "bytes": nbytes})
+            if not records:
+                return
+            self._seconds_per_record = self._average(self._seconds_per_record,
+                                                     seconds / records)
+            self._bytes_per_record = self._average(self._bytes_per_record, nbytes / records)
+
+            ideal = self.max_size
+            if self._seconds_per_record > 0:
+                ideal = min(ideal, self.target / self._seconds_per_record)
+            if self._bytes_per_record > 0:
+                ideal = min(ideal, self.max_bytes / self._bytes_per_record)
+            ideal = min(int(ideal), 2 * self.size)
+            self.size = max(self.min_size, min(ideal, self.max_size))
+
+    def _average(self, current, value: float) -> float:
+        if current is None:
+            return value
+        return self.SMOOTHING * value + (1 - self.SMOOTHING) * current
+
+    @property
+    def sizes(self) -> list:
+        """Page sizes requested, in the order the pages completed."""
+        return [page["size"] for page in self.history]
+
+    def __repr__(self) -> str:
+        return (f"<AdaptivePageSize size={self.size} target={self.target}s "
+                f"pages={len(self.history)}>")
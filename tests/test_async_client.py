@@ -0,0 +1,208 @@
+"""Unit tests for AsyncBrainstemClient.
+
+HTTP traffic is served by ``httpx.MockTransport`` so no network access is
+required.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from brainstem_api_tools.async_client import AsyncBrainstemClient  # noqa: E402
+from brainstem_api_tools.brainstem_api_client import AuthenticationError  # noqa: E402
+
+
+TOKEN = "test-token-abc123"
+
+
+def make_client(handler, **kwargs):
+    return AsyncBrainstemClient(token=TOKEN, transport=httpx.MockTransport(handler), **kwargs)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def paged_handler(total, requests_seen=None):
+    """Serve ``total`` session records honouring limit/offset."""
+    def handler(request):
+        if requests_seen is not None:
+            requests_seen.append(request)
+        limit = int(request.url.params.get("limit", 100))
+        offset = int(request.url.params.get("offset", 0))
+        ids = range(offset, min(offset + limit, total))
+        return httpx.Response(200, json={"sessions": [{"id": str(i)} for i in ids], "count": total})
+    return handler
+
+
+class TestAsyncLoad:
+    def test_load_returns_response_with_auth_header(self):
+        seen = []
+
+        async def main():
+            async with make_client(paged_handler(1, seen)) as client:
+                return await client.load("session")
+
+        resp = run(main())
+        assert resp.json()["sessions"] == [{"id": "0"}]
+        assert seen[0].headers["Authorization"] == f"Bearer {TOKEN}"
+        assert "/api/private/stem/session/" in str(seen[0].url)
+
+    def test_load_params_built_like_sync_client(self):
+        seen = []
+
+        async def main():
+            async with make_client(paged_handler(0, seen)) as client:
+                await client.load("session", filters={"name.icontains": "rat"},
+                                  sort=["-name"], include=["behaviors"])
+
+        run(main())
+        params = seen[0].url.params
+        assert params["filter{name.icontains}"] == "rat"
+        assert params.get_list("sort[]") == ["-name"]
+        assert params.get_list("include[]") == ["behaviors.*"]
+
+    def test_load_all_merges_pages_in_order(self):
+        seen = []
+
+        async def main():
+            async with make_client(paged_handler(25, seen)) as client:
+                return await client.load("session", limit=10, load_all=True)
+
+        result = run(main())
+        assert [r["id"] for r in result["sessions"]] == [str(i) for i in range(25)]
+        assert sorted(int(r.url.params["offset"]) for r in seen) == [0, 10, 20]
+
+    def test_load_all_401_raises(self):
+        async def main():
+            async with make_client(lambda request: httpx.Response(401)) as client:
+                await client.load("session", load_all=True)
+
+        with pytest.raises(AuthenticationError, match="brainstem login"):
+            run(main())
+
+    def test_transient_errors_retried(self, monkeypatch):
+        statuses = iter([503, 200])
+
+        async def no_sleep(_):
+            pass
+
+        monkeypatch.setattr(asyncio, "sleep", no_sleep)
+
+        async def main():
+            async with make_client(lambda request: httpx.Response(next(statuses), json={})) as client:
+                return await client.load("session")
+
+        assert run(main()).status_code == 200
+
+    @pytest.mark.parametrize("method", ["POST", "PATCH"])
+    def test_5xx_not_retried_for_non_idempotent_methods(self, method, monkeypatch):
+        seen = []
+
+        async def no_sleep(_):
+            pass
+
+        monkeypatch.setattr(asyncio, "sleep", no_sleep)
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(504 if len(seen) == 1 else 201, json={})
+
+        async def main():
+            async with make_client(handler) as client:
+                return await client.save("session", id=None if method == "POST" else "uuid-1",
+                                         data={"name": "x"})
+
+        assert run(main()).status_code == 504
+        assert [r.method for r in seen] == [method]
+
+    def test_429_on_post_still_retried(self, monkeypatch):
+        replies = iter([httpx.Response(429), httpx.Response(201, json={})])
+
+        async def no_sleep(_):
+            pass
+
+        monkeypatch.setattr(asyncio, "sleep", no_sleep)
+
+        async def main():
+            async with make_client(lambda request: next(replies)) as client:
+                return await client.save("session", data={"name": "x"})
+
+        assert run(main()).status_code == 201
+
+    def test_429_honours_retry_after(self, monkeypatch):
+        delays = []
+        replies = iter([httpx.Response(429, headers={"Retry-After": "7"}), httpx.Response(200, json={})])
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+        async def main():
+            async with make_client(lambda request: next(replies)) as client:
+                return await client.load("session")
+
+        assert run(main()).status_code == 200
+        assert delays == [7.0]
+
+    def test_iter_load_yields_all_records(self):
+        async def main():
+            async with make_client(paged_handler(5)) as client:
+                return [r["id"] async for r in client.iter_load("session", limit=2)]
+
+        assert run(main()) == ["0", "1", "2", "3", "4"]
+
+
+class TestAsyncSaveDelete:
+    def test_save_create_and_update(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json={})
+
+        async def main():
+            async with make_client(handler) as client:
+                await client.save("session", data={"name": "x"})
+                await client.save("session", id="abc", data={"description": "y"})
+
+        run(main())
+        assert [r.method for r in seen] == ["POST", "PATCH"]
+        assert json.loads(seen[0].content) == {"name": "x"}
+        assert str(seen[1].url).endswith("/stem/session/abc/")
+
+    def test_delete_requires_id(self):
+        async def main():
+            async with make_client(lambda request: httpx.Response(204)) as client:
+                await client.delete("session")
+
+        with pytest.raises(ValueError, match="'id' is required"):
+            run(main())
+
+
+class TestAsyncConvenienceLoaders:
+    def test_load_session_default_include(self):
+        seen = []
+
+        async def main():
+            async with make_client(paged_handler(0, seen)) as client:
+                await client.load_session(name="Rat")
+
+        run(main())
+        params = seen[0].url.params
+        assert params["filter{name.icontains}"] == "Rat"
+        assert set(params.get_list("include[]")) == {
+            "dataacquisition.*", "behaviors.*", "manipulations.*", "epochs.*"
+        }
+
+    def test_every_sync_loader_is_available(self):
+        from brainstem_api_tools.brainstem_api_client import BrainstemClient, _MODEL_TO_APP
+        loaders = [n for n in vars(BrainstemClient)
+                   if n.startswith("load_") and n[len("load_"):] in _MODEL_TO_APP]
+        assert "load_session" in loaders
+        for name in loaders:
+            assert hasattr(AsyncBrainstemClient, name), name
@@ -0,0 +1,211 @@
+"""Unit tests for the on-disk HTTP cache."""
+
+import os
+from unittest.mock import MagicMock
+
+from requests.models import Response
+
+from brainstem_api_tools.brainstem_api_client import BrainstemClient
+from brainstem_api_tools.cache import DiskCache, RecordCache
+
+
+TOKEN = "test-token-abc123"
+
+
+def make_response(status_code=200, body=b"{}", headers=None):
+    resp = Response()
+    resp.status_code = status_code
+    resp._content = body
+    resp.headers.update(headers or {})
+    resp.url = "https://www.brainstem.org/api/private/taxonomies/species/"
+    return resp
+
+
+class TestDiskCache:
+    def test_key_depends_on_url_params_and_token(self):
+        base = DiskCache.key("u", {"limit": 10}, "t")
+        assert base == DiskCache.key("u", {"limit": 10}, "t")
+        assert base != DiskCache.key("u", {"limit": 20}, "t")
+        assert base != DiskCache.key("v", {"limit": 10}, "t")
+        assert base != DiskCache.key("u", {"limit": 10}, "other")
+
+    def test_key_ignores_param_order(self):
+        assert DiskCache.key("u", {"a": 1, "b": [1, 2]}) == DiskCache.key("u", {"b": [1, 2], "a": 1})
+
+    def test_store_and_validators(self, tmp_path):
+        cache = DiskCache(tmp_path)
+        cache.store("k", make_response(body=b'{"x": 1}', headers={"ETag": '"v1"'}))
+        assert cache.validators("k") == {"If-None-Match": '"v1"'}
+        assert cache.get("k")[1] == b'{"x": 1}'
+
+    def test_response_without_validator_not_stored(self, tmp_path):
+        cache = DiskCache(tmp_path)
+        cache.store("k", make_response())
+        assert cache.get("k") is None
+        assert cache.validators("k") == {}
+
+    def test_error_response_not_stored(self, tmp_path):
+        cache = DiskCache(tmp_path)
+        cache.store("k", make_response(500, headers={"ETag": '"v1"'}))
+        assert cache.get("k") is None
+
+    def test_lru_eviction(self, tmp_path):
+        cache = DiskCache(tmp_path, max_bytes=250)
+        body = b"x" * 100
+        cache.store("a", make_response(body=body, headers={"ETag": '"a"'}))
+        cache.store("b", make_response(body=body, headers={"ETag": '"b"'}))
+        # Make "a" the oldest entry, then touch it so "b" becomes oldest.
+        os.utime(tmp_path / "a", (1, 1))
+        os.utime(tmp_path / "b", (2, 2))
+        cache.get("a")
+        cache.store("c", make_response(body=body, headers={"ETag": '"c"'}))
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+
+class TestClientHTTPCache:
+    def setup_method(self):
+        self.url_body = b'{"species": [{"id": "1"}], "count": 1}'
+
+    def test_disabled_by_default(self):
+        client = BrainstemClient(token=TOKEN)
+        assert client._http_cache is None
+
+    def test_conditional_request_and_304_served_from_disk(self, tmp_path):
+        client = BrainstemClient(token=TOKEN, http_cache=DiskCache(tmp_path))
+        client._session.get = MagicMock(side_effect=[
+            make_response(body=self.url_body, headers={"ETag": '"v1"', "Content-Type": "application/json"}),
+            make_response(304),
+        ])
+
+        first = client.load("species")
+        second = client.load("species")
+
+        assert first.json() == second.json() == {"species": [{"id": "1"}], "count": 1}
+        assert second.status_code == 200
+        assert second.from_cache is True
+        first_headers = client._session.get.call_args_list[0][1]["headers"]
+        second_headers = client._session.get.call_args_list[1][1]["headers"]
+        assert first_headers == {}
+        assert second_headers == {"If-None-Match": '"v1"'}
+
+    def test_load_all_uses_cache(self, tmp_path):
+        client = BrainstemClient(token=TOKEN, http_cache=DiskCache(tmp_path))
+        client._session.get = MagicMock(side_effect=[
+            make_response(body=self.url_body, headers={"ETag": '"v1"'}),
+            make_response(304),
+        ])
+        client.load("species", load_all=True)
+        result = client.load("species", load_all=True)
+        assert result["species"] == [{"id": "1"}]
+
+    def test_entry_evicted_during_request_still_served(self, tmp_path):
+        cache = DiskCache(tmp_path)
+        client = BrainstemClient(token=TOKEN, http_cache=cache)
+        client._session.get = MagicMock(return_value=make_response(
+            body=self.url_body, headers={"ETag": '"v1"'}))
+        client.load("species", load_all=True)
+
+        def evict_then_304(url, **kwargs):
+            cache.clear()
+            return make_response(304)
+
+        client._session.get = MagicMock(side_effect=evict_then_304)
+        result = client.load("species", load_all=True)
+        assert result["species"] == [{"id": "1"}]
+        client._session.get.assert_called_once()
+
+    def test_304_without_entry_reissued_unconditionally(self, tmp_path):
+        client = BrainstemClient(token=TOKEN, http_cache=DiskCache(tmp_path))
+        client._session.get = MagicMock(side_effect=[
+            make_response(304),
+            make_response(body=self.url_body, headers={"ETag": '"v1"'}),
+        ])
+        result = client.load("species", load_all=True)
+        assert result["species"] == [{"id": "1"}]
+        assert client._session.get.call_args_list[1][1]["headers"] == {"Cache-Control": "no-cache"}
+
+
+class TestRecordCache:
+    def test_hit_and_miss_counters(self):
+        cache = RecordCache()
+        assert cache.get("private", "subject", "1") is None
+        cache.set("private", "subject", "1", "value")
+        assert cache.get("private", "subject", "1") == "value"
+        info = cache.info()
+        assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+    def test_taxonomy_models_get_long_ttl(self):
+        cache = RecordCache(ttl=5)
+        assert cache.model_ttls["species"] == RecordCache.TAXONOMY_TTL
+        assert cache.model_ttls["brainregion"] == RecordCache.TAXONOMY_TTL
+        assert "subject" not in cache.model_ttls
+
+    def test_expired_entry_is_a_miss(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("brainstem_api_tools.cache.time.monotonic", lambda: now[0])
+        cache = RecordCache(ttl=10)
+        cache.set("private", "subject", "1", "value")
+        now[0] += 11
+        assert cache.get("private", "subject", "1") is None
+        assert cache.info().currsize == 0
+
+    def test_lru_bound(self):
+        cache = RecordCache(maxsize=2)
+        cache.set("private", "subject", "1", "a")
+        cache.set("private", "subject", "2", "b")
+        cache.get("private", "subject", "1")
+        cache.set("private", "subject", "3", "c")
+        assert cache.get("private", "subject", "2") is None
+        assert cache.get("private", "subject", "1") == "a"
+
+
+class TestClientRecordCache:
+    def setup_method(self):
+        self.client = BrainstemClient(token=TOKEN, record_cache=True)
+        self.client._session.get = MagicMock(
+            return_value=make_response(body=b'{"subject": {"id": "1"}}')
+        )
+
+    def test_repeated_id_lookup_hits_memory(self):
+        first = self.client.load("subject", id="1")
+        second = self.client.load_subject(id="1")
+        assert first is second
+        assert self.client._session.get.call_count == 1
+        assert self.client.cache_info().hits == 1
+
+    def test_list_queries_not_memoised(self):
+        self.client.load("subject")
+        self.client.load("subject")
+        assert self.client._session.get.call_count == 2
+
+    def test_error_responses_not_memoised(self):
+        self.client._session.get.return_value = make_response(404)
+        self.client.load("subject", id="1")
+        self.client.load("subject", id="1")
+        assert self.client._session.get.call_count == 2
+
+    def test_save_and_delete_invalidate(self):
+        self.client._session.patch = MagicMock(return_value=make_response())
+        self.client._session.delete = MagicMock(return_value=make_response(204))
+
+        self.client.load("subject", id="1")
+        self.client.save("subject", id="1", data={"name": "x"})
+        self.client.load("subject", id="1")
+        self.client.delete("subject", id="1")
+        self.client.load("subject", id="1")
+        assert self.client._session.get.call_count == 3
+
+    def test_load_during_write_does_not_leave_stale_entry(self):
+        def patch_while_loading(url, **kwargs):
+            self.client.load("subject", id="1")  # caches the record as before the write
+            return make_response()
+
+        self.client._session.patch = MagicMock(side_effect=patch_while_loading)
+        self.client.save("subject", id="1", data={"name": "x"})
+        self.client.load("subject", id="1")
+        assert self.client._session.get.call_count == 2
+
+    def test_cache_info_none_without_cache(self):
+        assert BrainstemClient(token=TOKEN).cache_info() is None
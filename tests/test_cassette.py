@@ -0,0 +1,73 @@
+"""Unit tests for cassette record/replay."""
+
+import pytest
+
+from benchmarks.fake_server import FakeBrainstem
+from brainstem_api_tools.brainstem_api_client import BrainstemClient
+from brainstem_api_tools.cassette import Cassette, CassetteMiss, _match_key
+
+
+class TestMatchKey:
+    def test_params_order_by_name_is_ignored(self):
+        assert _match_key("get", "http://x/a/?limit=5&offset=0") == \
+            _match_key("GET", "http://x/a/?offset=0&limit=5")
+
+    def test_repeated_params_keep_their_order(self):
+        assert _match_key("GET", "http://x/?sort[]=a&sort[]=b") != \
+            _match_key("GET", "http://x/?sort[]=b&sort[]=a")
+
+
+class TestRecordReplay:
+    @pytest.fixture(params=["tape.jsonl", "tape.jsonl.gz"])
+    def path(self, tmp_path, request):
+        return tmp_path / request.param
+
+    def _record(self, path):
+        with FakeBrainstem(sessions=150) as server:
+            with BrainstemClient(token="t", url=server.url, cassette=path) as client:
+                sessions = client.load("session", load_all=True)["sessions"]
+                one = client.load("session", id=sessions[0]["id"]).json()
+                client.save("behavior", data={"type": "run"})
+                missing = client.load("session", id="nope")
+        return server.url, sessions, one, missing
+
+    def test_replay_is_offline_and_identical(self, path):
+        url, sessions, one, missing = self._record(path)
+        assert Cassette(path).mode == "replay"  # file now exists
+
+        # The server is gone; everything must come from the cassette.
+        client = BrainstemClient(url=url, cassette=path)
+        assert client.load("session", load_all=True)["sessions"] == sessions
+        assert client.load("session", id=sessions[0]["id"]).json() == one
+        assert client.save("behavior", data={"type": "run"}).status_code == 201
+        assert client.load("session", id="nope").status_code == missing.status_code == 404
+
+    def test_unrecorded_request_raises(self, path):
+        url, *_ = self._record(path)
+        client = BrainstemClient(url=url, cassette=path)
+        with pytest.raises(CassetteMiss, match="species"):
+            client.load("species")
+
+    def test_repeated_request_replays_in_order(self, tmp_path):
+        path = tmp_path / "tape.jsonl"
+        with FakeBrainstem(sessions=5) as server:
+            with BrainstemClient(token="t", url=server.url, cassette=path) as client:
+                client.load("behavior", limit=1)
+                client.save("behavior", data={"type": "new"})
+                client.load("behavior", limit=1)
+
+        client = BrainstemClient(url=server.url, cassette=Cassette(path, mode="replay"))
+        counts = [client.load("behavior", limit=1).json()["count"] for _ in range(3)]
+        assert counts[1] == counts[0] + 1
+        assert counts[2] == counts[1]  # last response repeats
+
+    def test_stream_replays_body(self, path):
+        url, sessions, one, _ = self._record(path)
+        client = BrainstemClient(url=url, cassette=path)
+        resp = client.load("session", id=sessions[0]["id"], stream=True)
+        assert b"".join(resp.iter_content(64)) == client.load(
+            "session", id=sessions[0]["id"]).content
+
+    def test_unknown_mode(self, tmp_path):
+        with pytest.raises(ValueError, match="cassette mode"):
+            Cassette(tmp_path / "x", mode="rewind")
@@ -0,0 +1,77 @@
+"""Cold-start checks for the ``brainstem`` CLI.
+
+Each test runs a fresh interpreter, since the test session itself has
+already imported everything.
+"""
+
+import ast
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Generous compared to the ~10 ms measured locally, so that slow CI machines
+# pass while a regression that imports requests (~150 ms) does not.
+IMPORT_BUDGET_US = 60_000
+
+HEAVY_MODULES = ("requests", "urllib3", "httpx", "orjson", "webbrowser")
+
+
+def run_python(code: str, *flags, home=None) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    if home is not None:
+        env["HOME"] = str(home)
+    return subprocess.run([sys.executable, *flags, "-c", code], capture_output=True,
+                          text=True, env=env, cwd=ROOT, check=True)
+
+
+def loaded_heavy_modules(code: str, home=None) -> list:
+    proc = run_python(code + f"\nprint([m for m in {HEAVY_MODULES!r} if m in sys.modules])",
+                      home=home)
+    return ast.literal_eval(proc.stdout.strip().splitlines()[-1])
+
+
+class TestLazyImports:
+    def test_cli_import_skips_heavy_modules(self):
+        assert loaded_heavy_modules("import sys, brainstem_api_tools.cli") == []
+
+    def test_package_import_skips_heavy_modules(self):
+        assert loaded_heavy_modules("import sys, brainstem_api_tools") == []
+
+    def test_logout_runs_without_heavy_modules(self, tmp_path):
+        code = ("import sys\nsys.argv = ['brainstem', 'logout']\n"
+                "from brainstem_api_tools import cli\ncli.main()")
+        assert loaded_heavy_modules(code, home=tmp_path) == []
+
+    def test_package_exports_resolve_lazily(self):
+        proc = run_python("import brainstem_api_tools as b; "
+                          "print(b.BrainstemClient.__module__, b.PortalType.public.value)")
+        assert proc.stdout.split() == ["brainstem_api_tools.brainstem_api_client", "public"]
+
+
+class TestLazyParser:
+    def test_command_found_after_option_values(self):
+        from brainstem_api_tools.cli import _command_in
+        assert _command_in(["--token", "load", "save", "session"]) == "save"
+        assert _command_in(["--url=http://x", "load", "session"]) == "load"
+        assert _command_in(["--profile-out", "save", "load", "session"]) == "load"
+        assert _command_in(["--help"]) is None
+        assert _command_in(["bogus"]) is None
+
+    def test_only_requested_command_gets_arguments(self):
+        from brainstem_api_tools.cli import _build_parser
+        args = _build_parser("load").parse_args(["load", "session", "--format", "csv"])
+        assert (args.model, args.format) == ("session", "csv")
+        # Other commands are still registered, just without their arguments.
+        assert _build_parser("load").parse_args(["logout"]).command == "logout"
+
+
+class TestImportBudget:
+    def test_cli_import_time_within_budget(self):
+        proc = run_python("import brainstem_api_tools.cli", "-X", "importtime")
+        line = next(line for line in proc.stderr.splitlines()
+                    if line.rstrip().endswith("| brainstem_api_tools.cli"))
+        cumulative_us = int(line.split("|")[1])
+        assert cumulative_us < IMPORT_BUDGET_US
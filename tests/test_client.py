@@ -4,6 +4,8 @@ All HTTP calls are intercepted with pytest-mock / unittest.mock so no
 network access is required.
 """
 
+import json
+
 import pytest
 from unittest.mock import MagicMock, patch, PropertyMock
 
@@ -32,7 +34,9 @@ def mock_response(status_code=200, json_body=None):
     resp = MagicMock()
     resp.status_code = status_code
     resp.ok = status_code < 400
+    resp.headers = {}
     resp.json.return_value = json_body or {}
+    resp.content = json.dumps(json_body or {}).encode()
     return resp
 
 
@@ -124,6 +128,30 @@ class TestLoad:
         params = self.client._session.get.call_args[1]["params"]
         assert params["filter{name.icontains}"] == "rat"
 
+    def test_custom_json_codec_decodes_pages_and_encodes_saves(self):
+        codec = MagicMock()
+        codec.loads.return_value = {"sessions": [{"id": "1"}], "count": 1}
+        codec.dumps.return_value = b"{}"
+        client = BrainstemClient(token=TOKEN, json_codec=codec)
+        client._session.get = MagicMock(return_value=mock_response(200))
+        client._session.post = MagicMock(return_value=mock_response(201))
+
+        assert client.load("session", load_all=True)["sessions"] == [{"id": "1"}]
+        client.save("session", data={"name": "x"})
+        codec.dumps.assert_called_once_with({"name": "x"})
+        kwargs = client._session.post.call_args[1]
+        assert kwargs["data"] == b"{}"
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+
+    def test_load_stream_passes_stream_to_session(self):
+        self._mock_get()
+        self.client.load("session", stream=True)
+        assert self.client._session.get.call_args[1]["stream"] is True
+
+    def test_load_stream_rejects_load_all(self):
+        with pytest.raises(ValueError):
+            self.client.load("session", load_all=True, stream=True)
+
     def test_load_sort_built_correctly(self):
         self._mock_get()
         self.client.load("session", sort=["-name", "date"])
@@ -186,6 +214,125 @@ class TestLoad:
             )
 
 
+# ---------------------------------------------------------------------------
+# load_many()
+# ---------------------------------------------------------------------------
+
+class TestLoadMany:
+    def setup_method(self):
+        self.client = make_client()
+
+        def fake_get(url, params=None, timeout=None):
+            # Pretend every id except those starting with "x" exists.
+            found = [{"id": i} for i in params["filter{id.in}"] if not i.startswith("x")]
+            return mock_response(200, {"subjects": found, "count": len(found)})
+
+        self.client._session.get = MagicMock(side_effect=fake_get)
+
+    def test_returns_records_keyed_by_id_and_missing(self):
+        result = self.client.load_many("subject", ["a", "x1", "b", "a"])
+        assert dict(result) == {"a": {"id": "a"}, "b": {"id": "b"}}
+        assert result.missing == ["x1"]
+        self.client._session.get.assert_called_once()
+        params = self.client._session.get.call_args[1]["params"]
+        assert params["filter{id.in}"] == ["a", "x1", "b"]
+        assert params["limit"] == 3
+
+    def test_ids_chunked_to_page_size(self):
+        ids = [f"{i:08d}-0000-0000-0000-000000000000" for i in range(250)]
+        result = self.client.load_many("subject", ids)
+        assert len(result) == 250
+        chunks = [c[1]["params"]["filter{id.in}"] for c in self.client._session.get.call_args_list]
+        assert sorted(len(c) for c in chunks) == [50, 100, 100]
+
+    def test_ids_chunked_to_url_length(self):
+        from urllib.parse import urlencode
+
+        self.client.MAX_URL_LENGTH = 400
+        ids = [f"{i:08d}-0000-0000-0000-000000000000" for i in range(20)]
+        self.client.load_many("subject", ids)
+        for call in self.client._session.get.call_args_list:
+            url, params = call[0][0], call[1]["params"]
+            assert len(url) + 1 + len(urlencode(params, doseq=True)) <= 400
+
+
+# ---------------------------------------------------------------------------
+# sync()
+# ---------------------------------------------------------------------------
+
+class TestSync:
+    def setup_method(self):
+        from benchmarks.fake_server import query
+
+        self.client = make_client()
+        self.rows = [
+            {"id": "a", "modified": "2024-01-01T00:00:00Z", "name": "A"},
+            {"id": "b", "modified": "2024-01-02T00:00:00Z", "name": "B"},
+        ]
+
+        def fake_get(url, params=None, timeout=None):
+            rows = query(self.rows, {k: v if isinstance(v, list) else [v]
+                                     for k, v in params.items()})
+            return mock_response(200, {"sessions": rows[:params["limit"]], "count": len(rows)})
+
+        self.client._session.get = MagicMock(side_effect=fake_get)
+
+    def test_first_run_fetches_everything_and_saves_state(self, tmp_path):
+        import json
+
+        state = tmp_path / "state.json"
+        result = self.client.sync("session", state_path=state)
+        assert result["changed"] == ["a", "b"]
+        assert result["high_water"] == "2024-01-02T00:00:00Z"
+        assert json.loads(state.read_text()) == {
+            "private/session": {"mark": "2024-01-02T00:00:00Z", "ids": ["b"]}}
+        store = json.loads((tmp_path / "state.private.session.json").read_text())
+        assert set(store) == {"a", "b"}
+
+    def test_second_run_fetches_only_newer_and_merges(self, tmp_path):
+        state = tmp_path / "state.json"
+        self.client.sync("session", state_path=state)
+        self.rows[0] = {"id": "a", "modified": "2024-01-03T00:00:00Z", "name": "A2"}
+
+        result = self.client.sync("session", state_path=state)
+        params = self.client._session.get.call_args_list[-1][1]["params"]
+        assert params["filter{modified.gte}"] == "2024-01-02T00:00:00Z"
+        assert params["sort[]"] == ["modified", "id"]
+        assert result["changed"] == ["a"]
+        assert result["records"]["a"]["name"] == "A2"
+        assert result["records"]["b"]["name"] == "B"
+
+    def test_no_changes_leaves_files_untouched(self, tmp_path):
+        state = tmp_path / "state.json"
+        self.client.sync("session", state_path=state)
+        mtime = state.stat().st_mtime_ns
+        result = self.client.sync("session", state_path=state)
+        assert result["changed"] == []
+        assert state.stat().st_mtime_ns == mtime
+
+    def test_duplicate_timestamps_across_page_boundary(self, tmp_path):
+        same = "2024-01-05T00:00:00Z"
+        self.rows = [{"id": f"{i:03d}", "name": str(i),
+                      "modified": same if 10 <= i < 130 else f"2024-01-{1 + i // 100:02d}T{i % 24:02d}"}
+                     for i in range(150)]
+        state = tmp_path / "state.json"
+        result = self.client.sync("session", state_path=state)
+        assert len(result["records"]) == len(set(result["changed"])) == 150
+
+        # Written later within the same timestamp as the mark.
+        self.rows.append({"id": "000x", "name": "late", "modified": same})
+        result = self.client.sync("session", state_path=state)
+        assert result["changed"] == ["000x"]
+
+    def test_reads_plain_timestamp_state(self, tmp_path):
+        import json
+
+        state = tmp_path / "state.json"
+        state.write_text(json.dumps({"private/session": "2024-01-02T00:00:00Z"}))
+        result = self.client.sync("session", state_path=state)
+        assert result["changed"] == ["b"]  # re-fetched at the mark, merged by id
+
+
 # ---------------------------------------------------------------------------
 # save()
 # ---------------------------------------------------------------------------
@@ -212,6 +359,102 @@ class TestSave:
             self.client.save("ghost")
 
 
+# ---------------------------------------------------------------------------
+# save_many()
+# ---------------------------------------------------------------------------
+
+class TestSaveMany:
+    def setup_method(self):
+        self.client = make_client()
+        self.client.BULK_BACKOFF = 0
+
+    def test_posts_new_and_patches_existing(self):
+        self.client._session.post = MagicMock(return_value=mock_response(201))
+        self.client._session.patch = MagicMock(return_value=mock_response(200))
+        result = self.client.save_many("procedurelog", [
+            {"notes": "a"},
+            {"id": "uuid-1", "notes": "b"},
+            {"notes": "c"},
+        ])
+        assert result.ok
+        assert [o["index"] for o in result.succeeded] == [0, 1, 2]
+        assert self.client._session.post.call_count == 2
+        self.client._session.patch.assert_called_once()
+        url = self.client._session.patch.call_args[0][0]
+        assert url.endswith("/modules/procedurelog/uuid-1/")
+        assert json.loads(self.client._session.patch.call_args[1]["data"]) == {"notes": "b"}
+
+    def test_failures_collected_without_stopping_batch(self):
+        self.client._session.post = MagicMock(side_effect=[
+            mock_response(201), mock_response(400), mock_response(201),
+        ])
+        result = self.client.save_many("subjectlog", [{"n": i} for i in range(3)], max_workers=1)
+        assert not result.ok
+        assert [o["index"] for o in result.succeeded] == [0, 2]
+        assert [o["status_code"] for o in result.failed] == [400]
+
+    def test_transient_errors_retried(self):
+        import requests
+
+        self.client._session.post = MagicMock(side_effect=[
+            mock_response(503), requests.ConnectTimeout("connect"), mock_response(201),
+        ])
+        result = self.client.save_many("subjectlog", [{"n": 1}])
+        assert result.ok
+        assert result.succeeded[0]["retries"] == 2
+        assert result.retries == 2
+
+    def test_create_retried_when_connection_never_opened(self):
+        import requests
+        from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+        refused = MaxRetryError(None, "/", NewConnectionError(None, "refused"))
+        self.client._session.post = MagicMock(side_effect=[
+            requests.ConnectionError(refused), mock_response(201),
+        ])
+        assert self.client.save_many("subjectlog", [{"n": 1}]).ok
+        assert self.client._session.post.call_count == 2
+
+    @pytest.mark.parametrize("failure", [504, 502, "aborted"])
+    def test_create_not_resent_when_server_may_have_acted(self, failure):
+        import requests
+
+        first = (requests.ConnectionError("Connection aborted.") if failure == "aborted"
+                 else mock_response(failure))
+        self.client._session.post = MagicMock(side_effect=[first, mock_response(201)])
+        result = self.client.save_many("subjectlog", [{"n": 1}])
+        assert not result.ok
+        assert result.failed[0]["retries"] == 0
+        self.client._session.post.assert_called_once()
+
+    def test_update_retried_on_gateway_errors_and_aborted_connections(self):
+        import requests
+
+        self.client._session.patch = MagicMock(side_effect=[
+            mock_response(504), requests.ConnectionError("Connection aborted."), mock_response(200),
+        ])
+        result = self.client.save_many("subjectlog", [{"id": "uuid-1", "n": 1}])
+        assert result.ok
+        assert result.retries == 2
+
+    def test_retries_exhausted_reported_as_failure(self):
+        self.client._session.post = MagicMock(return_value=mock_response(503))
+        result = self.client.save_many("subjectlog", [{"n": 1}], retries=1)
+        assert result.failed[0]["status_code"] == 503
+        assert result.failed[0]["retries"] == 1
+        assert self.client._session.post.call_count == 2
+
+    def test_throttled_record_not_resent_again_by_bulk_retries(self):
+        self.client.MAX_THROTTLE_RETRIES = 1
+        throttled = mock_response(429)
+        throttled.headers = {"Retry-After": "0"}
+        self.client._session.post = MagicMock(return_value=throttled)
+        result = self.client.save_many("subjectlog", [{"n": 1}], retries=2)
+        assert result.failed[0]["status_code"] == 429
+        assert result.failed[0]["retries"] == 0
+        assert self.client._session.post.call_count == 2
+
+
 # ---------------------------------------------------------------------------
 # delete()
 # ---------------------------------------------------------------------------
@@ -237,6 +480,301 @@ class TestDelete:
             self.client.delete("ghost", id="some-uuid")
 
 
+class TestDeleteMany:
+    def setup_method(self):
+        self.client = make_client()
+        self.client.BULK_BACKOFF = 0
+
+    def test_404s_reported_separately_from_failures(self):
+        statuses = {"a": 204, "b": 404, "c": 500}
+        self.client._session.delete = MagicMock(
+            side_effect=lambda url, timeout=None: mock_response(statuses[url.rstrip("/").rsplit("/", 1)[1]])
+        )
+        result = self.client.delete_many("session", ["a", "b", "c"])
+        assert [o["id"] for o in result.succeeded] == ["a"]
+        assert [o["id"] for o in result.not_found] == ["b"]
+        assert [o["id"] for o in result.failed] == ["c"]
+        assert not result.ok
+        assert [o["id"] for o in result.items] == ["a", "b", "c"]
+
+
+# ---------------------------------------------------------------------------
+# Compressed transfer
+# ---------------------------------------------------------------------------
+
+def wire_response(body: bytes, encoding: str = None, status_code: int = 200):
+    """A real Response whose body is read through urllib3, as off the network."""
+    import io
+    import requests
+    from urllib3.response import HTTPResponse
+
+    headers = {"Content-Encoding": encoding} if encoding else {}
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp.raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=status_code,
+                            preload_content=False)
+    resp.headers = headers
+    return resp
+
+
+class TestCompression:
+    PAGE = {"sessions": [{"id": str(i), "description": "theta " * 50} for i in range(20)],
+            "count": 20}
+
+    def setup_method(self):
+        self.client = make_client()
+
+    def test_accept_encoding_advertised(self):
+        from urllib3.util.request import ACCEPT_ENCODING
+        accepted = self.client._session.headers["Accept-Encoding"]
+        assert "gzip" in accepted
+        assert accepted == ACCEPT_ENCODING
+
+    def test_response_reports_compressed_and_uncompressed_bytes(self):
+        import gzip
+        raw = json.dumps(self.PAGE).encode()
+        compressed = gzip.compress(raw)
+        self.client._session.get = MagicMock(return_value=wire_response(compressed, "gzip"))
+        resp = self.client.load("session")
+        assert resp.json() == self.PAGE
+        assert resp.compressed_bytes == len(compressed)
+        assert resp.uncompressed_bytes == len(raw)
+        info = self.client.transfer_info()
+        assert info == (1, len(compressed), len(raw))
+
+    def test_brotli_response_decoded(self):
+        brotli = pytest.importorskip("brotli")
+        raw = json.dumps(self.PAGE).encode()
+        self.client._session.get = MagicMock(
+            return_value=wire_response(brotli.compress(raw), "br"))
+        assert self.client.load("session", load_all=True)["sessions"] == self.PAGE["sessions"]
+
+    def test_small_payload_sent_uncompressed(self):
+        client = BrainstemClient(token=TOKEN, compress_threshold=1024)
+        client._session.post = MagicMock(return_value=mock_response(201))
+        client.save("session", data={"name": "x"})
+        kwargs = client._session.post.call_args[1]
+        assert "Content-Encoding" not in kwargs["headers"]
+
+    def test_large_payload_gzipped(self):
+        import gzip
+        client = BrainstemClient(token=TOKEN, compress_threshold=1024)
+        client._session.post = MagicMock(return_value=mock_response(201))
+        data = {"description": "x" * 5000}
+        client.save("session", data=data)
+        kwargs = client._session.post.call_args[1]
+        assert kwargs["headers"]["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(kwargs["data"])) == data
+
+    def test_415_falls_back_and_disables_compression(self):
+        client = BrainstemClient(token=TOKEN, compress_threshold=10)
+        client._session.post = MagicMock(side_effect=[
+            mock_response(415), mock_response(201), mock_response(201),
+        ])
+        data = {"description": "x" * 100}
+        assert client.save("session", data=data).status_code == 201
+        client.save("session", data=data)
+        encodings = [c[1]["headers"].get("Content-Encoding")
+                     for c in client._session.post.call_args_list]
+        assert encodings == ["gzip", None, None]
+
+    def test_400_on_unconfirmed_compression_falls_back(self):
+        client = BrainstemClient(token=TOKEN, compress_threshold=10)
+        client._session.post = MagicMock(side_effect=[
+            mock_response(400), mock_response(201), mock_response(201),
+        ])
+        data = {"description": "x" * 100}
+        assert client.save("session", data=data).status_code == 201
+        client.save("session", data=data)
+        encodings = [c[1]["headers"].get("Content-Encoding")
+                     for c in client._session.post.call_args_list]
+        assert encodings == ["gzip", None, None]
+
+    def test_400_on_both_attempts_keeps_compression(self):
+        client = BrainstemClient(token=TOKEN, compress_threshold=10)
+        client._session.post = MagicMock(return_value=mock_response(400))
+        assert client.save("session", data={"description": "x" * 100}).status_code == 400
+        assert client._session.post.call_count == 2
+        assert client._compress_threshold == 10
+
+    def test_400_after_compression_succeeded_not_resent(self):
+        client = BrainstemClient(token=TOKEN, compress_threshold=10)
+        client._session.post = MagicMock(side_effect=[mock_response(201), mock_response(400)])
+        data = {"description": "x" * 100}
+        client.save("session", data=data)
+        assert client.save("session", data=data).status_code == 400
+        assert client._session.post.call_count == 2
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting and 429 handling
+# ---------------------------------------------------------------------------
+
+class TestThrottling:
+    def setup_method(self):
+        self.client = make_client()
+
+    def _throttled(self, retry_after="0"):
+        resp = mock_response(429)
+        resp.headers = {"Retry-After": retry_after}
+        return resp
+
+    def test_429_resent_after_retry_after(self):
+        self.client._session.get = MagicMock(side_effect=[
+            self._throttled("0"), mock_response(200, {"x": 1}),
+        ])
+        with patch.object(self.client._rate_limiter, "throttle",
+                          wraps=self.client._rate_limiter.throttle) as throttle:
+            resp = self.client.load("session")
+        assert resp.status_code == 200
+        throttle.assert_called_once_with(0.0)
+        assert self.client._session.get.call_count == 2
+
+    def test_throttled_response_closed_before_resend(self):
+        throttled = self._throttled("0")
+        self.client._session.get = MagicMock(side_effect=[throttled, mock_response(200)])
+        self.client.load("session", stream=True)
+        throttled.close.assert_called_once()
+
+    def test_429_on_save_also_resent(self):
+        self.client._session.post = MagicMock(side_effect=[
+            self._throttled("0"), mock_response(201),
+        ])
+        assert self.client.save("session", data={"name": "x"}).status_code == 201
+
+    def test_parallel_pages_gated_by_adaptive_concurrency(self):
+        self.client._session.get = MagicMock(side_effect=lambda url, params=None, timeout=None:
+                                             mock_response(200, {"sessions": [{"id": "x"}], "count": 3}))
+        with patch("brainstem_api_tools.brainstem_api_client.AdaptiveConcurrency") as gate:
+            self.client.load("session", load_all=True, max_workers=2)
+        gate.assert_called_once_with(2, throttled=0)
+        assert gate.return_value.acquire.call_count == 2
+
+    def test_per_call_workers_capped_at_connection_pool_size(self):
+        self.client._session.get = MagicMock(side_effect=lambda url, params=None, timeout=None:
+                                             mock_response(200, {"sessions": [{"id": "x"}],
+                                                                 "count": 30}))
+        with patch("brainstem_api_tools.brainstem_api_client.AdaptiveConcurrency") as gate:
+            self.client.load("session", load_all=True, max_workers=64)
+        gate.assert_called_once_with(10, throttled=0)
+        big = BrainstemClient(token=TOKEN, max_workers=64)
+        assert big._worker_limit(64) == 64
+        assert big._session.get_adapter("https://").poolmanager.connection_pool_kw["maxsize"] == 64
+
+    def test_adaptive_pages_bounded_by_max_workers_not_page_size(self):
+        self.client.MAX_PAGE_SIZE = 2
+
+        def get(url, params=None, timeout=None):
+            ids = range(params["offset"], min(params["offset"] + params["limit"], 20))
+            return mock_response(200, {"sessions": [{"id": str(i)} for i in ids], "count": 20})
+
+        self.client._session.get = MagicMock(side_effect=get)
+        with patch("brainstem_api_tools.brainstem_api_client.AdaptiveConcurrency") as gate:
+            result = self.client.load("session", load_all=True, adaptive=True, max_workers=4)
+        gate.assert_called_once_with(4, throttled=0)
+        assert [r["id"] for r in result["sessions"]] == [str(i) for i in range(20)]
+
+    def test_gives_up_after_max_throttle_retries(self):
+        self.client.MAX_THROTTLE_RETRIES = 2
+        self.client._session.get = MagicMock(return_value=self._throttled("0"))
+        assert self.client.load("session").status_code == 429
+        assert self.client._session.get.call_count == 3
+
+    def test_rate_limit_acquired_for_every_request(self):
+        client = BrainstemClient(token=TOKEN, rate_limit=1000)
+        client._session.get = MagicMock(return_value=mock_response(200))
+        with patch.object(client._rate_limiter, "acquire") as acquire:
+            client.load("session")
+            client.load("subject")
+        assert acquire.call_count == 2
+
+
+class TestThrottleModule:
+    def test_retry_after_parsing(self):
+        from brainstem_api_tools.throttle import retry_after_seconds
+        assert retry_after_seconds("3") == 3.0
+        assert retry_after_seconds(None) is None
+        assert retry_after_seconds("soon") is None
+        assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+    def test_token_bucket_spaces_requests(self):
+        import time
+        from brainstem_api_tools.throttle import RateLimiter
+
+        limiter = RateLimiter(rate=50, burst=1)
+        start = time.monotonic()
+        for _ in range(4):
+            limiter.acquire()
+        assert time.monotonic() - start >= 3 / 50 * 0.9
+
+    def test_throttle_pauses_all_callers(self):
+        import time
+        from brainstem_api_tools.throttle import RateLimiter
+
+        limiter = RateLimiter()
+        limiter.throttle(0.05)
+        start = time.monotonic()
+        limiter.acquire()
+        assert time.monotonic() - start >= 0.04
+        assert limiter.throttled == 1
+
+    def test_adaptive_concurrency_aimd(self):
+        from brainstem_api_tools.throttle import AdaptiveConcurrency
+
+        gate = AdaptiveConcurrency(8)
+        gate.acquire()
+        gate.release(throttled=1)
+        assert gate.limit == 4
+        gate.acquire()
+        gate.release(throttled=1)  # same signal is not counted twice
+        assert 4 < gate.limit < 5
+        for _ in range(100):
+            gate.acquire()
+            gate.release(throttled=1)
+        assert gate.limit == 8
+
+    def test_adaptive_page_size_shrinks_to_target(self):
+        from brainstem_api_tools.throttle import AdaptivePageSize
+
+        sizer = AdaptivePageSize(target=1.0, min_size=5)
+        sizer.start(max_size=100)
+        assert sizer.size == 100
+        sizer.observe(0, 100, 100, seconds=4.0, nbytes=1000)  # 0.04 s per record
+        assert sizer.size == 25
+        sizer.observe(100, 25, 25, seconds=25.0, nbytes=100)  # very slow page
+        assert sizer.size == 5  # never below min_size
+
+    def test_adaptive_page_size_grows_at_most_double(self):
+        from brainstem_api_tools.throttle import AdaptivePageSize
+
+        sizer = AdaptivePageSize(target=1.0, initial=10)
+        sizer.start(max_size=100)
+        sizer.observe(0, 10, 10, seconds=0.01, nbytes=100)
+        assert sizer.size == 20
+        for _ in range(5):
+            sizer.observe(None, sizer.size, sizer.size, seconds=0.01, nbytes=100)
+        assert sizer.size == 100
+        assert sizer.sizes == [10, 20, 40, 80, 100, 100]
+
+    def test_adaptive_page_size_bounded_by_bytes_and_cap(self):
+        from brainstem_api_tools.throttle import AdaptivePageSize
+
+        sizer = AdaptivePageSize(target=10.0, max_bytes=50_000, min_size=1)
+        sizer.start(max_size=100)
+        sizer.observe(0, 100, 100, seconds=0.1, nbytes=1_000_000)  # 10 kB per record
+        assert sizer.size == 5
+        sizer.cap(3)
+        assert (sizer.max_size, sizer.size) == (3, 3)
+
+    def test_adaptive_page_size_empty_page_keeps_size(self):
+        from brainstem_api_tools.throttle import AdaptivePageSize
+
+        sizer = AdaptivePageSize()
+        sizer.start(max_size=100, initial=40)
+        sizer.observe(0, 40, 0, seconds=1.0, nbytes=10)
+        assert sizer.size == 40 and len(sizer.history) == 1
+
+
 # ---------------------------------------------------------------------------
 # Device auth flow
 # ---------------------------------------------------------------------------
@@ -302,11 +840,7 @@ class TestLoadAll:
     def _mock_pages(self, pages):
         responses = []
         for page in pages:
-            r = MagicMock()
-            r.status_code = 200
-            r.raise_for_status = MagicMock()
-            r.json.return_value = page
-            responses.append(r)
+            responses.append(mock_response(200, page))
         self.client._session.get = MagicMock(side_effect=responses)
 
     def test_single_page(self):
@@ -326,6 +860,71 @@ class TestLoadAll:
         assert len(result["sessions"]) == 3
         assert [r["id"] for r in result["sessions"]] == ["1", "2", "3"]
 
+    def test_remaining_pages_fetched_concurrently_in_offset_order(self):
+        import threading
+        import time
+
+        total, page_size = 10, 2
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fake_get(url, params=None, timeout=None):
+            off = params["offset"]
+            if off in (2, 4):
+                # Both requests must be in flight at the same time.
+                barrier.wait()
+                time.sleep(0.01 if off == 2 else 0)
+            return mock_response(200, {
+                "sessions": [{"id": str(i)} for i in range(off, min(off + page_size, total))],
+                "count": total,
+            })
+
+        self.client._session.get = MagicMock(side_effect=fake_get)
+        result = self.client.load("session", limit=page_size, load_all=True, max_workers=2)
+        assert [r["id"] for r in result["sessions"]] == [str(i) for i in range(total)]
+        offsets = sorted(c[1]["params"]["offset"] for c in self.client._session.get.call_args_list)
+        assert offsets == [0, 2, 4, 6, 8]
+
+    def test_max_workers_one_fetches_serially(self):
+        self._mock_pages([
+            {"sessions": [{"id": "1"}], "count": 3},
+            {"sessions": [{"id": "2"}], "count": 3},
+            {"sessions": [{"id": "3"}], "count": 3},
+        ])
+        with patch("brainstem_api_tools.brainstem_api_client.ThreadPoolExecutor") as pool:
+            result = self.client.load("session", load_all=True, max_workers=1)
+        pool.assert_not_called()
+        assert [r["id"] for r in result["sessions"]] == ["1", "2", "3"]
+
+    def test_keyset_pagination_uses_gt_cursor(self):
+        data = [{"id": f"{i:02d}"} for i in range(5)]
+
+        def fake_get(url, params=None, timeout=None):
+            after = params.get("filter{id.gt}", "")
+            rows = [r for r in data if r["id"] > after]
+            return mock_response(200, {"sessions": rows[:params["limit"]], "count": len(rows)})
+
+        self.client._session.get = MagicMock(side_effect=fake_get)
+        result = self.client.load("session", load_all=True, limit=2, keyset="id")
+        assert [r["id"] for r in result["sessions"]] == [r["id"] for r in data]
+        calls = [c[1]["params"] for c in self.client._session.get.call_args_list]
+        assert [c.get("filter{id.gt}") for c in calls] == [None, "01", "03"]
+        assert all("offset" not in c and c["sort[]"] == ["id"] for c in calls)
+
+    def test_keyset_descending_uses_lt(self):
+        self._mock_pages([
+            {"sessions": [{"id": "9"}, {"id": "8"}], "count": 3},
+            {"sessions": [{"id": "7"}], "count": 1},
+        ])
+        pages = list(self.client.iter_pages("session", limit=2, keyset="-id"))
+        assert len(pages) == 2
+        params = self.client._session.get.call_args[1]["params"]
+        assert params["filter{id.lt}"] == "8"
+        assert params["sort[]"] == ["-id"]
+
+    def test_keyset_rejects_conflicting_sort(self):
+        with pytest.raises(ValueError, match="keyset"):
+            self.client.load("session", load_all=True, keyset="id", sort=["name"])
+
     def test_load_all_false_returns_response(self):
         r = MagicMock()
         self.client._session.get = MagicMock(return_value=r)
@@ -333,6 +932,65 @@ class TestLoadAll:
         assert result is r
 
 
+# ---------------------------------------------------------------------------
+# iter_pages / iter_load streaming
+# ---------------------------------------------------------------------------
+
+class TestIterPages:
+    def setup_method(self):
+        self.client = make_client()
+
+    def _mock_pages(self, pages):
+        responses = []
+        for page in pages:
+            responses.append(mock_response(200, page))
+        self.client._session.get = MagicMock(side_effect=responses)
+
+    def test_yields_each_page_until_count(self):
+        self._mock_pages([
+            {"sessions": [{"id": "1"}, {"id": "2"}], "count": 3},
+            {"sessions": [{"id": "3"}], "count": 3},
+        ])
+        pages = list(self.client.iter_pages("session", limit=2))
+        assert [len(p["sessions"]) for p in pages] == [2, 1]
+        offsets = [c[1]["params"]["offset"] for c in self.client._session.get.call_args_list]
+        assert offsets == [0, 2]
+
+    def test_next_page_prefetched_before_current_is_consumed(self):
+        import time
+
+        self._mock_pages([
+            {"sessions": [{"id": "1"}], "count": 2},
+            {"sessions": [{"id": "2"}], "count": 2},
+        ])
+        pages = self.client.iter_pages("session", limit=1)
+        next(pages)
+        # Wait for the background fetch to complete without advancing.
+        for _ in range(100):
+            if self.client._session.get.call_count == 2:
+                break
+            time.sleep(0.01)
+        assert self.client._session.get.call_count == 2
+        pages.close()
+
+    def test_without_prefetch_fetches_lazily(self):
+        self._mock_pages([
+            {"sessions": [{"id": "1"}], "count": 2},
+            {"sessions": [{"id": "2"}], "count": 2},
+        ])
+        pages = self.client.iter_pages("session", limit=1, prefetch=False)
+        next(pages)
+        assert self.client._session.get.call_count == 1
+
+    def test_iter_load_yields_records(self):
+        self._mock_pages([
+            {"sessions": [{"id": "1"}, {"id": "2"}], "count": 3},
+            {"sessions": [{"id": "3"}], "count": 3},
+        ])
+        ids = [r["id"] for r in self.client.iter_load("session", limit=2)]
+        assert ids == ["1", "2", "3"]
+
+
 # ---------------------------------------------------------------------------
 # Convenience loaders
 # ---------------------------------------------------------------------------
@@ -453,6 +1111,43 @@ class TestCLILogout:
         assert "No cached token found" in capsys.readouterr().out
 
 
+class TestCLIIterRecords:
+    def _args(self, limit):
+        import argparse
+        return argparse.Namespace(id=None, model="session", portal="private", sort=None,
+                                  include=None, limit=limit, offset=None)
+
+    def _client(self, total):
+        client = make_client()
+
+        def get(url, params=None, timeout=None):
+            ids = range(params["offset"], min(params["offset"] + params["limit"], total))
+            return mock_response(200, {"sessions": [{"id": str(i)} for i in ids], "count": total})
+
+        client._session.get = MagicMock(side_effect=get)
+        return client
+
+    def test_limit_caps_records_not_page_size(self):
+        from brainstem_api_tools.cli import _iter_records
+        client = self._client(500)
+        records = list(_iter_records(client, self._args(250), {}))
+        assert [r["id"] for r in records] == [str(i) for i in range(250)]
+        sizes = [c[1]["params"]["limit"] for c in client._session.get.call_args_list]
+        assert set(sizes) == {100}
+        assert len(sizes) <= 4  # the page after the cap may have been prefetched
+
+    def test_small_limit_fetches_one_page(self):
+        from brainstem_api_tools.cli import _iter_records
+        client = self._client(500)
+        assert len(list(_iter_records(client, self._args(20), {}))) == 20
+        client._session.get.assert_called_once()
+        assert client._session.get.call_args[1]["params"]["limit"] == 20
+
+    def test_no_limit_follows_every_page(self):
+        from brainstem_api_tools.cli import _iter_records
+        assert len(list(_iter_records(self._client(250), self._args(None), {}))) == 250
+
+
 # ---------------------------------------------------------------------------
 # Timeouts
 # ---------------------------------------------------------------------------
@@ -488,10 +1183,7 @@ class TestTimeouts:
         assert kwargs.get("timeout") == BrainstemClient.DEFAULT_TIMEOUT
 
     def test_load_all_passes_timeout(self):
-        r = MagicMock()
-        r.raise_for_status = MagicMock()
-        r.status_code = 200
-        r.json.return_value = {"sessions": [{"id": "1"}], "count": 1}
+        r = mock_response(200, {"sessions": [{"id": "1"}], "count": 1})
         self.client._session.get = MagicMock(return_value=r)
         self.client.load("session", load_all=True)
         _, kwargs = self.client._session.get.call_args
@@ -719,6 +1411,166 @@ class TestCLICommands:
         _, kwargs = client.delete.call_args
         assert kwargs["id"] == "00000000-0000-0000-0000-000000000099"
 
+    def test_cli_load_stream_prints_ndjson(self, capsys):
+        client = MagicMock()
+        client.iter_load.return_value = iter([{"id": "1"}, {"id": "2"}])
+        self._run_cli(["brainstem", "--token", TOKEN, "load", "session", "--stream"], client)
+        client.load.assert_not_called()
+        lines = capsys.readouterr().out.splitlines()
+        assert [json.loads(line) for line in lines] == [{"id": "1"}, {"id": "2"}]
+
+    def test_cli_load_format_ndjson_with_id(self, capsys):
+        client = MagicMock()
+        client.load.return_value = mock_response(200, {"session": {"id": "1"}})
+        self._run_cli(["brainstem", "--token", TOKEN, "load", "session", "--id", "1",
+                       "--format", "ndjson"], client)
+        client.iter_load.assert_not_called()
+        lines = capsys.readouterr().out.splitlines()
+        assert [json.loads(line) for line in lines] == [{"id": "1"}]
+
+    def test_cli_load_format_csv_with_fields(self, capsys):
+        client = MagicMock()
+        client.iter_load.return_value = iter([
+            {"id": "1", "name": "a", "strain": {"name": "C57"}, "tags": ["x"]},
+            {"id": "2", "name": "b,c", "strain": None},
+        ])
+        self._run_cli(["brainstem", "--token", TOKEN, "load", "session", "--format", "csv",
+                       "--fields", "id", "name", "strain.name", "tags"], client)
+        lines = capsys.readouterr().out.splitlines()
+        assert lines == ["id,name,strain.name,tags", '1,a,C57,"[""x""]"', '2,"b,c",,']
+
+    def test_cli_load_format_csv_defaults_to_first_record_fields(self, capsys):
+        client = MagicMock()
+        client.iter_load.return_value = iter([{"id": "1", "name": "a"}])
+        self._run_cli(["brainstem", "--token", TOKEN, "load", "session", "--format", "csv"],
+                      client)
+        assert capsys.readouterr().out.splitlines() == ["id,name", "1,a"]
+
+    def test_cli_fields_requires_csv(self):
+        with pytest.raises(SystemExit):
+            self._run_cli(["brainstem", "--token", TOKEN, "load", "session",
+                           "--fields", "id"], MagicMock())
+
+    def test_cli_load_format_raw_copies_bytes(self, capsys):
+        resp = mock_response(200)
+        resp.iter_content.return_value = iter([b'{"sessions": ', b"[]}"])
+        client = MagicMock()
+        client.load.return_value = resp
+        self._run_cli(["brainstem", "--token", TOKEN, "load", "session", "--format", "raw"],
+                      client)
+        _, kwargs = client.load.call_args
+        assert kwargs["stream"] is True
+        resp.json.assert_not_called()
+        assert capsys.readouterr().out == '{"sessions": []}'
+
+    def test_cli_delete_ids_from_file(self, tmp_path, capsys):
+        from brainstem_api_tools.brainstem_api_client import BulkResult
+
+        ids_file = tmp_path / "ids.txt"
+        ids_file.write_text("a\n\n# comment\nb\n")
+        client = MagicMock()
+        client.delete_many.return_value = BulkResult(
+            succeeded=[{"index": 0, "id": "a", "retries": 0}],
+            not_found=[{"index": 1, "id": "b", "retries": 0}],
+            failed=[],
+            elapsed=0.5,
+        )
+        self._run_cli(
+            ["brainstem", "--token", TOKEN, "delete", "session", "--ids-from", str(ids_file)],
+            client,
+        )
+        args, _ = client.delete_many.call_args
+        assert args == ("session", ["a", "b"])
+        out = capsys.readouterr().out
+        assert "Deleted 1 of 2 records" in out
+        assert "Not found (1)" in out
+
+    def test_cli_delete_ids_from_stdin_failure_exits(self, capsys):
+        import io
+        from brainstem_api_tools.brainstem_api_client import BulkResult
+
+        client = MagicMock()
+        client.delete_many.return_value = BulkResult(
+            succeeded=[],
+            failed=[{"index": 0, "id": "a", "status_code": 500, "error": "boom", "retries": 2}],
+            elapsed=0.1,
+        )
+        with patch("sys.stdin", io.StringIO("a\n")), pytest.raises(SystemExit):
+            self._run_cli(
+                ["brainstem", "--token", TOKEN, "delete", "session", "--ids-from", "-"],
+                client,
+            )
+        assert "a: HTTP 500" in capsys.readouterr().err
+
+    def test_cli_delete_requires_id_or_ids_from(self):
+        with pytest.raises(SystemExit):
+            self._run_cli(["brainstem", "--token", TOKEN, "delete", "session"], MagicMock())
+
+    def test_cli_export_calls_exporter(self, capsys):
+        client = MagicMock()
+        with patch("brainstem_api_tools.export.export_parquet",
+                   return_value={"path": "s.parquet", "rows": 5, "row_groups": 1}) as export:
+            self._run_cli(
+                ["brainstem", "--token", TOKEN, "export", "session", "s.parquet",
+                 "--filters", "name.icontains=rat", "--flatten"],
+                client,
+            )
+        args, kwargs = export.call_args
+        assert args == (client, "session", "s.parquet")
+        assert kwargs["filters"] == {"name.icontains": "rat"}
+        assert kwargs["flatten"] is True
+        assert "Wrote 5 records in 1 row groups to s.parquet" in capsys.readouterr().out
+
+    def test_cli_options_before_subcommand_are_kept(self):
+        import brainstem_api_tools.cli as cli_module
+        client = MagicMock()
+        client.load.return_value = mock_response(200, {"sessions": []})
+        with patch("brainstem_api_tools.cli.BrainstemClient", return_value=client) as cls, \
+             patch("sys.argv", ["brainstem", "--token", TOKEN, "--url", "http://x/",
+                                "load", "session"]):
+            cli_module.main()
+        _, kwargs = cls.call_args
+        assert (kwargs["token"], kwargs["url"]) == (TOKEN, "http://x/")
+
+    def test_cli_profile_prints_phases_to_stderr(self, capsys):
+        from brainstem_api_tools.metrics import PHASES, RequestEvent
+
+        client = MagicMock()
+
+        def load(*args, **kwargs):
+            hook = client.add_hook.call_args[0][0]
+            hook(RequestEvent("session", "private", "list", "GET", "http://x/", 200,
+                              dict.fromkeys(PHASES, 0.01), 0, 2048, 0, False))
+            return mock_response(200, {"sessions": []})
+
+        client.load.side_effect = load
+        self._run_cli(["brainstem", "--profile", "load", "session", "--token", TOKEN], client)
+        captured = capsys.readouterr()
+        assert json.loads(captured.out) == {"sessions": []}
+        for phase in ("startup", "imports", "client and token", "load", "decode", "format",
+                      "write", "requests (1):", "total"):
+            assert phase in captured.err
+        assert "ttfb    40.0 ms  transfer    10.0 ms" in captured.err
+
+    def test_cli_profile_out_writes_pstats(self, tmp_path, capsys):
+        import pstats
+
+        client = MagicMock()
+        client.delete.return_value = mock_response(204)
+        path = tmp_path / "run.pstats"
+        self._run_cli(["brainstem", "--token", TOKEN, "delete", "session", "--id", "1",
+                       "--profile-out", str(path)], client)
+        assert "cProfile stats written to" in capsys.readouterr().err
+        assert pstats.Stats(str(path)).total_calls > 0
+
+    def test_cli_profile_reports_on_failure_exit(self, capsys):
+        client = MagicMock()
+        client.load.return_value = mock_response(404, {"detail": "Not found."})
+        with pytest.raises(SystemExit):
+            self._run_cli(["brainstem", "--profile", "--token", TOKEN, "load", "session",
+                           "--id", "1"], client)
+        assert "total" in capsys.readouterr().err
+
     def test_cli_invalid_filter_exits(self):
         import brainstem_api_tools.cli as cli_module
         with patch("brainstem_api_tools.cli.BrainstemClient", return_value=MagicMock()), \
@@ -0,0 +1,58 @@
+"""Unit tests for the pluggable JSON codecs."""
+
+import json
+
+import pytest
+
+from brainstem_api_tools.codec import OrjsonCodec, StdlibCodec, get_codec
+
+
+DOC = {"sessions": [{"id": "1", "name": "rät", "tags": [1, 2.5, None, True]}], "count": 1}
+
+
+class TestStdlibCodec:
+    def test_round_trip(self):
+        codec = StdlibCodec()
+        assert codec.loads(codec.dumps(DOC)) == DOC
+
+    def test_indent(self):
+        assert StdlibCodec().dumps({"a": 1}, indent=True) == b'{\n  "a": 1\n}'
+
+
+class TestOrjsonCodec:
+    def setup_method(self):
+        pytest.importorskip("orjson")
+        self.codec = OrjsonCodec()
+
+    def test_round_trip_matches_stdlib(self):
+        encoded = self.codec.dumps(DOC)
+        assert isinstance(encoded, bytes)
+        assert json.loads(encoded) == DOC
+        assert self.codec.loads(json.dumps(DOC).encode()) == DOC
+
+    def test_indent(self):
+        assert self.codec.dumps({"a": 1}, indent=True) == b'{\n  "a": 1\n}'
+
+    def test_falls_back_for_values_orjson_rejects(self):
+        assert json.loads(self.codec.dumps({1: 2 ** 70})) == {"1": 2 ** 70}
+
+
+class TestGetCodec:
+    def test_default_prefers_orjson(self):
+        try:
+            import orjson  # noqa: F401
+        except ImportError:
+            assert get_codec().name == "json"
+        else:
+            assert get_codec().name == "orjson"
+
+    def test_by_name(self):
+        assert isinstance(get_codec("json"), StdlibCodec)
+
+    def test_unknown_name_raises(self):
+        with pytest.raises(ValueError, match="Unknown JSON codec"):
+            get_codec("yaml")
+
+    def test_custom_object_passed_through(self):
+        custom = object()
+        assert get_codec(custom) is custom
@@ -0,0 +1,117 @@
+"""Unit tests for the breadth-first graph crawler."""
+
+import json
+import threading
+import time
+import uuid
+from unittest.mock import MagicMock
+
+from brainstem_api_tools.brainstem_api_client import BrainstemClient, LoadManyResult
+from brainstem_api_tools.crawler import crawl
+from brainstem_api_tools.throttle import RateLimiter
+
+
+def uid(name):
+    """A stable UUID per readable name; relations are recognised by UUID."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, name))
+
+
+DB = {
+    "project": {"p1": {"sessions": ["s1", "s2"], "subjects": ["sub1"]}},
+    "session": {
+        "s1": {"behaviors": ["b1"], "dataacquisition": ["d1", "gone"]},
+        "s2": {"behaviors": [{"id": "b1"}], "dataacquisition": []},
+    },
+    "subject": {"sub1": {"procedures": ["pr1"], "subjectlogs": []}},
+    "behavior": {"b1": {}},
+    "dataacquisition": {"d1": {}},
+    "procedure": {"pr1": {}},
+}
+
+
+def _with_uuids(value):
+    if isinstance(value, list):
+        return [_with_uuids(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _with_uuids(v) for k, v in value.items()}
+    return uid(value)
+
+
+DB = {model: {uid(name): {"id": uid(name), **_with_uuids(fields)}
+              for name, fields in table.items()}
+      for model, table in DB.items()}
+
+
+class FakeClient:
+    _max_workers = 4
+    _rate_limiter = RateLimiter()
+
+    def _worker_limit(self, max_workers=None):
+        return max_workers or self._max_workers
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def load_many(self, model, ids, portal="private", max_workers=None, gate=None):
+        with self._lock:
+            self.calls.append((model, sorted(ids)))
+        table = DB.get(model, {})
+        return LoadManyResult({i: table[i] for i in ids if i in table},
+                              missing=[i for i in ids if i not in table])
+
+
+class TestCrawl:
+    def test_expands_levels_with_one_batched_lookup_per_model(self):
+        client = FakeClient()
+        result = crawl(client, "project", [uid("p1")])
+        assert len(result) == 7
+        assert result.get("procedure", uid("pr1")) == {"id": uid("pr1")}
+        assert [level["fetched"] for level in result.levels] == [
+            {"project": 1},
+            {"session": 2, "subject": 1},
+            {"behavior": 1, "dataacquisition": 1, "procedure": 1},
+        ]
+        # b1 is referenced by both sessions (as id and as object) but fetched once.
+        assert ("behavior", [uid("b1")]) in client.calls
+        assert len(client.calls) == 6
+
+    def test_missing_ids_reported_not_refetched(self):
+        result = crawl(FakeClient(), "project", [uid("p1")])
+        assert result.missing == {"dataacquisition": [uid("gone")]}
+
+    def test_max_depth_limits_levels(self):
+        result = crawl(FakeClient(), "project", [uid("p1")], max_depth=1)
+        assert len(result.levels) == 2
+        assert "behavior" not in result.records
+
+    def test_custom_spec_with_field_list(self):
+        client = FakeClient()
+        result = crawl(client, "project", [uid("p1")], spec={"project": ["subjects"]})
+        assert set(result.records) == {"project", "subject"}
+        assert result.elapsed >= 0
+
+    def test_requests_of_a_level_share_the_worker_bound(self):
+        relations = ["sessions", "subjects", "collections", "cohorts"]
+        root = {"id": uid("p1"), **{field: [uid(field)] for field in relations}}
+        in_flight, peak = [0], [0]
+        lock = threading.Lock()
+
+        def get(url, params=None, **kwargs):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+            model = url.rstrip("/").rsplit("/", 1)[1]
+            records = [root] if model == "project" else [{"id": i} for i in params["filter{id.in}"]]
+            return MagicMock(status_code=200, headers={},
+                             content=json.dumps({model + "s": records}).encode())
+
+        client = BrainstemClient(token="t")
+        client._session.get = get
+        result = crawl(client, "project", [root["id"]], max_depth=1, max_workers=2)
+        assert result.levels[1]["fetched"] == {"session": 1, "subject": 1,
+                                               "collection": 1, "cohort": 1}
+        assert peak[0] <= 2
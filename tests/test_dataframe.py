@@ -0,0 +1,74 @@
+"""Unit tests for the pandas conversion helpers."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from brainstem_api_tools.dataframe import load_dataframe, to_dataframe  # noqa: E402
+
+
+S1 = "11111111-1111-1111-1111-111111111111"
+S2 = "22222222-2222-2222-2222-222222222222"
+
+PAGES = [
+    {"sessions": [
+        {"id": "a", "name": "one", "strain": {"id": S1, "name": "C57"},
+         "behaviors": [{"id": "b1", "type": "run"}, {"id": "b2", "type": "sleep"}]},
+        {"id": "b", "name": "two", "strain": {"id": S1, "name": "C57"}, "behaviors": []},
+    ], "count": 3},
+    {"sessions": [
+        {"id": "c", "name": "three", "strain": {"id": S2, "name": "WT"},
+         "behaviors": [{"id": "b3", "type": "run"}], "notes": "late"},
+    ], "count": 3},
+]
+
+
+class TestToDataFrame:
+    def test_nested_objects_flattened(self):
+        df = to_dataframe(PAGES)
+        assert list(df["id"]) == ["a", "b", "c"]
+        assert list(df["strain.name"]) == ["C57", "C57", "WT"]
+        assert df["behaviors"][0] == [{"id": "b1", "type": "run"},
+                                      {"id": "b2", "type": "sleep"}]
+
+    def test_fields_missing_on_some_rows_are_null(self):
+        df = to_dataframe(PAGES)
+        assert df["notes"].isna().tolist() == [True, True, False]
+
+    def test_repeated_uuids_become_categorical(self):
+        df = to_dataframe(PAGES)
+        assert isinstance(df["strain.id"].dtype, pd.CategoricalDtype)
+        # Unique non-UUID strings are left alone.
+        assert not isinstance(df["name"].dtype, pd.CategoricalDtype)
+
+    def test_categorical_can_be_disabled(self):
+        df = to_dataframe(PAGES, categorical=False)
+        assert not isinstance(df["strain.id"].dtype, pd.CategoricalDtype)
+
+    def test_split_embedded_lists_into_linked_frames(self):
+        frames = to_dataframe(PAGES, split=True)
+        assert set(frames) == {"sessions", "behaviors"}
+        assert "behaviors" not in frames["sessions"].columns
+        behaviors = frames["behaviors"]
+        assert list(behaviors["id"]) == ["b1", "b2", "b3"]
+        assert list(behaviors["session_id"]) == ["a", "a", "c"]
+
+    def test_accepts_single_page_and_response(self):
+        assert len(to_dataframe(PAGES[0])) == 2
+        resp = MagicMock()
+        resp.json.return_value = PAGES[1]
+        assert list(to_dataframe(resp)["id"]) == ["c"]
+
+
+class TestLoadDataFrame:
+    def test_streams_pages_from_client(self):
+        client = MagicMock()
+        client.iter_pages.return_value = iter(PAGES)
+        df = load_dataframe(client, "session", filters={"name.icontains": "o"}, limit=2)
+        assert len(df) == 3
+        client.iter_pages.assert_called_once_with(
+            "session", portal="private", filters={"name.icontains": "o"}, sort=None,
+            include=None, limit=2,
+        )
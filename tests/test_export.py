@@ -0,0 +1,156 @@
+"""Unit tests for the streaming Parquet exporter."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from brainstem_api_tools import export as export_module  # noqa: E402
+from brainstem_api_tools.export import export_parquet, flatten_record  # noqa: E402
+
+
+PAGES = [
+    {"sessions": [
+        {"id": "1", "name": "a", "notes": None, "strain": {"id": "s1", "name": "C57"},
+         "behaviors": [{"id": "b1"}]},
+        {"id": "2", "name": "b", "notes": None, "strain": {"id": "s2", "name": "WT"},
+         "behaviors": []},
+    ], "count": 3},
+    {"sessions": [
+        {"id": "3", "name": "c", "notes": {"free": "text"}, "strain": {"id": "s1", "name": "C57"},
+         "behaviors": [{"id": "b2"}, {"id": "b3"}], "late_field": 1},
+    ], "count": 3},
+]
+
+
+def make_client(pages=PAGES):
+    client = MagicMock()
+    client.iter_pages.return_value = iter(pages)
+    return client
+
+
+class TestFlatten:
+    def test_nested_objects_flattened_lists_kept(self):
+        flat = flatten_record({"id": "1", "strain": {"id": "s", "species": {"name": "rat"}},
+                               "tags": ["x"]})
+        assert flat == {"id": "1", "strain.id": "s", "strain.species.name": "rat", "tags": ["x"]}
+
+
+class TestExportParquet:
+    def test_one_row_group_per_page_with_struct_columns(self, tmp_path):
+        path = tmp_path / "sessions.parquet"
+        result = export_parquet(make_client(), "session", path)
+        assert result == {"path": str(path), "rows": 3, "row_groups": 2}
+        assert pq.ParquetFile(path).num_row_groups == 2
+
+        table = pq.read_table(path)
+        assert pa.types.is_struct(table.schema.field("strain").type)
+        assert pa.types.is_list(table.schema.field("behaviors").type)
+        assert table.column("strain").to_pylist()[0] == {"id": "s1", "name": "C57"}
+        assert table.column("late_field").to_pylist() == [None, None, 1]
+
+    def test_columns_null_on_first_page_written_as_json(self, tmp_path):
+        path = tmp_path / "sessions.parquet"
+        export_parquet(make_client(), "session", path)
+        table = pq.read_table(path)
+        assert table.schema.field("notes").type == pa.string()
+        assert table.column("notes").to_pylist() == [None, None, '{"free": "text"}']
+
+    def test_flatten_produces_dotted_columns(self, tmp_path):
+        path = tmp_path / "sessions.parquet"
+        export_parquet(make_client(), "session", path, flatten=True)
+        table = pq.read_table(path)
+        assert table.column("strain.name").to_pylist() == ["C57", "WT", "C57"]
+
+    def test_empty_result_writes_valid_file(self, tmp_path):
+        path = tmp_path / "empty.parquet"
+        result = export_parquet(make_client([{"sessions": [], "count": 0}]), "session", path)
+        assert result["rows"] == 0
+        assert pq.read_table(path).num_rows == 0
+
+    def test_query_arguments_forwarded(self, tmp_path):
+        client = make_client()
+        export_parquet(client, "session", tmp_path / "s.parquet", portal="public",
+                       filters={"name.icontains": "rat"}, include=["behaviors"], limit=50)
+        _, kwargs = client.iter_pages.call_args
+        assert kwargs == {"portal": "public", "filters": {"name.icontains": "rat"},
+                          "sort": None, "include": ["behaviors"], "limit": 50}
+
+    def test_missing_pyarrow_raises_helpful_error(self, tmp_path):
+        with patch("brainstem_api_tools.export.pa", None):
+            with pytest.raises(ImportError, match=r"\[parquet\]"):
+                export_parquet(make_client(), "session", tmp_path / "s.parquet")
+
+    def test_empty_lists_on_first_page_then_objects(self, tmp_path):
+        path = tmp_path / "s.parquet"
+        pages = [{"sessions": [{"id": "1", "behaviors": []}, {"id": "2", "behaviors": []}]},
+                 {"sessions": [{"id": "3", "behaviors": [{"id": "b1", "type": "run"}]}]}]
+        export_parquet(make_client(pages), "session", path)
+        assert pq.read_table(path).column("behaviors").to_pylist() == \
+            ["[]", "[]", '[{"id": "b1", "type": "run"}]']
+
+    def test_int_column_promoted_to_float_without_truncation(self, tmp_path):
+        path = tmp_path / "s.parquet"
+        pages = [{"sessions": [{"id": "1", "n": 1}, {"id": "2", "n": 2}]},
+                 {"sessions": [{"id": "3", "n": 2.5}]},
+                 {"sessions": [{"id": "4", "n": 7}]}]
+        result = export_parquet(make_client(pages), "session", path)
+        table = pq.read_table(path)
+        assert table.schema.field("n").type == pa.float64()
+        assert table.column("n").to_pylist() == [1.0, 2.0, 2.5, 7.0]
+        assert result["row_groups"] == pq.ParquetFile(path).num_row_groups == 3
+
+    def test_nested_fields_added_later_are_kept(self, tmp_path):
+        path = tmp_path / "s.parquet"
+        pages = [{"sessions": [{"id": "1", "strain": {"name": "C57"}}]},
+                 {"sessions": [{"id": "2", "strain": {"name": "WT", "species": "rat"}}]}]
+        export_parquet(make_client(pages), "session", path)
+        assert pq.read_table(path).column("strain").to_pylist() == [
+            {"name": "C57", "species": None}, {"name": "WT", "species": "rat"}]
+
+    def test_flattened_fields_first_seen_later_are_kept(self, tmp_path):
+        path = tmp_path / "s.parquet"
+        pages = [{"sessions": [{"id": "a", "strain": None}]},
+                 {"sessions": [{"id": "b", "strain": {"id": "s", "name": "x"}}]}]
+        export_parquet(make_client(pages), "session", path, flatten=True)
+        table = pq.read_table(path)
+        assert table.column_names == ["id", "strain", "strain.id", "strain.name"]
+        assert table.column("strain").to_pylist() == [None, None]
+        assert table.column("strain.id").to_pylist() == [None, "s"]
+        assert table.column("strain.name").to_pylist() == [None, "x"]
+
+    def test_row_groups_rewritten_once_however_often_the_schema_changes(self, tmp_path):
+        path = tmp_path / "s.parquet"
+        pages = [{"sessions": [{"id": str(page), "details": {f"k{page}": page}}]}
+                 for page in range(30)]
+        with patch("brainstem_api_tools.export._rewrite",
+                   wraps=export_module._rewrite) as rewrite:
+            result = export_parquet(make_client(pages), "session", path)
+        rewrite.assert_called_once()
+        assert result["row_groups"] == pq.ParquetFile(path).num_row_groups == 30
+        details = pq.read_table(path).column("details").to_pylist()
+        assert [d[f"k{i}"] for i, d in enumerate(details)] == list(range(30))
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_incompatible_types_fall_back_to_json(self, tmp_path):
+        path = tmp_path / "s.parquet"
+        pages = [{"sessions": [{"id": "1", "n": 1}]},
+                 {"sessions": [{"id": "2", "n": "two"}]},
+                 {"sessions": [{"id": "3", "n": 3}, {"id": "4", "n": True}]}]
+        export_parquet(make_client(pages), "session", path)
+        assert pq.read_table(path).column("n").to_pylist() == ["1", '"two"', "3", "true"]
+
+    def test_failed_export_leaves_no_file(self, tmp_path):
+        path = tmp_path / "s.parquet"
+
+        def pages():
+            yield {"sessions": [{"id": "1"}]}
+            raise RuntimeError("connection lost")
+
+        client = MagicMock()
+        client.iter_pages.return_value = pages()
+        with pytest.raises(RuntimeError):
+            export_parquet(client, "session", path)
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,88 @@
+"""End-to-end checks of BrainstemClient against the benchmark fake server.
+
+These run over real localhost HTTP, so they also guard the fake server's
+semantics that the benchmark numbers rely on.
+"""
+
+import pytest
+
+from benchmarks.fake_server import FakeBrainstem
+from brainstem_api_tools.brainstem_api_client import BrainstemClient
+
+
+@pytest.fixture(scope="module")
+def server():
+    with FakeBrainstem(sessions=250) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    return BrainstemClient(token="bench", url=server.url)
+
+
+class TestFakeServer:
+    def test_load_all_offset_pages(self, client):
+        sessions = client.load("session", load_all=True)["sessions"]
+        assert len(sessions) == 250
+        assert len({s["id"] for s in sessions}) == 250
+
+    def test_load_all_keyset_matches_sorted_ids(self, client, server):
+        sessions = client.load("session", load_all=True, keyset="id")["sessions"]
+        assert [s["id"] for s in sessions] == sorted(server.data["session"])
+
+    def test_load_all_adaptive_matches_fixed_pages(self, client):
+        from brainstem_api_tools.throttle import AdaptivePageSize
+
+        sizer = AdaptivePageSize(initial=20)
+        adaptive = client.load("session", load_all=True, adaptive=sizer)["sessions"]
+        assert adaptive == client.load("session", load_all=True)["sessions"]
+        assert sizer.sizes[0] == 20 and sum(p["records"] for p in sizer.history) == 250
+
+    def test_load_all_adaptive_shrinks_slow_pages(self):
+        from brainstem_api_tools.throttle import AdaptivePageSize
+
+        with FakeBrainstem(sessions=200, record_latency=0.002) as server:
+            client = BrainstemClient(token="bench", url=server.url)
+            sizer = AdaptivePageSize(target=0.04)
+            sessions = client.load("session", load_all=True, adaptive=sizer)["sessions"]
+        assert len({s["id"] for s in sessions}) == 200
+        assert sizer.sizes[0] == 100
+        assert max(sizer.sizes[1:]) < 50  # ~20 records take the 0.04 s target
+
+    def test_load_all_adaptive_refills_pages_cut_short(self, client, server):
+        from brainstem_api_tools.throttle import AdaptivePageSize
+
+        # Pages grow past the server's limit of 100; each short page is
+        # completed by a follow-up request and the maximum is lowered.
+        sizer = AdaptivePageSize(initial=40, max_size=400, target=60)
+        sessions = client.load("session", load_all=True, adaptive=sizer,
+                               max_workers=1)["sessions"]
+        assert [s["id"] for s in sessions] == list(server.data["session"])
+        assert sizer.max_size == 100
+
+    def test_load_all_adaptive_keyset(self, client, server):
+        sessions = client.load("session", load_all=True, keyset="id", limit=30,
+                               adaptive=True)["sessions"]
+        assert [s["id"] for s in sessions] == sorted(server.data["session"])
+
+    def test_filters_sort_and_include(self, client):
+        data = client.load("session", filters={"name.icontains": "SESSION00001"},
+                           sort=["-name"], include=["behaviors"], limit=5).json()
+        assert data["count"] == 10
+        assert [s["name"] for s in data["sessions"]] == [f"session0000{i}" for i in range(19, 14, -1)]
+        assert isinstance(data["sessions"][0]["behaviors"][0], dict)
+
+    def test_relation_id_filter(self, client, server):
+        project = next(iter(server.data["project"]))
+        data = client.load("session", filters={"projects.id": project}, load_all=True)
+        assert data["sessions"]
+        assert all(project in s["projects"] for s in data["sessions"])
+
+    def test_save_and_delete_round_trip(self, client):
+        created = client.save("behavior", data={"type": "run"})
+        assert created.status_code == 201
+        id = created.json()["behavior"]["id"]
+        assert client.save("behavior", id=id, data={"type": "sleep"}).json()["behavior"]["type"] == "sleep"
+        assert client.delete("behavior", id=id).status_code == 204
+        assert client.load("behavior", id=id).status_code == 404
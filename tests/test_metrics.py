@@ -0,0 +1,130 @@
+"""Unit tests for request events, hooks and aggregated stats."""
+
+import pytest
+
+from benchmarks.fake_server import FakeBrainstem
+from brainstem_api_tools.brainstem_api_client import BrainstemClient
+from brainstem_api_tools.cache import RecordCache
+from brainstem_api_tools.metrics import PHASES, RequestEvent, RequestStats
+
+
+def event(model="session", endpoint="list", method="GET", status=200, total=0.02, **kw):
+    timings = dict.fromkeys(PHASES, 0.0)
+    timings["total"] = total
+    fields = dict(portal="private", url="http://x/", bytes_sent=0, bytes_received=100,
+                  retries=0, cache_hit=False)
+    fields.update(kw)
+    return RequestEvent(model=model, endpoint=endpoint, method=method, status=status,
+                        timings=timings, **fields)
+
+
+@pytest.fixture(scope="module")
+def server():
+    with FakeBrainstem(sessions=150) as server:
+        yield server
+
+
+class TestHooks:
+    def test_event_for_every_request(self, server):
+        events = []
+        client = BrainstemClient(token="t", url=server.url, hooks=[events.append])
+        client.load("session", load_all=True)
+        sid = next(iter(server.data["session"]))
+        client.load("session", id=sid)
+        client.save("behavior", data={"type": "run"})
+
+        pages, detail, created = events[:2], events[2], events[3]
+        assert len(events) == 4
+        assert {(e.model, e.portal, e.endpoint, e.method, e.status) for e in pages} == \
+            {("session", "private", "list", "GET", 200)}
+        assert (detail.endpoint, detail.url) == ("detail", f"{server.url}api/private/stem/session/{sid}/")
+        assert (created.model, created.method, created.status) == ("behavior", "POST", 201)
+        assert created.bytes_sent > 0
+
+        for e in events:
+            assert set(e.timings) == set(PHASES)
+            assert e.bytes_received > 0 and e.retries == 0 and not e.cache_hit
+            assert e.timings["total"] >= e.timings["server"] + e.timings["download"]
+        assert all(e.timings["decode"] > 0 for e in pages)
+        assert detail.timings["decode"] == 0.0  # the caller decodes single records
+        assert pages[0].timings["connect"] > 0  # first request opened the connection
+
+    def test_add_remove_hook(self, server):
+        client = BrainstemClient(token="t", url=server.url)
+        seen = []
+
+        @client.add_hook
+        def hook(e):
+            seen.append(e)
+
+        client.load("session", limit=1)
+        client.remove_hook(hook)
+        client.load("session", limit=1)
+        assert len(seen) == 1
+
+    def test_failing_hook_warns_without_failing_request(self, server):
+        def broken(e):
+            raise RuntimeError("collector down")
+
+        client = BrainstemClient(token="t", url=server.url, hooks=[broken])
+        with pytest.warns(UserWarning, match="collector down"):
+            assert client.load("session", limit=1).ok
+
+    def test_record_cache_hit_is_an_event(self, server):
+        events = []
+        client = BrainstemClient(token="t", url=server.url, hooks=[events.append],
+                                 record_cache=RecordCache())
+        sid = next(iter(server.data["session"]))
+        client.load("session", id=sid)
+        client.load("session", id=sid)
+        assert [e.cache_hit for e in events] == [False, True]
+        assert events[1].timings["total"] == 0.0
+
+
+class TestStats:
+    def test_client_stats_group_by_model_endpoint_method(self, server):
+        client = BrainstemClient(token="t", url=server.url)
+        client.load("session", load_all=True)
+        client.load("subject", limit=5)
+        rows = {(r["model"], r["endpoint"], r["method"]): r for r in client.stats().as_dict()}
+        assert rows[("session", "list", "GET")]["count"] == 2
+        assert rows[("subject", "list", "GET")]["statuses"] == {200: 1}
+
+    def test_reset_starts_new_period(self, server):
+        client = BrainstemClient(token="t", url=server.url)
+        client.load("session", limit=1)
+        assert client.stats(reset=True).as_dict()[0]["count"] == 1
+        assert client.stats().as_dict() == []
+
+    def test_quantile_from_buckets(self):
+        stats = RequestStats(buckets=[0.01, 0.1, 1.0])
+        for total in [0.005] * 90 + [0.5] * 10:
+            stats.record(event(total=total))
+        assert stats.quantile(0.5) == 0.01
+        assert stats.quantile(0.99) == 1.0
+        assert stats.quantile(0.5, model="subject") == 0.0
+
+    def test_prometheus_exposition(self):
+        stats = RequestStats(buckets=[0.01, 0.1])
+        stats.record(event(total=0.005))
+        stats.record(event(total=0.05, status=404, retries=1))
+        stats.record(event(total=5.0, model="subject", endpoint="detail", cache_hit=True))
+        text = stats.to_prometheus()
+        labels = 'model="session",endpoint="list",method="GET"'
+        assert "# TYPE brainstem_client_request_duration_seconds histogram" in text
+        assert f'brainstem_client_request_duration_seconds_bucket{{{labels},le="0.01"}} 1' in text
+        assert f'brainstem_client_request_duration_seconds_bucket{{{labels},le="0.1"}} 2' in text
+        assert f'brainstem_client_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+        assert f"brainstem_client_request_duration_seconds_count{{{labels}}} 2" in text
+        assert f'brainstem_client_requests_total{{{labels},status="404"}} 1' in text
+        assert f"brainstem_client_retries_total{{{labels}}} 1" in text
+        assert ('brainstem_client_cache_hits_total{model="subject",endpoint="detail",'
+                'method="GET"} 1') in text
+        assert 'phase="total"' not in text
+
+    def test_copy_is_independent(self):
+        stats = RequestStats()
+        stats.record(event())
+        snapshot = stats.copy()
+        stats.record(event())
+        assert snapshot.as_dict()[0]["count"] == 1
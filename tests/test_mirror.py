@@ -0,0 +1,105 @@
+"""Unit tests for the SQLite portal mirror."""
+
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from brainstem_api_tools.mirror import PortalMirror
+
+
+P1 = "11111111-1111-1111-1111-111111111111"
+P2 = "22222222-2222-2222-2222-222222222222"
+
+SESSIONS = [
+    {"id": "a0000000-0000-0000-0000-000000000001", "name": "Rat hippocampus",
+     "projects": [P1], "duration": 30, "tags": "x"},
+    {"id": "a0000000-0000-0000-0000-000000000002", "name": "Mouse cortex",
+     "projects": [P1, P2], "duration": 10, "tags": "y"},
+    {"id": "a0000000-0000-0000-0000-000000000003", "name": "rat_striatum",
+     "projects": [{"id": P2, "name": "Embedded"}], "duration": 20, "tags": "x"},
+]
+
+
+def make_client(pages_by_model):
+    client = MagicMock()
+
+    def iter_pages(model, portal="private", include=None):
+        if model not in pages_by_model:
+            raise requests.HTTPError("403 Forbidden")
+        return iter(pages_by_model[model])
+
+    client.iter_pages.side_effect = iter_pages
+    return client
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    client = make_client({"session": [{"sessions": SESSIONS[:2]}, {"sessions": SESSIONS[2:]}]})
+    with PortalMirror(tmp_path / "mirror.db") as m:
+        m.build(client, models=["session"])
+        yield m
+
+
+def names(records):
+    return [r["name"] for r in records]
+
+
+class TestBuild:
+    def test_counts_and_skips_forbidden_models(self, tmp_path):
+        client = make_client({"session": [{"sessions": SESSIONS}]})
+        with PortalMirror(tmp_path / "m.db") as m, pytest.warns(UserWarning, match="project"):
+            counts = m.build(client, models=["session", "project"])
+        assert counts == {"session": 3}
+
+    def test_rebuild_replaces_rows(self, tmp_path):
+        path = tmp_path / "m.db"
+        with PortalMirror(path) as m:
+            m.build(make_client({"session": [{"sessions": SESSIONS}]}), models=["session"])
+            m.build(make_client({"session": [{"sessions": SESSIONS[:1]}]}), models=["session"])
+            assert len(m.query("session")) == 1
+            assert m.query("session", filters={"projects.id": P2}) == []
+
+    def test_persists_across_connections(self, tmp_path):
+        path = tmp_path / "m.db"
+        with PortalMirror(path) as m:
+            m.build(make_client({"session": [{"sessions": SESSIONS}]}), models=["session"])
+        with PortalMirror(path) as m:
+            assert len(m.query("session")) == 3
+
+
+class TestQuery:
+    def test_icontains_is_case_insensitive(self, mirror):
+        assert names(mirror.query("session", filters={"name.icontains": "RAT"}, sort=["name"])) == [
+            "Rat hippocampus", "rat_striatum"]
+
+    def test_icontains_escapes_wildcards(self, mirror):
+        assert names(mirror.query("session", filters={"name.icontains": "_"})) == ["rat_striatum"]
+
+    def test_relation_id_filter(self, mirror):
+        assert names(mirror.query("session", filters={"projects.id": P2}, sort=["name"])) == [
+            "Mouse cortex", "rat_striatum"]
+
+    def test_comparison_and_sort(self, mirror):
+        result = mirror.query("session", filters={"duration.gte": 20}, sort=["-duration"])
+        assert names(result) == ["Rat hippocampus", "rat_striatum"]
+
+    def test_startswith_is_case_sensitive(self, mirror):
+        assert names(mirror.query("session", filters={"name.startswith": "rat"})) == ["rat_striatum"]
+
+    def test_exact_and_in(self, mirror):
+        assert len(mirror.query("session", filters={"tags": "x"})) == 2
+        ids = [SESSIONS[0]["id"], SESSIONS[2]["id"]]
+        assert len(mirror.query("session", filters={"id.in": ids})) == 2
+
+    def test_in_accepts_comma_separated_string(self, mirror):
+        both = "Mouse cortex, rat_striatum"
+        assert names(mirror.query("session", filters={"name.in": both}, sort=["name"])) == [
+            "Mouse cortex", "rat_striatum"]
+        assert names(mirror.query("session", filters={"projects.id.in": P2}, sort=["name"])) == [
+            "Mouse cortex", "rat_striatum"]
+        assert len(mirror.query("session", filters={"projects.id.in": f"{P1},{P2}"})) == 3
+
+    def test_limit_offset_and_id(self, mirror):
+        assert names(mirror.query("session", sort=["duration"], limit=1, offset=1)) == ["rat_striatum"]
+        assert mirror.query("session", id=SESSIONS[1]["id"])[0]["name"] == "Mouse cortex"
@@ -0,0 +1,66 @@
+"""Unit tests for the identity-mapped EntityStore."""
+
+from unittest.mock import MagicMock
+
+from brainstem_api_tools.brainstem_api_client import BrainstemClient
+from brainstem_api_tools.store import EntityStore
+
+from tests.test_client import TOKEN, mock_response
+
+
+PROJECT = {"id": "p1", "name": "Hippocampus"}
+
+
+def session(id, **extra):
+    return {"id": id, "name": f"s{id}", "projects": [dict(PROJECT)],
+            "strain": {"id": "st1", "name": "C57"}, **extra}
+
+
+class TestEntityStore:
+    def test_embedded_objects_shared_across_records(self):
+        store = EntityStore()
+        page = store.add_page({"sessions": [session("1"), session("2")], "count": 2})
+        a, b = page["sessions"]
+        assert a["projects"][0] is b["projects"][0]
+        assert a["strain"] is b["strain"] is store.get("strain", "st1")
+        assert store.counts() == {"session": 2, "project": 1, "strain": 1}
+
+    def test_update_visible_from_every_reference(self):
+        store = EntityStore()
+        page = store.add_page({"sessions": [session("1"), session("2")]})
+        store.add("project", {"id": "p1", "description": "updated"})
+        assert all(s["projects"][0]["description"] == "updated" for s in page["sessions"])
+        assert store.get("project", "p1")["name"] == "Hippocampus"
+
+    def test_uuid_lists_and_scalars_untouched(self):
+        store = EntityStore()
+        record = store.add("session", {"id": "1", "projects": ["p1", "p2"], "tags": ["x"]})
+        assert record == {"id": "1", "projects": ["p1", "p2"], "tags": ["x"]}
+
+    def test_page_model_from_list_key(self):
+        store = EntityStore()
+        store.add_page({"subjects": [{"id": "a"}]})
+        assert ("subject", "a") in store
+        assert len(store) == 1
+        assert store.all("subject") == [{"id": "a"}]
+
+
+class TestLoadNormalize:
+    def setup_method(self):
+        self.client = BrainstemClient(token=TOKEN)
+        self.client._session.get = MagicMock(side_effect=[
+            mock_response(200, {"sessions": [session("1"), session("2")], "count": 3}),
+            mock_response(200, {"sessions": [session("3")], "count": 3}),
+        ])
+
+    def test_load_all_normalize_true(self):
+        result = self.client.load("session", load_all=True, normalize=True, max_workers=1)
+        projects = [s["projects"][0] for s in result["sessions"]]
+        assert len(projects) == 3
+        assert projects[0] is projects[1] is projects[2]
+
+    def test_load_all_into_shared_store(self):
+        store = EntityStore()
+        result = self.client.load("session", load_all=True, normalize=store)
+        assert result["sessions"][2] is store.get("session", "3")
+        assert store.counts()["session"] == 3